@@ -5,7 +5,7 @@ from langgraph.prebuilt import create_react_agent
 
 from src.prompts import apply_prompt_template
 from src.llms.llm import get_llm_with_reasoning_effort, add_no_think_if_needed
-from src.config.agents import AGENT_LLM_MAP
+from src.llms.router import get_agent_llm_type
 
 
 # Create agents using configured LLM types
@@ -13,7 +13,7 @@ def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template:
     """Factory function to create agents with consistent configuration."""
     
     # Get LLM with reasoning effort control
-    llm = get_llm_with_reasoning_effort(AGENT_LLM_MAP[agent_type], reasoning_effort)
+    llm = get_llm_with_reasoning_effort(get_agent_llm_type(agent_type), reasoning_effort)
     
     # Create custom prompt function that adds /no_think when needed
     def custom_prompt(state):
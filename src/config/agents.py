@@ -4,7 +4,10 @@
 from typing import Literal
 
 # Define available LLM types
-LLMType = Literal["basic", "reasoning", "vision"]
+LLMType = Literal["basic", "reasoning", "vision", "fast"]
+
+# Define latency/quality tiers used by the model router
+LLMTier = Literal["fast", "balanced", "strong"]
 
 # Define agent-LLM mapping
 AGENT_LLM_MAP: dict[str, LLMType] = {
@@ -18,3 +21,17 @@ AGENT_LLM_MAP: dict[str, LLMType] = {
     "prose_writer": "basic",
     "prompt_enhancer": "basic",
 }
+
+# Define agent-tier mapping, resolved to an LLM type by src.llms.router.
+# AGENT_LLM_MAP remains the fallback when no tier candidate is configured.
+AGENT_LLM_TIER: dict[str, LLMTier] = {
+    "coordinator": "fast",
+    "prompt_enhancer": "fast",
+    "planner": "balanced",
+    "researcher": "balanced",
+    "coder": "balanced",
+    "podcast_script_writer": "balanced",
+    "ppt_composer": "balanced",
+    "prose_writer": "balanced",
+    "reporter": "strong",
+}
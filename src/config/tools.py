@@ -14,6 +14,7 @@ class SearchEngine(enum.Enum):
     BRAVE_SEARCH = "brave_search"
     ARXIV = "arxiv"
     BOCHA = "bocha"
+    FEDERATED = "federated"
 
 
 # Tool configuration
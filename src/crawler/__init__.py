@@ -3,7 +3,8 @@
 
 from .article import Article
 from .crawler import Crawler
+from .fast_extractor import FastExtractor
 from .jina_client import JinaClient
 from .readability_extractor import ReadabilityExtractor
 
-__all__ = ["Article", "Crawler", "JinaClient", "ReadabilityExtractor"]
+__all__ = ["Article", "Crawler", "FastExtractor", "JinaClient", "ReadabilityExtractor"]
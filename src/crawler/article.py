@@ -2,24 +2,80 @@
 # SPDX-License-Identifier: MIT
 
 import re
+from typing import Optional
 from urllib.parse import urljoin
 
 from markdownify import markdownify as md
 
+from src.utils.token_utils import estimate_tokens
+
+from .markdown import cut_to_budget, html_to_markdown
+
 
 class Article:
     url: str
+    # Where the page came from: "direct", "jina" or "cache"
+    backend: Optional[str] = None
 
-    def __init__(self, title: str, html_content: str):
+    def __init__(
+        self,
+        title: str,
+        html_content: str,
+        markdown_content: Optional[str] = None,
+        markdown_max_chars: Optional[int] = None,
+    ):
         self.title = title
         self.html_content = html_content
+        # Markdown of html_content, when already known (e.g. from the crawl
+        # cache), converted up to markdown_max_chars characters (None: all of it)
+        self.markdown_content = markdown_content
+        self.markdown_max_chars = markdown_max_chars
+
+    def _known_markdown(self, max_chars: Optional[int]) -> Optional[str]:
+        """The already converted markdown, if it covers max_chars characters."""
+        if self.markdown_content is None or self.markdown_max_chars is None:
+            return self.markdown_content
+        if max_chars is not None and max_chars <= self.markdown_max_chars:
+            return self.markdown_content
+        return None
 
-    def to_markdown(self, including_title: bool = True) -> str:
+    def to_markdown(
+        self,
+        including_title: bool = True,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        query: Optional[str] = None,
+    ) -> str:
+        """
+        Render the article as markdown.
+
+        With max_chars / max_tokens only as much of the article as fits is
+        converted; with a query as well, the sections most relevant to it are
+        kept first.
+        """
         markdown = ""
         if including_title:
             markdown += f"# {self.title}\n\n"
-        markdown += md(self.html_content)
-        return markdown
+        if max_chars is None and max_tokens is None:
+            if self._known_markdown(None) is None:
+                self.markdown_content = md(self.html_content)
+                self.markdown_max_chars = None
+            return markdown + self.markdown_content
+
+        body_chars = None if max_chars is None else max(max_chars - len(markdown), 0)
+        body_tokens = (
+            None
+            if max_tokens is None
+            else max(max_tokens - estimate_tokens(markdown), 0)
+        )
+        known = self._known_markdown(body_chars)
+        if known is not None and not query:
+            body = cut_to_budget(known, body_chars, body_tokens)
+        else:
+            body = html_to_markdown(
+                self.html_content or "", body_chars, body_tokens, query=query
+            )
+        return cut_to_budget(markdown + body, max_chars, max_tokens)
 
     def to_message(self) -> list[dict]:
         image_pattern = r"!\[.*?\]\((.*?)\)"
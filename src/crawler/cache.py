@@ -0,0 +1,303 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+On-disk cache of crawled pages.
+
+Raw HTML is stored content-addressed (gzip files named by their SHA-256), and
+a SQLite index maps each URL to its current content hash together with the
+ETag / Last-Modified validators and the time it was fetched. Entries younger
+than CRAWL_CACHE_TTL are served directly; older ones are revalidated with a
+conditional request before being fetched again.
+
+Readability output is cached per content hash, so a page whose HTML did not
+change is never extracted twice, even when it is reached through a different
+URL or re-fetched after its entry went stale.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from src.utils.url_utils import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "crawl")
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+HTML_KIND = "html"
+EXTRACTED_KIND = "extracted"
+
+
+@dataclass
+class CachedPage:
+    url: str
+    html: str
+    content_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    fresh: bool
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+class CrawlCache:
+    """Content-addressed page store with a URL index, TTL freshness and LRU eviction."""
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.stale = 0
+        self.misses = 0
+        self.extraction_hits = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "index.sqlite3"), check_same_thread=False
+        )
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages (last_access);
+            CREATE TABLE IF NOT EXISTS blobs (
+                content_hash TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (content_hash, kind)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _blob_path(self, digest: str, kind: str) -> str:
+        return os.path.join(self.directory, kind, digest[:2], f"{digest}.gz")
+
+    def _write_blob(self, digest: str, kind: str, data: str) -> None:
+        path = self._blob_path(digest, kind)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = gzip.compress(data.encode("utf-8"))
+        # Write to a temporary file first so readers never see a partial blob
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO blobs (content_hash, kind, size) VALUES (?, ?, ?)",
+            (digest, kind, len(compressed)),
+        )
+
+    def _read_blob(self, digest: str, kind: str) -> Optional[str]:
+        try:
+            with open(self._blob_path(digest, kind), "rb") as f:
+                return gzip.decompress(f.read()).decode("utf-8")
+        except (OSError, EOFError, UnicodeDecodeError):
+            return None
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page for url, fresh or stale, or None on a miss."""
+        key = canonicalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, etag, last_modified, fetched_at "
+                "FROM pages WHERE url_key = ?",
+                (key,),
+            ).fetchone()
+            html = self._read_blob(row[0], HTML_KIND) if row else None
+            if html is None:
+                self.misses += 1
+                return None
+            fresh = now - row[3] < self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale += 1
+            self._conn.execute(
+                "UPDATE pages SET last_access = ? WHERE url_key = ?", (now, key)
+            )
+            self._conn.commit()
+        return CachedPage(url, html, row[0], row[1], row[2], row[3], fresh)
+
+    def is_fresh(self, url: str) -> bool:
+        """Whether a fresh copy of url is cached, without counting a lookup."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at FROM pages WHERE url_key = ?",
+                (canonicalize_url(url),),
+            ).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> str:
+        """Store freshly fetched HTML for url and return its content hash."""
+        digest = content_hash(html)
+        now = time.time()
+        with self._lock:
+            self._write_blob(digest, HTML_KIND, html)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url_key, url, content_hash, etag, last_modified, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (canonicalize_url(url), url, digest, etag, last_modified, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+        return digest
+
+    def mark_revalidated(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Record that the origin confirmed the cached page is unchanged."""
+        now = time.time()
+        with self._lock:
+            self.revalidated += 1
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, last_access = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                "WHERE url_key = ?",
+                (now, now, etag, last_modified, canonicalize_url(url)),
+            )
+            self._conn.commit()
+
+    def get_extracted(self, digest: str) -> Optional[dict]:
+        """Return the cached extraction (title, html_content, markdown) of a page."""
+        data = self._read_blob(digest, EXTRACTED_KIND)
+        if data is None:
+            return None
+        with self._lock:
+            self.extraction_hits += 1
+        return json.loads(data)
+
+    def put_extracted(self, digest: str, extracted: dict) -> None:
+        with self._lock:
+            self._write_blob(
+                digest, EXTRACTED_KIND, json.dumps(extracted, ensure_ascii=False)
+            )
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used pages until the blobs no one references any
+        # more free enough space
+        for url_key, digest in self._conn.execute(
+            "SELECT url_key, content_hash FROM pages ORDER BY last_access"
+        ).fetchall():
+            self._conn.execute("DELETE FROM pages WHERE url_key = ?", (url_key,))
+            self.evictions += 1
+            still_used = self._conn.execute(
+                "SELECT 1 FROM pages WHERE content_hash = ? LIMIT 1", (digest,)
+            ).fetchone()
+            if still_used:
+                continue
+            for kind, size in self._conn.execute(
+                "SELECT kind, size FROM blobs WHERE content_hash = ?", (digest,)
+            ).fetchall():
+                try:
+                    os.remove(self._blob_path(digest, kind))
+                except OSError:
+                    pass
+                total -= size
+            self._conn.execute("DELETE FROM blobs WHERE content_hash = ?", (digest,))
+            if total <= self.max_bytes:
+                break
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM blobs"
+            ).fetchone()[0]
+            lookups = self.hits + self.stale + self.misses
+            return {
+                "hits": self.hits,
+                "stale": self.stale,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_ratio": (
+                    round((self.hits + self.revalidated) / lookups, 4)
+                    if lookups
+                    else 0.0
+                ),
+                "extraction_hits": self.extraction_hits,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_bytes": total,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_crawl_cache: Optional[CrawlCache] = None
+_crawl_cache_lock = threading.Lock()
+
+
+def is_crawl_cache_enabled() -> bool:
+    return os.getenv("CRAWL_CACHE_ENABLED", "true").lower() not in ("false", "0", "no")
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """Get the process-wide crawl cache; None when CRAWL_CACHE_ENABLED is off."""
+    global _crawl_cache
+    if not is_crawl_cache_enabled():
+        return None
+    if _crawl_cache is None:
+        with _crawl_cache_lock:
+            if _crawl_cache is None:
+                _crawl_cache = CrawlCache(
+                    os.getenv("CRAWL_CACHE_DIR", DEFAULT_CACHE_DIR),
+                    int(os.getenv("CRAWL_CACHE_TTL", str(DEFAULT_TTL_SECONDS))),
+                    int(os.getenv("CRAWL_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+                )
+    return _crawl_cache
+
+
+def get_crawl_cache_stats() -> dict:
+    if not is_crawl_cache_enabled():
+        return {"enabled": False}
+    return {"enabled": True, **get_crawl_cache().get_stats()}
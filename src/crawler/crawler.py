@@ -1,11 +1,106 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import logging
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import httpx
 
 from .article import Article
-from .jina_client import JinaClient
+from .cache import CachedPage, get_crawl_cache
+from .direct_client import (
+    BlockedAddress,
+    DirectClient,
+    FetchedPage,
+    SkippedContentType,
+    looks_js_rendered,
+)
+from .extraction import (
+    get_extraction_pool,
+    get_extractor_name,
+    get_markdown_max_chars,
+)
+from .fast_extractor import FastExtractor
+from .jina_client import JINA_READER_URL, JinaClient
+from .limits import DomainSkipped, get_crawl_limiter
+from .markdown import html_to_markdown
 from .readability_extractor import ReadabilityExtractor
 
+logger = logging.getLogger(__name__)
+
+# Extraction blocks (it waits for the extraction process pool, or runs in the
+# calling thread when that is disabled), so async crawls run it in a bounded
+# thread pool instead of on the event loop
+CRAWLER_EXTRACT_WORKERS = int(os.getenv("CRAWLER_EXTRACT_WORKERS", "4"))
+_extract_executor = ThreadPoolExecutor(
+    max_workers=CRAWLER_EXTRACT_WORKERS, thread_name_prefix="crawl-extract"
+)
+
+
+async def run_in_extract_executor(fn, *args):
+    """Run CPU-bound or blocking extraction work in the bounded extraction pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_extract_executor, fn, *args)
+
+
+CRAWLER_BACKENDS = ("direct", "jina")
+DEFAULT_CRAWLER_BACKEND = "direct"
+
+_backend_counts: Counter = Counter()
+_backend_counts_lock = threading.Lock()
+
+
+def get_crawler_backend() -> str:
+    """
+    CRAWLER_BACKEND=direct fetches pages from their origin and falls back to
+    Jina for pages that fail or need JavaScript; "jina" always uses Jina.
+    """
+    backend = os.getenv("CRAWLER_BACKEND", DEFAULT_CRAWLER_BACKEND).lower()
+    return backend if backend in CRAWLER_BACKENDS else DEFAULT_CRAWLER_BACKEND
+
+
+def _record_backend(backend: str, url: str, reason: Optional[str] = None) -> None:
+    with _backend_counts_lock:
+        _backend_counts[backend] += 1
+        if reason:
+            _backend_counts[f"{backend}:{reason}"] += 1
+    if reason:
+        logger.info(f"直接抓取失败，改用 Jina ({reason}): {url}")
+
+
+def get_crawl_backend_stats() -> dict:
+    """How many pages each backend served; jina_fallback:<reason> counts why."""
+    with _backend_counts_lock:
+        return dict(_backend_counts)
+
+
+def _fallback_reason(error: Exception) -> str:
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"http_{error.response.status_code}"
+    return type(error).__name__
+
+
+def _record_jina_fallback(backend: str, url: str, reason: str) -> None:
+    if backend == "direct":
+        _record_backend("jina_fallback", url, reason)
+    else:
+        # Only the conditional request of a revalidation went to the origin
+        _record_backend("jina", url)
+
+
+def _conditional_headers(page: CachedPage) -> dict:
+    headers = {}
+    if page.etag:
+        headers["If-None-Match"] = page.etag
+    if page.last_modified:
+        headers["If-Modified-Since"] = page.last_modified
+    return headers
+
 
 class Crawler:
     def crawl(self, url: str) -> Article:
@@ -14,14 +109,180 @@ class Crawler:
         # them into text and image blocks for one single and unified
         # LLM message.
         #
-        # Jina is not the best crawler on readability, however it's
-        # much easier and free to use.
+        # Pages are fetched directly from their origin; Jina, which is
+        # not the best crawler on readability but renders JavaScript, is
+        # the fallback for pages that fail or need it.
         #
         # Instead of using Jina's own markdown converter, we'll use
         # our own solution to get better readability results.
-        jina_client = JinaClient()
-        html = jina_client.crawl(url, return_format="html")
-        extractor = ReadabilityExtractor()
-        article = extractor.extract_article(html)
+        cache = get_crawl_cache()
+        page = cache.get(url) if cache else None
+        if page and page.fresh:
+            return self._cached_article(page, url)
+        try:
+            with get_crawl_limiter().limit_sync(url, track=False):
+                fetched = self._fetch(url, page)
+        except DomainSkipped:
+            # An outdated copy beats no page while its site is failing
+            if page:
+                return self._cached_article(page, url)
+            raise
+        if fetched.not_modified:
+            cache.mark_revalidated(url, fetched.etag, fetched.last_modified)
+            return self._cached_article(page, url)
+        return self._store_and_extract(cache, url, fetched)
+
+    async def acrawl(self, url: str) -> Article:
+        """Async variant of crawl; fetching and extraction never block the event loop."""
+        cache = get_crawl_cache()
+        # Cache lookups read SQLite and a gzipped page from disk
+        page = await run_in_extract_executor(cache.get, url) if cache else None
+        if page and page.fresh:
+            return await run_in_extract_executor(self._cached_article, page, url)
+        try:
+            async with get_crawl_limiter().limit(url, track=False):
+                fetched = await self._afetch(url, page)
+        except DomainSkipped:
+            if page:
+                return await run_in_extract_executor(self._cached_article, page, url)
+            raise
+        if fetched.not_modified:
+            await run_in_extract_executor(
+                cache.mark_revalidated, url, fetched.etag, fetched.last_modified
+            )
+            return await run_in_extract_executor(self._cached_article, page, url)
+        return await run_in_extract_executor(
+            self._store_and_extract, cache, url, fetched
+        )
+
+    @staticmethod
+    def _fetch(url: str, page: Optional[CachedPage] = None) -> FetchedPage:
+        """
+        Fetch a page. With a stale cached copy that has validators, the
+        request is conditional, and an unchanged page comes back with
+        not_modified set instead of being downloaded again.
+
+        Only requests to the origin count towards the health of its host;
+        Jina requests count towards Jina's, so a Jina outage never gets a
+        healthy site skipped.
+        """
+        conditional = _conditional_headers(page) if page else {}
+        backend = get_crawler_backend()
+        limiter = get_crawl_limiter()
+        # Conditional requests go to the origin even with the Jina backend;
+        # when the page changed, that response is used as the new copy
+        if backend == "direct" or conditional:
+            try:
+                with limiter.track(url):
+                    fetched = DirectClient().fetch(url, conditional)
+                if fetched.not_modified:
+                    return fetched
+                if not looks_js_rendered(fetched.html):
+                    _record_backend("direct", url)
+                    return fetched
+                reason = "js_rendered"
+            except (SkippedContentType, BlockedAddress):
+                raise
+            except Exception as e:
+                reason = _fallback_reason(e)
+            _record_jina_fallback(backend, url, reason)
+        else:
+            _record_backend("jina", url)
+        limiter.check_domain(JINA_READER_URL)
+        with limiter.track(JINA_READER_URL):
+            html = JinaClient().crawl(url, return_format="html")
+        return FetchedPage(url=url, html=html, backend="jina")
+
+    @staticmethod
+    async def _afetch(url: str, page: Optional[CachedPage] = None) -> FetchedPage:
+        conditional = _conditional_headers(page) if page else {}
+        backend = get_crawler_backend()
+        limiter = get_crawl_limiter()
+        if backend == "direct" or conditional:
+            try:
+                with limiter.track(url):
+                    fetched = await DirectClient().afetch(url, conditional)
+                if fetched.not_modified:
+                    return fetched
+                if not await run_in_extract_executor(looks_js_rendered, fetched.html):
+                    _record_backend("direct", url)
+                    return fetched
+                reason = "js_rendered"
+            except (SkippedContentType, BlockedAddress):
+                raise
+            except Exception as e:
+                reason = _fallback_reason(e)
+            _record_jina_fallback(backend, url, reason)
+        else:
+            _record_backend("jina", url)
+        limiter.check_domain(JINA_READER_URL)
+        with limiter.track(JINA_READER_URL):
+            html = await JinaClient().acrawl(url, return_format="html")
+        return FetchedPage(url=url, html=html, backend="jina")
+
+    @classmethod
+    def _cached_article(cls, page: CachedPage, url: str) -> Article:
+        article = cls._extract(page.html, url, page.content_hash)
+        article.backend = "cache"
+        return article
+
+    @classmethod
+    def _store_and_extract(cls, cache, url: str, fetched: FetchedPage) -> Article:
+        digest = (
+            cache.put(url, fetched.html, fetched.etag, fetched.last_modified)
+            if cache
+            else None
+        )
+        article = cls._extract(fetched.html, url, digest)
+        article.backend = fetched.backend
+        return article
+
+    @staticmethod
+    def _extracted_article(
+        extracted: dict, default_max_chars: Optional[int] = None
+    ) -> Article:
+        return Article(
+            extracted["title"],
+            extracted["html_content"],
+            extracted["markdown"],
+            extracted.get("markdown_max_chars", default_max_chars),
+        )
+
+    @classmethod
+    def _extract(cls, html: str, url: str, digest: Optional[str] = None) -> Article:
+        # Extraction results are cached by content hash, so unchanged pages
+        # skip readability and markdown conversion
+        cache = get_crawl_cache() if digest else None
+        extracted = cache.get_extracted(digest) if cache else None
+        if extracted:
+            # Entries cached before the markdown limit was recorded were cut
+            # at CRAWLER_MARKDOWN_MAX_CHARS
+            article = cls._extracted_article(extracted, get_markdown_max_chars())
+            article.url = url
+            return article
+        pool = get_extraction_pool()
+        if pool is not None:
+            article = cls._extracted_article(pool.extract(html))
+        else:
+            if get_extractor_name() == "fast":
+                extractor = FastExtractor()
+            else:
+                extractor = ReadabilityExtractor()
+            article = extractor.extract_article(html)
         article.url = url
+        if cache and isinstance(article, Article) and article.html_content is not None:
+            if article.markdown_content is None:
+                article.markdown_max_chars = get_markdown_max_chars()
+                article.markdown_content = html_to_markdown(
+                    article.html_content, max_chars=article.markdown_max_chars
+                )
+            cache.put_extracted(
+                digest,
+                {
+                    "title": article.title,
+                    "html_content": article.html_content,
+                    "markdown": article.markdown_content,
+                    "markdown_max_chars": article.markdown_max_chars,
+                },
+            )
         return article
@@ -0,0 +1,182 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Run-scoped detection of near-duplicate pages.
+
+Syndicated news and mirror sites publish the same article under many URLs,
+and each copy the researcher crawls costs a full page of prompt. Every run
+keeps a SimHash fingerprint of the pages it crawled; a page whose fingerprint
+is within CRAWL_DEDUP_MAX_DISTANCE bits of an earlier page of the run is
+reported as a duplicate of that page, so the caller can return a short stub
+instead of the text again. Runs are the research runs of query_memo, so a
+page crawled for an earlier request of the conversation is returned in full.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.text_utils import tokenize
+from src.utils.url_utils import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+DEFAULT_MAX_DISTANCE = 6
+# Fingerprints of shorter texts are too noisy, and stubbing them saves little
+MIN_DEDUP_CHARS = 500
+MAX_RUNS = 256
+MAX_PAGES_PER_RUN = 500
+REPORTED_RUNS = 20
+
+
+def is_page_dedup_enabled() -> bool:
+    return os.getenv("CRAWL_DEDUP_ENABLED", "true").lower() not in (
+        "false",
+        "0",
+        "no",
+    )
+
+
+def get_max_distance() -> int:
+    try:
+        return int(os.getenv("CRAWL_DEDUP_MAX_DISTANCE", DEFAULT_MAX_DISTANCE))
+    except ValueError:
+        return DEFAULT_MAX_DISTANCE
+
+
+def _feature_hash(feature: str) -> int:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash of a text over overlapping three-term shingles.
+
+    Terms come from tokenize, so Chinese text is compared by character
+    bigrams. Texts that share most of their shingles get fingerprints that
+    differ in only a few bits.
+    """
+    terms = tokenize(text)
+    if len(terms) < SHINGLE_SIZE:
+        shingles = Counter([" ".join(terms)]) if terms else Counter()
+    else:
+        shingles = Counter(
+            " ".join(terms[i : i + SHINGLE_SIZE])
+            for i in range(len(terms) - SHINGLE_SIZE + 1)
+        )
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in shingles.items():
+        value = _feature_hash(shingle)
+        for bit in range(FINGERPRINT_BITS):
+            if value >> bit & 1:
+                weights[bit] += count
+            else:
+                weights[bit] -= count
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class PageIndex:
+    """Fingerprints of the pages crawled in one run."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.pages = 0
+        self.duplicates = 0
+        self._fingerprints: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, url: str, text: str) -> Optional[str]:
+        """
+        Return the URL of an earlier page of the run that text nearly
+        duplicates, or None after adding the page to the index.
+
+        The same URL is never a duplicate of itself, since it may be crawled
+        again for other sections.
+        """
+        if len(text) < MIN_DEDUP_CHARS:
+            return None
+        key = canonicalize_url(url)
+        fingerprint = simhash(text)
+        max_distance = get_max_distance()
+        with self._lock:
+            if key in self._fingerprints:
+                return None
+            self.pages += 1
+            best = None
+            best_distance = max_distance + 1
+            for earlier_url, earlier in self._fingerprints.values():
+                distance = hamming_distance(fingerprint, earlier)
+                if distance < best_distance:
+                    best, best_distance = earlier_url, distance
+            if best is None:
+                self._fingerprints[key] = (url, fingerprint)
+                while len(self._fingerprints) > MAX_PAGES_PER_RUN:
+                    self._fingerprints.popitem(last=False)
+                return None
+            self.duplicates += 1
+            duplicates, pages = self.duplicates, self.pages
+        logger.info(
+            f"近重复页面 [{self.run_id}] {url} ≈ {best} "
+            f"(距离 {best_distance}，本次运行重复率 {duplicates}/{pages})"
+        )
+        return best
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "pages": self.pages,
+                "duplicates": self.duplicates,
+                "duplicate_rate": self.duplicates / self.pages if self.pages else 0.0,
+            }
+
+
+_indexes: "OrderedDict[str, PageIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_page_index(run_id: Optional[str]) -> Optional[PageIndex]:
+    """Get the page index of a run; None outside of a run or when disabled."""
+    if not is_page_dedup_enabled() or not run_id:
+        return None
+    with _indexes_lock:
+        index = _indexes.get(run_id)
+        if index is None:
+            index = _indexes[run_id] = PageIndex(run_id)
+            while len(_indexes) > MAX_RUNS:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(run_id)
+        return index
+
+
+def get_page_dedup_stats() -> dict:
+    """Duplicate counters summed over the tracked runs, and per recent run."""
+    with _indexes_lock:
+        indexes: List[PageIndex] = list(_indexes.values())
+    stats: Dict = {"runs": len(indexes), "pages": 0, "duplicates": 0}
+    by_run = {}
+    for index in indexes:
+        index_stats = index.get_stats()
+        stats["pages"] += index_stats["pages"]
+        stats["duplicates"] += index_stats["duplicates"]
+        by_run[index.run_id] = index_stats
+    stats["duplicate_rate"] = (
+        stats["duplicates"] / stats["pages"] if stats["pages"] else 0.0
+    )
+    stats["by_run"] = dict(list(by_run.items())[-REPORTED_RUNS:])
+    return stats
@@ -0,0 +1,327 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Direct page fetching.
+
+Pages are fetched from their origin with the pooled HTTP client instead of
+through the Jina reader: redirects are followed up to CRAWLER_MAX_REDIRECTS,
+bodies are streamed and cut at CRAWLER_MAX_PAGE_BYTES, and the text encoding
+is detected from a byte order mark, the headers or the page's own meta tag.
+
+Only content types in CRAWLER_ALLOWED_CONTENT_TYPES are read. Documents the
+Jina reader can convert (CRAWLER_JINA_CONTENT_TYPES, PDFs by default) are
+left to it; anything else (images, archives, binaries) is skipped without
+downloading its body.
+Pages that come back as a JavaScript shell without content are reported by
+looks_js_rendered so the caller can fall back to a rendering backend.
+
+URLs come from the LLM and from crawled pages, so the host of every request
+(including each redirect hop) is resolved first and requests to loopback,
+private, link-local or other non-public addresses, such as the cloud metadata
+service, are refused unless CRAWLER_ALLOW_PRIVATE_ADDRESSES is set.
+"""
+
+import asyncio
+import codecs
+import ipaddress
+import os
+import re
+import socket
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+import lxml.html
+from lxml.etree import ParserError
+
+from src.utils.http_client import get_async_http_client, get_http_client
+
+from .limits import (
+    aread_capped,
+    get_crawl_timeout,
+    get_max_page_bytes,
+    read_capped,
+    record_fetch,
+)
+
+DEFAULT_MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+DEFAULT_ALLOWED_CONTENT_TYPES = "text/html,application/xhtml+xml"
+DEFAULT_JINA_CONTENT_TYPES = "application/pdf"
+# Pages with less visible text than this are checked for a JavaScript shell
+MIN_RENDERED_TEXT_CHARS = 200
+
+REQUEST_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5",
+    "Accept-Language": "en,zh;q=0.8",
+}
+
+_META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_\-:.]+)""", re.I
+)
+_APP_SHELL_RE = re.compile(
+    r"""<div[^>]+id=["'](?:root|app|__next|__nuxt)["'][^>]*>\s*</div>"""
+    r"|enable javascript|javascript is (?:required|disabled)",
+    re.I,
+)
+
+
+class FetchError(Exception):
+    """A page could not be fetched directly."""
+
+
+class UnsupportedContentType(FetchError):
+    """A document another backend can convert, such as a PDF."""
+
+
+class SkippedContentType(FetchError):
+    """Content no backend can turn into text, such as an image or an archive."""
+
+
+class BlockedAddress(FetchError):
+    """A URL whose host is not a public internet address."""
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    html: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    backend: str = "direct"
+    truncated: bool = False
+    # The origin answered a conditional request with 304; html is empty
+    not_modified: bool = False
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _known_encoding(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+
+def decode_html(content: bytes, header_charset: Optional[str] = None) -> str:
+    """
+    Decode an HTML body.
+
+    The charset comes from a byte order mark, the Content-Type header or a
+    <meta charset> tag near the top of the page, in that order. Without any
+    of those, UTF-8 is tried first and GB18030 (a superset of GBK, common on
+    Chinese sites) second.
+    """
+    for bom, encoding in (
+        (codecs.BOM_UTF8, "utf-8-sig"),
+        (codecs.BOM_UTF16_LE, "utf-16"),
+        (codecs.BOM_UTF16_BE, "utf-16"),
+    ):
+        if content.startswith(bom):
+            return content.decode(encoding, errors="replace")
+    encoding = _known_encoding(header_charset)
+    if encoding is None:
+        match = _META_CHARSET_RE.search(content[:4096])
+        encoding = _known_encoding(match.group(1).decode("ascii")) if match else None
+    if encoding is not None:
+        return content.decode(encoding, errors="replace")
+    for candidate in ("utf-8", "gb18030"):
+        try:
+            # Not final: a body cut at the byte cap may end inside a character
+            return codecs.getincrementaldecoder(candidate)().decode(content)
+        except UnicodeDecodeError:
+            continue
+    return content.decode("utf-8", errors="replace")
+
+
+def looks_js_rendered(html: str) -> bool:
+    """Whether a page is a client-side rendered shell without readable content."""
+    try:
+        root = lxml.html.fromstring(html)
+    except (ParserError, ValueError):
+        return True
+    has_scripts = root.find(".//script") is not None
+    for element in list(root.iter("script", "style", "noscript", "template")):
+        if element.getparent() is not None:
+            element.drop_tree()
+    text_length = len(" ".join(root.text_content().split()))
+    if text_length >= MIN_RENDERED_TEXT_CHARS:
+        return False
+    return has_scripts or bool(_APP_SHELL_RE.search(html))
+
+
+def _allow_private_addresses() -> bool:
+    return os.getenv("CRAWLER_ALLOW_PRIVATE_ADDRESSES", "false").lower() in (
+        "true",
+        "1",
+        "yes",
+    )
+
+
+def is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%")[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def _url_target(url: str) -> Tuple[str, int]:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise BlockedAddress(f"Only http(s) URLs can be crawled: {url}")
+    return parts.hostname, parts.port or (443 if parts.scheme == "https" else 80)
+
+
+def _check_addresses(url: str, host: str, infos: list) -> None:
+    for info in infos:
+        address = info[4][0]
+        if not is_public_address(address):
+            raise BlockedAddress(
+                f"Refusing to crawl {url}: {host} resolves to {address}"
+            )
+
+
+def check_public_url(url: str) -> None:
+    """Raise BlockedAddress unless every address of the URL's host is public."""
+    if _allow_private_addresses():
+        return
+    host, port = _url_target(url)
+    _check_addresses(url, host, socket.getaddrinfo(host, port, type=socket.SOCK_STREAM))
+
+
+async def acheck_public_url(url: str) -> None:
+    """Async variant of check_public_url."""
+    if _allow_private_addresses():
+        return
+    host, port = _url_target(url)
+    infos = await asyncio.get_running_loop().getaddrinfo(
+        host, port, type=socket.SOCK_STREAM
+    )
+    _check_addresses(url, host, infos)
+
+
+def _content_types(name: str, default: str) -> set:
+    return {
+        value.strip().lower()
+        for value in os.getenv(name, default).split(",")
+        if value.strip()
+    }
+
+
+def _check_content_type(response: httpx.Response) -> None:
+    """Raise before the body is read when the content type is not allowed."""
+    content_type = (
+        response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    )
+    if not content_type or content_type in _content_types(
+        "CRAWLER_ALLOWED_CONTENT_TYPES", DEFAULT_ALLOWED_CONTENT_TYPES
+    ):
+        return
+    if content_type in _content_types(
+        "CRAWLER_JINA_CONTENT_TYPES", DEFAULT_JINA_CONTENT_TYPES
+    ):
+        raise UnsupportedContentType(f"Unsupported content type {content_type}")
+    record_fetch("skipped")
+    raise SkippedContentType(f"Skipped content type {content_type}")
+
+
+def _redirect_target(response: httpx.Response, url: str) -> str:
+    location = response.headers.get("Location")
+    if not location:
+        raise FetchError(f"Redirect without Location from {url}")
+    return urljoin(url, location)
+
+
+def _not_modified_page(url: str, response: httpx.Response) -> FetchedPage:
+    return FetchedPage(
+        url=url,
+        html="",
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        not_modified=True,
+    )
+
+
+def _fetched_page(
+    url: str, response: httpx.Response, content: bytes, truncated: bool
+) -> FetchedPage:
+    return FetchedPage(
+        url=url,
+        html=decode_html(content, response.charset_encoding),
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        truncated=truncated,
+    )
+
+
+class DirectClient:
+    def __init__(
+        self, max_redirects: Optional[int] = None, max_bytes: Optional[int] = None
+    ):
+        self.max_redirects = (
+            _env_int("CRAWLER_MAX_REDIRECTS", DEFAULT_MAX_REDIRECTS)
+            if max_redirects is None
+            else max_redirects
+        )
+        self.max_bytes = get_max_page_bytes() if max_bytes is None else max_bytes
+
+    def fetch(self, url: str, headers: Optional[dict] = None) -> FetchedPage:
+        """
+        Fetch a page. Conditional headers (If-None-Match, If-Modified-Since)
+        may be passed; a 304 answer returns a page with not_modified set.
+        """
+        client = get_http_client()
+        for _ in range(self.max_redirects + 1):
+            check_public_url(url)
+            with client.stream(
+                "GET",
+                url,
+                headers={**REQUEST_HEADERS, **(headers or {})},
+                timeout=get_crawl_timeout(url),
+                follow_redirects=False,
+            ) as response:
+                if response.status_code in REDIRECT_STATUSES:
+                    url = _redirect_target(response, url)
+                    continue
+                if response.status_code == 304 and headers:
+                    return _not_modified_page(url, response)
+                response.raise_for_status()
+                _check_content_type(response)
+                content, truncated = read_capped(response, self.max_bytes)
+                return _fetched_page(url, response, content, truncated)
+        raise FetchError(f"More than {self.max_redirects} redirects")
+
+    async def afetch(self, url: str, headers: Optional[dict] = None) -> FetchedPage:
+        client = get_async_http_client()
+        for _ in range(self.max_redirects + 1):
+            await acheck_public_url(url)
+            async with client.stream(
+                "GET",
+                url,
+                headers={**REQUEST_HEADERS, **(headers or {})},
+                timeout=get_crawl_timeout(url),
+                follow_redirects=False,
+            ) as response:
+                if response.status_code in REDIRECT_STATUSES:
+                    url = _redirect_target(response, url)
+                    continue
+                if response.status_code == 304 and headers:
+                    return _not_modified_page(url, response)
+                response.raise_for_status()
+                _check_content_type(response)
+                content, truncated = await aread_capped(response, self.max_bytes)
+                return _fetched_page(url, response, content, truncated)
+        raise FetchError(f"More than {self.max_redirects} redirects")
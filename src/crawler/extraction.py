@@ -0,0 +1,208 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Article extraction in a process pool.
+
+Readability extraction spawns a Node.js process per page and the markdown
+conversion that follows is CPU-heavy pure Python, so neither should run on a
+request thread, where it holds the GIL. Pages are extracted in a reusable
+pool of CRAWLER_EXTRACT_PROCESSES worker processes, and each page is
+given at most CRAWLER_EXTRACT_CPU_TIMEOUT seconds of CPU time. The Node.js
+child is not covered by the worker's CPU timer, so the worker kills it after
+that many seconds of wall time instead; a worker that still does not answer
+in time is killed together with its pool.
+
+CRAWLER_EXTRACTOR selects the algorithm: "readability" (Readability.js via
+Node.js) or "fast" (the pure-Python FastExtractor, which never spawns
+Node.js and is several times cheaper per page).
+"""
+
+import logging
+import os
+import signal
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from .fast_extractor import FastExtractor
+from .markdown import html_to_markdown
+from .readability_extractor import ReadabilityExtractor
+
+logger = logging.getLogger(__name__)
+
+EXTRACTORS = ("readability", "fast")
+DEFAULT_EXTRACTOR = "readability"
+DEFAULT_CPU_TIMEOUT = 20.0
+# More than any consumer keeps of one page (crawl_tool keeps 5000 characters)
+DEFAULT_MARKDOWN_MAX_CHARS = 50000
+# The caller gives up on a worker that has been extracting a page for this
+# many times the CPU budget
+WALL_TIMEOUT_FACTOR = 3
+
+
+class ExtractionTimeout(Exception):
+    """Extracting a page took longer than its CPU time budget."""
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def get_extractor_name() -> str:
+    name = os.getenv("CRAWLER_EXTRACTOR", DEFAULT_EXTRACTOR).lower()
+    if name not in EXTRACTORS:
+        logger.warning(f"未知的正文提取器 {name}，使用 {DEFAULT_EXTRACTOR}")
+        return DEFAULT_EXTRACTOR
+    return name
+
+
+def get_cpu_timeout() -> float:
+    return _env_number("CRAWLER_EXTRACT_CPU_TIMEOUT", DEFAULT_CPU_TIMEOUT)
+
+
+def get_markdown_max_chars() -> int:
+    """How much of a page is converted to markdown when it is extracted."""
+    return int(_env_number("CRAWLER_MARKDOWN_MAX_CHARS", DEFAULT_MARKDOWN_MAX_CHARS))
+
+
+def create_extractor(timeout: Optional[float] = None):
+    """The extractor selected by CRAWLER_EXTRACTOR; timeout limits Node.js runs."""
+    if get_extractor_name() == "fast":
+        return FastExtractor()
+    return ReadabilityExtractor(timeout=timeout)
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout("正文提取超过 CPU 时间限制")
+
+
+def extract_page(html: str, cpu_timeout: Optional[float] = None) -> dict:
+    """
+    Extract the article of a page and convert up to CRAWLER_MARKDOWN_MAX_CHARS
+    of it to markdown.
+
+    Runs inside a pool worker. The CPU budget is enforced with a profiling
+    timer, which only counts time the worker actually spends computing.
+
+    Returns:
+        A dict with title, html_content, markdown (without the title) and
+        markdown_max_chars, the limit markdown was converted up to
+    """
+    use_timer = bool(cpu_timeout) and hasattr(signal, "ITIMER_PROF")
+    if use_timer:
+        signal.signal(signal.SIGPROF, _raise_timeout)
+        signal.setitimer(signal.ITIMER_PROF, cpu_timeout)
+    try:
+        try:
+            article = create_extractor(cpu_timeout).extract_article(html)
+        except subprocess.TimeoutExpired:
+            raise ExtractionTimeout("Readability.js 超过时间限制")
+        max_chars = get_markdown_max_chars()
+        return {
+            "title": article.title,
+            "html_content": article.html_content,
+            "markdown": html_to_markdown(
+                article.html_content or "", max_chars=max_chars
+            ),
+            "markdown_max_chars": max_chars,
+        }
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+
+
+class ExtractionPool:
+    """Lazily started process pool that is replaced when a worker dies."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.timeouts = 0
+        # What workers run for each page
+        self._task = extract_page
+        # Pages are only handed to the executor when a worker is free, so the
+        # wall-clock limit does not count time spent waiting behind others
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor, kill: bool = False) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        if kill:
+            # shutdown leaves a hung worker running; pages still being
+            # extracted by the other workers fail with BrokenProcessPool
+            for process in list((getattr(executor, "_processes", None) or {}).values()):
+                process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def extract(self, html: str) -> dict:
+        """Extract a page in the pool, blocking the calling thread until it is done."""
+        cpu_timeout = get_cpu_timeout()
+        with self._slots:
+            return self._extract(html, cpu_timeout)
+
+    def _extract(self, html: str, cpu_timeout: float) -> dict:
+        executor = self._get_executor()
+        try:
+            future = executor.submit(self._task, html, cpu_timeout)
+            return future.result(timeout=cpu_timeout * WALL_TIMEOUT_FACTOR or None)
+        except (ExtractionTimeout, FutureTimeoutError) as e:
+            with self._lock:
+                self.timeouts += 1
+            logger.warning(f"正文提取超时 (CPU 限制 {cpu_timeout}s)")
+            if isinstance(e, FutureTimeoutError):
+                # The worker is hung; replace it rather than leave it
+                # occupying the pool
+                self._reset(executor, kill=True)
+            raise ExtractionTimeout(f"Extraction exceeded {cpu_timeout}s")
+        except BrokenProcessPool:
+            # A worker crashed (e.g. killed for memory); start a fresh pool
+            # for the next page
+            self._reset(executor)
+            raise
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_extraction_pool: Optional[ExtractionPool] = None
+_extraction_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> Optional[ExtractionPool]:
+    """
+    Get the process-wide extraction pool; None when CRAWLER_EXTRACT_PROCESSES
+    is 0, in which case pages are extracted in the calling thread.
+    """
+    global _extraction_pool
+    workers = int(_env_number("CRAWLER_EXTRACT_PROCESSES", min(os.cpu_count() or 1, 4)))
+    if workers <= 0:
+        return None
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ExtractionPool(workers)
+        return _extraction_pool
+
+
+def shutdown_extraction_pool() -> None:
+    with _extraction_pool_lock:
+        pool = _extraction_pool
+    if pool is not None:
+        pool.shutdown()
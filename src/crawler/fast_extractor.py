@@ -0,0 +1,202 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Pure-Python article extractor.
+
+A compact version of the Readability content-scoring heuristic on top of
+lxml (installed with readabilipy): boilerplate containers are dropped,
+paragraphs score their parent blocks by text length and punctuation, scores
+are discounted by link density, and the best block plus its related siblings
+becomes the article. It needs no Node.js process, so it is much cheaper than
+Readability.js, at some cost in accuracy on unusual layouts.
+"""
+
+import re
+from typing import Dict, Optional
+
+import lxml.html
+from lxml.etree import ParserError
+
+from .article import Article
+
+_REMOVED_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "iframe",
+    "form",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "button",
+    "input",
+    "select",
+    "svg",
+)
+# Class / id words of containers that hold boilerplate rather than the article
+_UNLIKELY_WORDS = {
+    "ad",
+    "ads",
+    "advert",
+    "advertisement",
+    "banner",
+    "breadcrumb",
+    "comment",
+    "comments",
+    "cookie",
+    "footer",
+    "header",
+    "hot",
+    "login",
+    "menu",
+    "nav",
+    "popup",
+    "promo",
+    "recommend",
+    "related",
+    "share",
+    "sidebar",
+    "social",
+    "sponsor",
+    "subscribe",
+    "toolbar",
+    "top",
+}
+_WORD_SPLIT_RE = re.compile(r"[\s_-]+")
+_POSITIVE_RE = re.compile(r"article|body|content|entry|main|post|story|text", re.I)
+_NEGATIVE_RE = re.compile(
+    r"comment|footer|foot|meta|nav|related|share|sidebar|social|sponsor|widget", re.I
+)
+_PARAGRAPH_TAGS = ("p", "pre", "td", "blockquote", "li", "h2", "h3")
+_CONTAINER_SCORES = {
+    "div": 5,
+    "article": 10,
+    "section": 3,
+    "main": 5,
+    "pre": 3,
+    "td": 3,
+    "blockquote": 3,
+    "ul": -3,
+    "ol": -3,
+    "li": -3,
+    "th": -5,
+    "h1": -5,
+    "h2": -5,
+    "h3": -5,
+}
+_COMMA_RE = re.compile(r"[,，、；;。]")
+_TITLE_SEPARATOR_RE = re.compile(r"\s*(?:[|_–—]| - )\s*")
+MIN_PARAGRAPH_CHARS = 25
+
+
+def _class_weight(element) -> int:
+    names = f"{element.get('class', '')} {element.get('id', '')}"
+    weight = 0
+    if _NEGATIVE_RE.search(names):
+        weight -= 25
+    if _POSITIVE_RE.search(names):
+        weight += 25
+    return weight
+
+
+def _text_length(element) -> int:
+    return len(" ".join(element.text_content().split()))
+
+
+def _link_density(element) -> float:
+    length = _text_length(element)
+    if not length:
+        return 0.0
+    link_length = sum(_text_length(link) for link in element.iter("a"))
+    return link_length / length
+
+
+def _remove_boilerplate(root) -> None:
+    for element in list(root.iter(*_REMOVED_TAGS)):
+        if element.getparent() is not None:
+            element.drop_tree()
+    for element in list(root.iter()):
+        if element.getparent() is None or not isinstance(element.tag, str):
+            continue
+        names = f"{element.get('class', '')} {element.get('id', '')}"
+        words = set(_WORD_SPLIT_RE.split(names.lower()))
+        if (
+            element.tag not in ("body", "article", "main")
+            and words & _UNLIKELY_WORDS
+            and not _POSITIVE_RE.search(names)
+        ):
+            element.drop_tree()
+
+
+def _extract_title(root) -> str:
+    title = " ".join((root.findtext(".//title") or "").split())
+    for heading in root.iter("h1"):
+        text = " ".join(heading.text_content().split())
+        if text and (not title or text in title):
+            return text
+    # Drop the site name that titles usually end with
+    parts = _TITLE_SEPARATOR_RE.split(title)
+    return max(parts, key=len) if len(parts) > 1 else title
+
+
+class FastExtractor:
+    def extract_article(self, html: str) -> Article:
+        try:
+            root = lxml.html.fromstring(html)
+        except (ParserError, ValueError):
+            return Article(title="", html_content="")
+        title = _extract_title(root)
+        _remove_boilerplate(root)
+
+        scores: Dict[lxml.html.HtmlElement, float] = {}
+
+        def add_score(element, score: float) -> None:
+            if element is None or not isinstance(element.tag, str):
+                return
+            if element not in scores:
+                scores[element] = _CONTAINER_SCORES.get(element.tag, 0) + _class_weight(
+                    element
+                )
+            scores[element] += score
+
+        for paragraph in root.iter(*_PARAGRAPH_TAGS):
+            text = " ".join(paragraph.text_content().split())
+            if len(text) < MIN_PARAGRAPH_CHARS:
+                continue
+            score = 1 + len(_COMMA_RE.findall(text)) + min(len(text) // 100, 3)
+            parent = paragraph.getparent()
+            add_score(parent, score)
+            if parent is not None:
+                add_score(parent.getparent(), score / 2)
+
+        best: Optional[lxml.html.HtmlElement] = None
+        best_score = 0.0
+        for element, score in scores.items():
+            score *= 1 - _link_density(element)
+            scores[element] = score
+            if best is None or score > best_score:
+                best, best_score = element, score
+        if best is None:
+            body = root.find(".//body")
+            best = body if body is not None else root
+
+        # Siblings that score well or read like prose belong to the article too
+        parts = []
+        parent = best.getparent()
+        siblings = list(parent) if parent is not None else [best]
+        threshold = max(10.0, best_score * 0.2)
+        for sibling in siblings:
+            if sibling is best or scores.get(sibling, 0) >= threshold:
+                parts.append(sibling)
+            elif sibling.tag == "p":
+                text = sibling.text_content()
+                if len(text) > 80 and _link_density(sibling) < 0.25:
+                    parts.append(sibling)
+
+        content = "".join(
+            lxml.html.tostring(part, encoding="unicode", with_tail=False)
+            for part in parts
+        )
+        return Article(title=title, html_content=f"<div>{content}</div>")
@@ -4,23 +4,60 @@
 import logging
 import os
 
-import requests
+from src.utils.http_client import get_async_http_client, get_http_client
+
+from .direct_client import decode_html
+from .limits import aread_capped, get_crawl_timeout, get_max_page_bytes, read_capped
 
 logger = logging.getLogger(__name__)
 
+JINA_READER_URL = "https://r.jina.ai/"
+
+_warned_missing_key = False
+
+
+def _warn_missing_key() -> None:
+    global _warned_missing_key
+    _warned_missing_key = True
+    logger.warning(
+        "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
+    )
+
 
 class JinaClient:
-    def crawl(self, url: str, return_format: str = "html") -> str:
+    def _headers(self, return_format: str) -> dict:
         headers = {
             "Content-Type": "application/json",
             "X-Return-Format": return_format,
         }
         if os.getenv("JINA_API_KEY"):
             headers["Authorization"] = f"Bearer {os.getenv('JINA_API_KEY')}"
-        else:
-            logger.warning(
-                "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
-            )
-        data = {"url": url}
-        response = requests.post("https://r.jina.ai/", headers=headers, json=data)
-        return response.text
+        elif not _warned_missing_key:
+            # Once per process rather than on every crawl
+            _warn_missing_key()
+        return headers
+
+    def crawl(self, url: str, return_format: str = "html") -> str:
+        # Streamed and capped so a huge page never sits in memory whole
+        with get_http_client().stream(
+            "POST",
+            JINA_READER_URL,
+            headers=self._headers(return_format),
+            json={"url": url},
+            timeout=get_crawl_timeout(url),
+        ) as response:
+            response.raise_for_status()
+            content, _ = read_capped(response, get_max_page_bytes())
+        return decode_html(content, response.charset_encoding or "utf-8")
+
+    async def acrawl(self, url: str, return_format: str = "html") -> str:
+        async with get_async_http_client().stream(
+            "POST",
+            JINA_READER_URL,
+            headers=self._headers(return_format),
+            json={"url": url},
+            timeout=get_crawl_timeout(url),
+        ) as response:
+            response.raise_for_status()
+            content, _ = await aread_capped(response, get_max_page_bytes())
+        return decode_html(content, response.charset_encoding or "utf-8")
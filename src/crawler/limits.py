@@ -0,0 +1,469 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Timeouts, size and concurrency limits for crawling.
+
+At most CRAWLER_MAX_CONCURRENCY pages are fetched at once overall and at most
+CRAWLER_MAX_PER_HOST from any one site, so parallel research steps neither
+flood the reader service nor hammer a single origin.
+
+Response bodies are streamed and reading stops at CRAWLER_MAX_PAGE_BYTES, so
+a huge page costs at most that much memory; the rest of it is never
+downloaded.
+
+Fetches from one host are also spaced at least CRAWLER_HOST_MIN_INTERVAL
+seconds apart, and every host has a rolling record of its recent fetch
+latencies and failures. Hosts whose median latency is above
+CRAWLER_SLOW_DOMAIN_SECONDS get the shorter CRAWLER_SLOW_DOMAIN_READ_TIMEOUT,
+and hosts where at least CRAWLER_DOMAIN_MAX_ERROR_RATE of recent fetches
+failed are skipped for CRAWLER_DOMAIN_COOLDOWN seconds, with an error that
+tells the agent to use another source.
+
+asyncio semaphores belong to one event loop, so async limits are kept per
+loop; the blocking crawl API uses thread semaphores. The per-host semaphores
+live in the host's record, so hosts forgotten after MAX_TRACKED_DOMAINS newer
+ones take their semaphores with them; hosts with fetches under way are kept.
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_PER_HOST = 2
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_MAX_PAGE_BYTES = 2 * 1024 * 1024
+DEFAULT_HOST_MIN_INTERVAL = 0.25
+DEFAULT_SLOW_DOMAIN_SECONDS = 10.0
+DEFAULT_SLOW_DOMAIN_READ_TIMEOUT = 10.0
+DEFAULT_DOMAIN_MAX_ERROR_RATE = 0.6
+DEFAULT_DOMAIN_COOLDOWN = 300.0
+# Fetches remembered per host, and how many are needed to judge a host
+DOMAIN_WINDOW = 20
+DOMAIN_MIN_SAMPLES = 3
+MAX_TRACKED_DOMAINS = 1024
+
+_fetch_counts: Counter = Counter()
+_fetch_counts_lock = threading.Lock()
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def get_crawl_timeout(url: Optional[str] = None) -> httpx.Timeout:
+    """
+    Connect and read timeouts from CRAWLER_CONNECT_TIMEOUT / CRAWLER_READ_TIMEOUT
+    (seconds); fetches of url get a shorter read timeout when its host is slow.
+    """
+    read = _env_number("CRAWLER_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)
+    if url is not None and get_crawl_limiter().is_slow(url):
+        read = min(
+            read,
+            _env_number(
+                "CRAWLER_SLOW_DOMAIN_READ_TIMEOUT", DEFAULT_SLOW_DOMAIN_READ_TIMEOUT
+            ),
+        )
+    return httpx.Timeout(
+        read,
+        connect=_env_number("CRAWLER_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+        read=read,
+    )
+
+
+def get_max_page_bytes() -> int:
+    return int(_env_number("CRAWLER_MAX_PAGE_BYTES", DEFAULT_MAX_PAGE_BYTES))
+
+
+def record_fetch(event: str, size: int = 0) -> None:
+    """Count a fetch outcome ("complete", "truncated" or "skipped") and its bytes."""
+    with _fetch_counts_lock:
+        _fetch_counts[event] += 1
+        _fetch_counts["bytes"] += size
+
+
+def get_fetch_stats() -> dict:
+    with _fetch_counts_lock:
+        return dict(_fetch_counts)
+
+
+def _capped(url: str, content: bytearray, max_bytes: int) -> Tuple[bytes, bool]:
+    if len(content) > max_bytes:
+        logger.info(f"页面超过 {max_bytes} 字节，已截断: {url}")
+        record_fetch("truncated", max_bytes)
+        return bytes(content[:max_bytes]), True
+    record_fetch("complete", len(content))
+    return bytes(content), False
+
+
+def read_capped(response: httpx.Response, max_bytes: int) -> Tuple[bytes, bool]:
+    """
+    Read a streamed response body up to max_bytes.
+
+    Returns:
+        The body (cut at max_bytes) and whether it was cut
+    """
+    content = bytearray()
+    for chunk in response.iter_bytes():
+        content.extend(chunk)
+        if len(content) > max_bytes:
+            # Stop downloading; closing the stream drops the connection
+            break
+    return _capped(str(response.url), content, max_bytes)
+
+
+async def aread_capped(response: httpx.Response, max_bytes: int) -> Tuple[bytes, bool]:
+    """Async variant of read_capped."""
+    content = bytearray()
+    async for chunk in response.aiter_bytes():
+        content.extend(chunk)
+        if len(content) > max_bytes:
+            break
+    return _capped(str(response.url), content, max_bytes)
+
+
+def host_of(url: str) -> str:
+    try:
+        return (urlsplit(url.strip()).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+class DomainSkipped(Exception):
+    """A host is skipped for now because most of its recent fetches failed."""
+
+
+def _is_domain_failure(error: BaseException) -> bool:
+    """Whether an error says the host is down or overloaded, rather than the page being unusable."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, (httpx.TransportError, TimeoutError))
+
+
+class DomainHealth:
+    """
+    Rolling record of recent fetch latencies and failures of one host, with
+    its concurrency slots.
+    """
+
+    def __init__(self, max_per_host: int):
+        self.samples: deque = deque(maxlen=DOMAIN_WINDOW)
+        self.last_failure = 0.0
+        # Earliest time the next fetch may start
+        self.next_start = 0.0
+        self.skipped = 0
+        # Callers waiting for or holding one of the host's slots
+        self.users = 0
+        self.thread_semaphore = threading.BoundedSemaphore(max_per_host)
+        self.loop_semaphores: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+        ) = weakref.WeakKeyDictionary()
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.samples.append((seconds, ok))
+        if not ok:
+            self.last_failure = time.monotonic()
+
+    @property
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    @property
+    def median_latency(self) -> float:
+        if not self.samples:
+            return 0.0
+        return statistics.median(seconds for seconds, _ in self.samples)
+
+
+class CrawlLimiter:
+    """
+    Global plus per-host concurrency limit for page fetches, with per-host
+    request spacing and slow / failing host tracking.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_per_host: int,
+        min_interval: float = 0.0,
+        slow_seconds: float = DEFAULT_SLOW_DOMAIN_SECONDS,
+        max_error_rate: float = DEFAULT_DOMAIN_MAX_ERROR_RATE,
+        cooldown: float = DEFAULT_DOMAIN_COOLDOWN,
+    ):
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.max_per_host = max(int(max_per_host), 1)
+        self.min_interval = max(min_interval, 0.0)
+        self.slow_seconds = slow_seconds
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        self._domains: "OrderedDict[str, DomainHealth]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Callers waiting for or holding a slot of any host, sync or async
+        self._users = 0
+        self._thread_global = threading.BoundedSemaphore(self.max_concurrency)
+        self._loop_globals: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+        ) = weakref.WeakKeyDictionary()
+
+    def _domain(self, host: str) -> DomainHealth:
+        # Called with self._lock held
+        domain = self._domains.get(host)
+        if domain is None:
+            domain = self._domains[host] = DomainHealth(self.max_per_host)
+            self._forget_idle_domains(host)
+        else:
+            self._domains.move_to_end(host)
+        return domain
+
+    def _forget_idle_domains(self, keep: str) -> None:
+        # Called with self._lock held. Hosts in use keep their record, since
+        # a new one would come with fresh semaphores
+        excess = len(self._domains) - MAX_TRACKED_DOMAINS
+        if excess <= 0:
+            return
+        idle = [
+            host
+            for host, domain in self._domains.items()
+            if host != keep and not domain.users
+        ]
+        for host in idle[:excess]:
+            del self._domains[host]
+
+    def _is_failing(self, domain: DomainHealth) -> bool:
+        return (
+            len(domain.samples) >= DOMAIN_MIN_SAMPLES
+            and domain.error_rate >= self.max_error_rate
+            and time.monotonic() - domain.last_failure < self.cooldown
+        )
+
+    def is_slow(self, url: str) -> bool:
+        with self._lock:
+            domain = self._domains.get(host_of(url))
+            return (
+                domain is not None
+                and len(domain.samples) >= DOMAIN_MIN_SAMPLES
+                and domain.median_latency >= self.slow_seconds
+            )
+
+    def check_domain(self, url: str) -> None:
+        """Raise DomainSkipped when the host of url is failing."""
+        host = host_of(url)
+        with self._lock:
+            domain = self._domains.get(host)
+            if domain is None or not self._is_failing(domain):
+                return
+            domain.skipped += 1
+            failures = sum(1 for _, ok in domain.samples if not ok)
+            total = len(domain.samples)
+        logger.info(f"跳过故障域名 {host} (最近 {total} 次抓取失败 {failures} 次)")
+        raise DomainSkipped(
+            f"{host} is skipped for now: {failures} of its last {total} fetches "
+            "failed or timed out. Use another source for this information."
+        )
+
+    def record(self, url: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._domain(host_of(url)).record(seconds, ok)
+
+    def _reserve_start(self, url: str) -> float:
+        """Book the next start slot of the host; returns how long to wait for it."""
+        with self._lock:
+            domain = self._domain(host_of(url))
+            now = time.monotonic()
+            start = max(now, domain.next_start)
+            domain.next_start = start + self.min_interval
+            return start - now
+
+    def _can_start_now(self, url: str) -> bool:
+        with self._lock:
+            return self._domain(host_of(url)).next_start <= time.monotonic()
+
+    @contextmanager
+    def track(self, url: str):
+        """Record the latency and outcome of a fetch from the host of url."""
+        started = time.monotonic()
+        try:
+            yield
+        except (asyncio.CancelledError, GeneratorExit):
+            # The caller gave up, so neither the elapsed time nor the outcome
+            # says anything about the host
+            raise
+        except BaseException as e:
+            self.record(url, time.monotonic() - started, not _is_domain_failure(e))
+            raise
+        self.record(url, time.monotonic() - started, True)
+
+    def get_domain_stats(self, limit: int = 20) -> dict:
+        """Latency and error figures of the most recently crawled hosts."""
+        with self._lock:
+            domains = list(self._domains.items())[-limit:]
+            return {
+                host: {
+                    "fetches": len(domain.samples),
+                    "median_latency": round(domain.median_latency, 3),
+                    "error_rate": round(domain.error_rate, 3),
+                    "skipped": domain.skipped,
+                    "slow": len(domain.samples) >= DOMAIN_MIN_SAMPLES
+                    and domain.median_latency >= self.slow_seconds,
+                    "failing": self._is_failing(domain),
+                }
+                for host, domain in reversed(domains)
+            }
+
+    @contextmanager
+    def _using(self, url: str, only_if_idle: bool = False):
+        """
+        Yield the record of the host of url, which is not forgotten meanwhile.
+        With only_if_idle, yield None instead when another caller is using
+        the host or all slots are wanted.
+        """
+        with self._lock:
+            domain = self._domain(host_of(url))
+            if only_if_idle and (domain.users or self._users >= self.max_concurrency):
+                domain = None
+            else:
+                domain.users += 1
+                self._users += 1
+        if domain is None:
+            yield None
+            return
+        try:
+            yield domain
+        finally:
+            with self._lock:
+                domain.users -= 1
+                self._users -= 1
+
+    def _tracked(self, url: str, track: bool):
+        return self.track(url) if track else nullcontext()
+
+    @contextmanager
+    def limit_sync(self, url: str, track: bool = True):
+        """
+        Hold a crawl slot for url. With track=False the caller records the
+        fetch itself with track(), e.g. when part of it goes to another host.
+        """
+        self.check_domain(url)
+        with self._using(url) as domain, domain.thread_semaphore:
+            delay = self._reserve_start(url)
+            if delay > 0:
+                time.sleep(delay)
+            with self._thread_global, self._tracked(url, track):
+                yield
+
+    @contextmanager
+    def try_limit_sync(self, url: str, track: bool = True):
+        """
+        Like limit_sync, but yields False instead of waiting for a busy slot or
+        for the host's request spacing, and for slow or failing hosts.
+
+        Background fetches use it to yield to real crawls, so it also yields
+        False while any other crawl of the host, blocking or async, is under
+        way or waiting, and while CRAWLER_MAX_CONCURRENCY crawls are.
+        """
+        try:
+            self.check_domain(url)
+        except DomainSkipped:
+            yield False
+            return
+        if self.is_slow(url):
+            yield False
+            return
+        with self._using(url, only_if_idle=True) as domain:
+            if domain is None:
+                yield False
+                return
+            host_semaphore = domain.thread_semaphore
+            if not host_semaphore.acquire(blocking=False):
+                yield False
+                return
+            try:
+                if not self._can_start_now(url) or not self._thread_global.acquire(
+                    blocking=False
+                ):
+                    yield False
+                    return
+                try:
+                    self._reserve_start(url)
+                    with self._tracked(url, track):
+                        yield True
+                finally:
+                    self._thread_global.release()
+            finally:
+                host_semaphore.release()
+
+    def _async_semaphores(self, domain: DomainHealth):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            global_semaphore = self._loop_globals.get(loop)
+            if global_semaphore is None:
+                global_semaphore = self._loop_globals[loop] = asyncio.Semaphore(
+                    self.max_concurrency
+                )
+            host_semaphore = domain.loop_semaphores.get(loop)
+            if host_semaphore is None:
+                host_semaphore = domain.loop_semaphores[loop] = asyncio.Semaphore(
+                    self.max_per_host
+                )
+        return global_semaphore, host_semaphore
+
+    @asynccontextmanager
+    async def limit(self, url: str, track: bool = True):
+        # The host slot is taken first so that a busy host does not hold
+        # global slots that other hosts could use
+        self.check_domain(url)
+        with self._using(url) as domain:
+            global_semaphore, host_semaphore = self._async_semaphores(domain)
+            async with host_semaphore:
+                delay = self._reserve_start(url)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                async with global_semaphore:
+                    with self._tracked(url, track):
+                        yield
+
+
+_crawl_limiter = None
+_crawl_limiter_lock = threading.Lock()
+
+
+def get_crawl_limiter() -> CrawlLimiter:
+    """Get the process-wide crawl limiter, configured from the environment on first use."""
+    global _crawl_limiter
+    with _crawl_limiter_lock:
+        if _crawl_limiter is None:
+            _crawl_limiter = CrawlLimiter(
+                _env_number("CRAWLER_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY),
+                _env_number("CRAWLER_MAX_PER_HOST", DEFAULT_MAX_PER_HOST),
+                _env_number("CRAWLER_HOST_MIN_INTERVAL", DEFAULT_HOST_MIN_INTERVAL),
+                _env_number("CRAWLER_SLOW_DOMAIN_SECONDS", DEFAULT_SLOW_DOMAIN_SECONDS),
+                _env_number(
+                    "CRAWLER_DOMAIN_MAX_ERROR_RATE", DEFAULT_DOMAIN_MAX_ERROR_RATE
+                ),
+                _env_number("CRAWLER_DOMAIN_COOLDOWN", DEFAULT_DOMAIN_COOLDOWN),
+            )
+        return _crawl_limiter
+
+
+def get_crawl_domain_stats() -> dict:
+    return get_crawl_limiter().get_domain_stats()
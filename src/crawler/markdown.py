@@ -0,0 +1,254 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Budget-aware HTML to markdown conversion.
+
+Converting a whole article with markdownify and then keeping its first few
+thousand characters wastes most of the work on long pages. The converter
+here walks the article block by block (paragraphs, headings, lists, tables,
+code) and stops as soon as the character or token budget is spent, so the
+cost is roughly proportional to what is kept.
+
+With a query, blocks are picked by BM25 relevance instead of document order,
+each together with the heading of its section, and emitted in document order.
+"""
+
+import re
+from typing import Iterator, List, Optional
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import Comment
+from markdownify import MarkdownConverter
+
+from src.utils.text_utils import bm25_scores
+from src.utils.token_utils import estimate_tokens, truncate_to_tokens
+
+# Elements that only group blocks; the converter descends into them
+CONTAINER_TAGS = {
+    "[document]",
+    "html",
+    "body",
+    "div",
+    "section",
+    "article",
+    "main",
+    "header",
+    "footer",
+    "aside",
+    "nav",
+    "center",
+}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# Elements converted as one block each; anything else is inline content
+BLOCK_TAGS = HEADING_TAGS | {
+    "p",
+    "ul",
+    "ol",
+    "dl",
+    "pre",
+    "table",
+    "blockquote",
+    "figure",
+    "hr",
+    "form",
+    "details",
+    "address",
+}
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "head"}
+GAP_MARKER = "…"
+
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+class _Budget:
+    """Remaining characters and tokens of the output."""
+
+    def __init__(self, max_chars: Optional[int], max_tokens: Optional[int]):
+        self.chars = max_chars
+        self.tokens = max_tokens
+
+    def fits(self, text: str) -> bool:
+        if self.chars is not None and len(text) > self.chars:
+            return False
+        if self.tokens is not None and estimate_tokens(text) > self.tokens:
+            return False
+        return True
+
+    def spend(self, text: str) -> None:
+        if self.chars is not None:
+            self.chars -= len(text)
+        if self.tokens is not None:
+            self.tokens -= estimate_tokens(text)
+
+    def cut(self, text: str) -> str:
+        """The longest prefix of text that fits."""
+        if self.chars is not None:
+            text = text[: max(self.chars, 0)]
+        if self.tokens is not None:
+            text = truncate_to_tokens(text, max(self.tokens, 0), marker="")
+        return text
+
+    @property
+    def exhausted(self) -> bool:
+        return (self.chars is not None and self.chars <= 0) or (
+            self.tokens is not None and self.tokens <= 0
+        )
+
+
+def cut_to_budget(
+    text: str, max_chars: Optional[int] = None, max_tokens: Optional[int] = None
+) -> str:
+    """The longest prefix of text within the character and token budget."""
+    return _Budget(max_chars, max_tokens).cut(text)
+
+
+def iter_blocks(node: Tag) -> Iterator:
+    """
+    Yield the blocks of an HTML tree in document order.
+
+    A block is either a block-level element or a list of consecutive inline
+    nodes (text, links, emphasis, ...) that form one paragraph.
+    """
+    run = []
+    for child in node.children:
+        if isinstance(child, Comment):
+            continue
+        if isinstance(child, Tag) and child.name in SKIPPED_TAGS:
+            continue
+        if isinstance(child, Tag) and (
+            child.name in CONTAINER_TAGS or child.name in BLOCK_TAGS
+        ):
+            if run:
+                yield run
+                run = []
+            if child.name in CONTAINER_TAGS:
+                yield from iter_blocks(child)
+            else:
+                yield child
+        elif isinstance(child, Tag) or child.strip():
+            run.append(child)
+        elif run:
+            # Whitespace between inline nodes
+            run.append(child)
+    if run:
+        yield run
+
+
+def _block_text(block) -> str:
+    if isinstance(block, list):
+        return " ".join(
+            (node if isinstance(node, NavigableString) else node.get_text(" "))
+            for node in block
+        )
+    return block.get_text(" ")
+
+
+def _block_markdown(converter: MarkdownConverter, block) -> str:
+    if isinstance(block, list):
+        return "".join(converter.process_element(node, set()) for node in block).strip()
+    return converter.convert_soup(block).strip("\n")
+
+
+def _join(parts: List[str]) -> str:
+    return _BLANK_LINES_RE.sub(
+        "\n\n", "\n\n".join(part for part in parts if part)
+    ).strip()
+
+
+def _convert_in_order(blocks: Iterator, budget: _Budget, converter) -> str:
+    parts = []
+    for block in blocks:
+        if budget.exhausted:
+            break
+        markdown = _block_markdown(converter, block)
+        if not markdown:
+            continue
+        separator = "\n\n" if parts else ""
+        if not budget.fits(separator + markdown):
+            parts.append(budget.cut(separator + markdown).lstrip("\n"))
+            break
+        budget.spend(separator + markdown)
+        parts.append(markdown)
+    return _join(parts)
+
+
+def _convert_by_relevance(blocks: list, query: str, budget: _Budget, converter) -> str:
+    texts = [_block_text(block) for block in blocks]
+    scores = bm25_scores([" ".join(text.split()) for text in texts], query)
+    # The heading of the section each block belongs to
+    section_heading = []
+    current = None
+    for i, block in enumerate(blocks):
+        if isinstance(block, Tag) and block.name in HEADING_TAGS:
+            current = i
+        section_heading.append(current)
+
+    ranked = sorted(range(len(blocks)), key=lambda i: (-scores[i], i))
+    chosen = {}
+    for i in ranked:
+        if budget.exhausted:
+            break
+        # Markdown is rarely shorter than the text it renders, so blocks whose
+        # text alone does not fit are skipped without converting them
+        if i in chosen or not budget.fits(texts[i].strip()):
+            continue
+        picked = [i]
+        heading = section_heading[i]
+        if heading is not None and heading not in chosen and heading != i:
+            picked.insert(0, heading)
+        markdowns = {j: _block_markdown(converter, blocks[j]) for j in picked}
+        cost = "\n\n".join(markdowns.values()) + "\n\n"
+        if not budget.fits(cost):
+            if len(picked) == 1 or not budget.fits(markdowns[i] + "\n\n"):
+                continue
+            # The block fits without its heading
+            markdowns.pop(heading)
+            cost = markdowns[i] + "\n\n"
+        budget.spend(cost)
+        chosen.update(markdowns)
+
+    parts = []
+    previous = None
+    for i in sorted(chosen):
+        if previous is not None and i != previous + 1:
+            parts.append(GAP_MARKER)
+        parts.append(chosen[i])
+        previous = i
+    return _join(parts)
+
+
+def html_to_markdown(
+    html: str,
+    max_chars: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    query: Optional[str] = None,
+    **markdownify_options,
+) -> str:
+    """
+    Convert HTML to markdown, stopping once the output budget is reached.
+
+    Args:
+        html: The HTML to convert, typically an extracted article
+        max_chars: Character budget of the output, or None for no limit
+        max_tokens: Estimated token budget of the output, or None for no limit
+        query: If given, the blocks most relevant to it are kept first
+        **markdownify_options: Options passed to markdownify's converter
+
+    Returns:
+        The markdown, at most max_chars characters and about max_tokens tokens
+    """
+    if not html:
+        return ""
+    soup = BeautifulSoup(html, "html.parser")
+    converter = MarkdownConverter(**markdownify_options)
+    budget = _Budget(max_chars, max_tokens)
+    if query and (max_chars is not None or max_tokens is not None):
+        markdown = _convert_by_relevance(
+            list(iter_blocks(soup)), query, budget, converter
+        )
+    else:
+        markdown = _convert_in_order(iter_blocks(soup), budget, converter)
+    # Token estimates of the parts do not add up exactly, and gap markers are
+    # not charged while picking blocks
+    return cut_to_budget(markdown, max_chars, max_tokens)
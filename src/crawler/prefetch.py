@@ -0,0 +1,266 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Speculative prefetching of search results into the crawl cache.
+
+The researcher usually crawls some of the top results of a search one LLM
+round trip after the search returned. With CRAWL_PREFETCH_ENABLED, the top
+CRAWL_PREFETCH_TOP_K result URLs of every search in a research run are
+fetched and extracted in the background, so that the later crawl is served
+from the crawl cache.
+
+Prefetching is low priority: it runs on CRAWL_PREFETCH_WORKERS background
+threads, only fetches from hosts that no blocking or async crawl is using or
+waiting for, and only while crawl slots are free. Each run spends at most
+CRAWL_PREFETCH_MAX_BYTES of downloads and CRAWL_PREFETCH_TIME_BUDGET seconds
+of fetching on it. A prefetched page that is crawled later counts as a hit;
+one that is not counts as waste.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from src.utils.url_utils import canonicalize_url
+
+from .cache import get_crawl_cache
+from .crawler import Crawler
+from .limits import get_crawl_limiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 3
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_BYTES_PER_RUN = 10 * 1024 * 1024
+DEFAULT_TIME_BUDGET_PER_RUN = 60.0
+# Searches arrive in bursts; URLs beyond this many waiting jobs are dropped
+MAX_PENDING = 32
+MAX_RUNS = 256
+MAX_TRACKED_PAGES = 2048
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def is_prefetch_enabled() -> bool:
+    return os.getenv("CRAWL_PREFETCH_ENABLED", "false").lower() in (
+        "true",
+        "1",
+        "yes",
+    )
+
+
+def get_prefetch_top_k() -> int:
+    return int(_env_number("CRAWL_PREFETCH_TOP_K", DEFAULT_TOP_K))
+
+
+class _RunBudget:
+    def __init__(self):
+        self.bytes = 0
+        self.seconds = 0.0
+
+
+class Prefetcher:
+    """Background fetcher of search result pages, with per-run budgets."""
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        max_bytes: int = DEFAULT_MAX_BYTES_PER_RUN,
+        time_budget: float = DEFAULT_TIME_BUDGET_PER_RUN,
+    ):
+        self.workers = max(int(workers), 1)
+        self.max_bytes = max_bytes
+        self.time_budget = time_budget
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._budgets: "OrderedDict[str, _RunBudget]" = OrderedDict()
+        # Prefetched (or scheduled) pages: size in bytes, or None until fetched
+        self._pages: "OrderedDict[str, Optional[int]]" = OrderedDict()
+        self._counts: Counter = Counter()
+
+    def _budget(self, run_id: str) -> _RunBudget:
+        budget = self._budgets.get(run_id)
+        if budget is None:
+            budget = self._budgets[run_id] = _RunBudget()
+            while len(self._budgets) > MAX_RUNS:
+                self._budgets.popitem(last=False)
+        else:
+            self._budgets.move_to_end(run_id)
+        return budget
+
+    def _exhausted(self, run_id: str) -> bool:
+        budget = self._budget(run_id)
+        return budget.bytes >= self.max_bytes or budget.seconds >= self.time_budget
+
+    def schedule(self, urls: Iterable[str], run_id: str) -> int:
+        """Queue urls for prefetching on behalf of a run; returns how many were queued."""
+        queued = []
+        with self._lock:
+            if self._exhausted(run_id):
+                return 0
+            for url in urls:
+                key = canonicalize_url(url)
+                if not key or key in self._pages:
+                    continue
+                if self._pending >= MAX_PENDING:
+                    self._counts["skipped_queue_full"] += 1
+                    break
+                self._pages[key] = None
+                self._pending += 1
+                queued.append(url)
+            if self._executor is None and queued:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="crawl-prefetch"
+                )
+            executor = self._executor
+        for url in queued:
+            executor.submit(self._prefetch, url, run_id)
+        return len(queued)
+
+    def _skip(self, key: str, reason: str) -> None:
+        with self._lock:
+            self._pages.pop(key, None)
+            self._counts[f"skipped_{reason}"] += 1
+
+    def _prefetch(self, url: str, run_id: str) -> None:
+        key = canonicalize_url(url)
+        try:
+            cache = get_crawl_cache()
+            if cache is None or cache.is_fresh(url):
+                self._skip(key, "cached")
+                return
+            with self._lock:
+                exhausted = self._exhausted(run_id)
+            if exhausted:
+                self._skip(key, "budget")
+                return
+            with get_crawl_limiter().try_limit_sync(url, track=False) as acquired:
+                if not acquired:
+                    # Busy, slow and failing hosts are left to the crawls the
+                    # agents are waiting for
+                    self._skip(key, "busy")
+                    return
+                started = time.monotonic()
+                try:
+                    fetched = Crawler._fetch(url)
+                finally:
+                    with self._lock:
+                        self._budget(run_id).seconds += time.monotonic() - started
+            Crawler._store_and_extract(cache, url, fetched)
+            size = len(fetched.html.encode("utf-8"))
+            with self._lock:
+                self._budget(run_id).bytes += size
+                self._pages[key] = size
+                self._counts["prefetched"] += 1
+                self._counts["bytes"] += size
+                while len(self._pages) > MAX_TRACKED_PAGES:
+                    self._pages.popitem(last=False)
+            logger.debug(f"预取完成 [{run_id}] {url} ({size} 字节)")
+        except Exception as e:
+            logger.debug(f"预取失败 {url}: {e}")
+            self._skip(key, "failed")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def record_crawl(self, url: str, from_cache: bool) -> bool:
+        """Count a crawl of url; True when it was served by a prefetch."""
+        key = canonicalize_url(url)
+        with self._lock:
+            size = self._pages.get(key)
+            if size is None:
+                return False
+            # Each prefetched page counts as a hit at most once
+            del self._pages[key]
+            if not from_cache:
+                return False
+            self._counts["hits"] += 1
+            self._counts["hit_bytes"] += size
+            return True
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+            pending = self._pending
+        prefetched = counts.get("prefetched", 0)
+        hits = counts.get("hits", 0)
+        stats = {
+            "pending": pending,
+            "prefetched": prefetched,
+            "hits": hits,
+            "bytes": counts.get("bytes", 0),
+            "wasted_bytes": counts.get("bytes", 0) - counts.get("hit_bytes", 0),
+            "hit_ratio": hits / prefetched if prefetched else 0.0,
+            "waste_ratio": (prefetched - hits) / prefetched if prefetched else 0.0,
+        }
+        stats.update(
+            {
+                name: count
+                for name, count in counts.items()
+                if name.startswith("skipped_")
+            }
+        )
+        return stats
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_prefetcher: Optional[Prefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> Optional[Prefetcher]:
+    """Get the process-wide prefetcher; None unless CRAWL_PREFETCH_ENABLED is set."""
+    global _prefetcher
+    if not is_prefetch_enabled():
+        return None
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = Prefetcher(
+                _env_number("CRAWL_PREFETCH_WORKERS", DEFAULT_WORKERS),
+                int(_env_number("CRAWL_PREFETCH_MAX_BYTES", DEFAULT_MAX_BYTES_PER_RUN)),
+                _env_number("CRAWL_PREFETCH_TIME_BUDGET", DEFAULT_TIME_BUDGET_PER_RUN),
+            )
+        return _prefetcher
+
+
+def schedule_prefetch(urls: List[str], run_id: Optional[str]) -> int:
+    """Prefetch the first CRAWL_PREFETCH_TOP_K of urls for a run, if enabled."""
+    prefetcher = get_prefetcher()
+    if prefetcher is None or not run_id:
+        return 0
+    return prefetcher.schedule(urls[: get_prefetch_top_k()], run_id)
+
+
+def record_prefetch_use(url: str, from_cache: bool) -> None:
+    prefetcher = get_prefetcher()
+    if prefetcher is not None:
+        prefetcher.record_crawl(url, from_cache)
+
+
+def get_prefetch_stats() -> dict:
+    with _prefetcher_lock:
+        prefetcher = _prefetcher
+    return prefetcher.get_stats() if prefetcher is not None else {}
+
+
+def shutdown_prefetcher() -> None:
+    with _prefetcher_lock:
+        prefetcher = _prefetcher
+    if prefetcher is not None:
+        prefetcher.shutdown()
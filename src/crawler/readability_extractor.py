@@ -1,15 +1,56 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import json
+import os
+import subprocess
+import tempfile
+from typing import Optional
+
+import readabilipy.simple_json
 from readabilipy import simple_json_from_html_string
+from readabilipy.simple_json import have_node
 
 from .article import Article
 
+READABILITY_JS_DIR = os.path.join(
+    os.path.dirname(readabilipy.simple_json.__file__), "javascript"
+)
+
 
 class ReadabilityExtractor:
+    def __init__(self, timeout: Optional[float] = None):
+        # Seconds Readability.js may run; subprocess.TimeoutExpired after that
+        self.timeout = timeout
+
     def extract_article(self, html: str) -> Article:
-        article = simple_json_from_html_string(html, use_readability=True)
+        if self.timeout and have_node():
+            article = self._run_readability_js(html)
+        else:
+            article = simple_json_from_html_string(html, use_readability=True)
         return Article(
             title=article.get("title"),
             html_content=article.get("content"),
         )
+
+    def _run_readability_js(self, html: str) -> dict:
+        # What simple_json_from_html_string does for the title and content,
+        # but the Node.js process is killed once it exceeds the timeout
+        with tempfile.TemporaryDirectory(prefix="readabilipy") as tmp_dir:
+            html_path = os.path.join(tmp_dir, "page.html")
+            json_path = os.path.join(tmp_dir, "page.json")
+            with open(html_path, "w", encoding="utf-8") as f:
+                f.write(html)
+            subprocess.run(
+                ["node", "ExtractArticle.js", "-i", html_path, "-o", json_path],
+                cwd=READABILITY_JS_DIR,
+                check=True,
+                capture_output=True,
+                timeout=self.timeout,
+            )
+            with open(json_path, encoding="utf-8") as f:
+                parsed = json.load(f) or {}
+        return {
+            "title": parsed.get("title") or None,
+            "content": parsed.get("content") or None,
+        }
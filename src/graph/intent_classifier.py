@@ -0,0 +1,460 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Local fast-path intent classifier for the coordinator.
+
+Greetings, small talk and obvious prompt-injection attempts get a templated
+reply, and clear research questions are handed off to the planner directly.
+Everything else falls through to the coordinator LLM. The classifier uses
+only phrase lists and weighted n-gram cues, so it runs in microseconds and
+needs no network access.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+GREETING = "greeting"
+SMALL_TALK = "small_talk"
+OUT_OF_SCOPE = "out_of_scope"
+RESEARCH = "research"
+UNKNOWN = "unknown"
+
+# Minimum research score for a confident handoff
+RESEARCH_SCORE_THRESHOLD = 2.0
+
+# Whole-message phrases, mapped to the locale they imply
+GREETING_PHRASES: dict[str, str] = {
+    "hi": "en-US",
+    "hello": "en-US",
+    "hey": "en-US",
+    "hi there": "en-US",
+    "hello there": "en-US",
+    "hey there": "en-US",
+    "good morning": "en-US",
+    "good afternoon": "en-US",
+    "good evening": "en-US",
+    "morning": "en-US",
+    "greetings": "en-US",
+    "你好": "zh-CN",
+    "您好": "zh-CN",
+    "你好呀": "zh-CN",
+    "你好啊": "zh-CN",
+    "嗨": "zh-CN",
+    "哈喽": "zh-CN",
+    "哈罗": "zh-CN",
+    "早上好": "zh-CN",
+    "中午好": "zh-CN",
+    "下午好": "zh-CN",
+    "晚上好": "zh-CN",
+    "大家好": "zh-CN",
+    "在吗": "zh-CN",
+    "こんにちは": "ja-JP",
+    "おはよう": "ja-JP",
+    "おはようございます": "ja-JP",
+    "こんばんは": "ja-JP",
+    "hola": "es-ES",
+    "buenos dias": "es-ES",
+    "bonjour": "fr-FR",
+    "salut": "fr-FR",
+    "hallo": "de-DE",
+    "안녕하세요": "ko-KR",
+}
+
+SMALL_TALK_PHRASES: dict[str, str] = {
+    "thanks": "en-US",
+    "thank you": "en-US",
+    "thanks a lot": "en-US",
+    "thank you very much": "en-US",
+    "many thanks": "en-US",
+    "thx": "en-US",
+    "bye": "en-US",
+    "goodbye": "en-US",
+    "see you": "en-US",
+    "how are you": "en-US",
+    "how are you doing": "en-US",
+    "whats your name": "en-US",
+    "what is your name": "en-US",
+    "who are you": "en-US",
+    "what can you do": "en-US",
+    "谢谢": "zh-CN",
+    "谢谢你": "zh-CN",
+    "谢谢您": "zh-CN",
+    "多谢": "zh-CN",
+    "感谢": "zh-CN",
+    "非常感谢": "zh-CN",
+    "再见": "zh-CN",
+    "拜拜": "zh-CN",
+    "你好吗": "zh-CN",
+    "你是谁": "zh-CN",
+    "你叫什么": "zh-CN",
+    "你叫什么名字": "zh-CN",
+    "你能做什么": "zh-CN",
+    "你会什么": "zh-CN",
+    "ありがとう": "ja-JP",
+    "ありがとうございます": "ja-JP",
+    "gracias": "es-ES",
+    "como estas": "es-ES",
+    "merci": "fr-FR",
+    "danke": "de-DE",
+}
+
+# Tokens that may accompany a greeting without changing its meaning
+ADDRESS_TOKENS = {"deerflow", "deer", "flow", "bot", "there", "all", "everyone"}
+
+# Imperative prompt-injection phrasings; mentioning the topic alone is not enough
+OUT_OF_SCOPE_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"ignore\s+(all\s+)?(the\s+|your\s+)?(previous|prior|above|earlier)\s+"
+        r"(instructions|prompts?|rules)",
+        r"(reveal|show|print|repeat|leak)\s+(me\s+)?"
+        r"(your\s+(system\s+)?(prompt|instructions)|the\s+system\s+prompt)",
+        r"(enable|enter|activate|switch\s+to)\s+dan\s+mode",
+        r"忽略(之前|以上|前面|上面)的?(所有)?(指令|提示|规则|设定)",
+        r"(泄露|输出|显示|告诉我)你的(系统|初始)?(提示词|指令)",
+    )
+]
+
+# Topics that injection attempts mention but research questions can too
+# ("system prompt design", "iPhone jailbreak history"); they are left to the
+# coordinator LLM instead of being answered or handed off by the fast path
+SENSITIVE_TOPIC_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"\bsystem\s+prompts?\b",
+        r"\bjailbreak",
+        r"\bdan\s+mode\b",
+        r"越狱",
+        r"(系统|初始)提示词",
+    )
+]
+
+# Weighted cues that indicate a research or factual question
+RESEARCH_CUES_EN: dict[str, float] = {
+    "what": 0.75,
+    "how": 0.75,
+    "why": 1.0,
+    "which": 0.75,
+    "when": 0.5,
+    "where": 0.5,
+    "who": 0.5,
+    "compare": 1.5,
+    "comparison": 1.5,
+    "versus": 1.0,
+    "vs": 1.0,
+    "analyze": 1.5,
+    "analyse": 1.5,
+    "analysis": 1.5,
+    "research": 1.5,
+    "investigate": 1.5,
+    "explain": 1.0,
+    "impact": 1.0,
+    "impacts": 1.0,
+    "effect": 1.0,
+    "effects": 1.0,
+    "influence": 1.0,
+    "influencing": 1.0,
+    "trend": 1.0,
+    "trends": 1.0,
+    "latest": 1.0,
+    "developments": 1.0,
+    "market": 1.0,
+    "history": 1.0,
+    "future": 0.75,
+    "difference": 1.0,
+    "differences": 1.0,
+    "statistics": 1.0,
+    "report": 1.0,
+    "overview": 1.0,
+    "pros and cons": 1.5,
+    "state of": 0.75,
+}
+
+RESEARCH_CUES_ZH: dict[str, float] = {
+    "什么": 0.75,
+    "如何": 0.75,
+    "怎么": 0.75,
+    "为什么": 1.0,
+    "哪些": 0.75,
+    "多少": 0.75,
+    "分析": 1.5,
+    "对比": 1.5,
+    "比较": 1.5,
+    "研究": 1.5,
+    "调研": 1.5,
+    "影响": 1.0,
+    "趋势": 1.0,
+    "发展": 1.0,
+    "现状": 1.0,
+    "最新": 1.0,
+    "市场": 1.0,
+    "历史": 1.0,
+    "原理": 1.0,
+    "区别": 1.0,
+    "优缺点": 1.5,
+    "前景": 1.0,
+    "报告": 1.0,
+    "应用": 0.75,
+}
+
+ENGLISH_STOPWORDS = {
+    "the",
+    "a",
+    "an",
+    "is",
+    "are",
+    "was",
+    "were",
+    "of",
+    "in",
+    "on",
+    "for",
+    "to",
+    "and",
+    "or",
+    "what",
+    "how",
+    "why",
+    "does",
+    "do",
+    "with",
+    "about",
+    "between",
+}
+
+QUESTION_WORDS_EN = {"what", "how", "why", "which", "when", "where", "who"}
+
+MIN_RESEARCH_WORDS_EN = 4
+# Words other than stopwords and question words; "What about the history?"
+# has only one and is a follow-up the coordinator LLM should resolve
+MIN_RESEARCH_CONTENT_WORDS_EN = 2
+MIN_RESEARCH_CHARS_ZH = 6
+
+REPLY_TEMPLATES: dict[str, dict[str, str]] = {
+    GREETING: {
+        "en-US": "Hello! I'm DeerFlow, nice to meet you! How can I help you today?",
+        "zh-CN": "你好！我是DeerFlow，很高兴认识你！有什么我可以帮助你的吗？",
+        "ja-JP": "こんにちは！DeerFlowです。今日はどのようなお手伝いができますか？",
+        "es-ES": "¡Hola! Soy DeerFlow, encantado de conocerte. ¿En qué puedo ayudarte hoy?",
+        "fr-FR": "Bonjour ! Je suis DeerFlow, ravi de vous rencontrer. Comment puis-je vous aider ?",
+        "de-DE": "Hallo! Ich bin DeerFlow, schön dich kennenzulernen. Wie kann ich helfen?",
+        "ko-KR": "안녕하세요! 저는 DeerFlow입니다. 무엇을 도와드릴까요?",
+    },
+    SMALL_TALK: {
+        "en-US": "I'm DeerFlow, a deep research assistant. Ask me any question you'd like researched and I'll gather sources and write a report for you.",
+        "zh-CN": "我是DeerFlow，一个深度研究助手。告诉我你想研究的问题，我会帮你搜集资料并撰写报告。",
+        "ja-JP": "DeerFlowは深いリサーチを行うアシスタントです。調べたいことを質問していただければ、情報を集めてレポートを作成します。",
+        "es-ES": "Soy DeerFlow, un asistente de investigación. Hazme cualquier pregunta que quieras investigar y prepararé un informe.",
+        "fr-FR": "Je suis DeerFlow, un assistant de recherche. Posez-moi une question à approfondir et je rédigerai un rapport.",
+        "de-DE": "Ich bin DeerFlow, ein Recherche-Assistent. Stell mir eine Frage, und ich erstelle einen Bericht dazu.",
+        "ko-KR": "저는 심층 리서치 도우미 DeerFlow입니다. 조사하고 싶은 질문을 알려주시면 자료를 모아 보고서를 작성해 드립니다.",
+    },
+    OUT_OF_SCOPE: {
+        "en-US": "Sorry, I can't help with that request. I'm happy to help with research questions, though.",
+        "zh-CN": "抱歉，我无法处理这个请求。如果你有需要研究的问题，我很乐意帮忙。",
+    },
+}
+
+
+@dataclass
+class IntentResult:
+    """Outcome of the local intent classifier."""
+
+    intent: str
+    confidence: float
+    locale: Optional[str] = None
+    score: float = 0.0
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower()
+    # Drop accents so that "buenos días" matches "buenos dias"
+    text = "".join(
+        ch
+        for ch in unicodedata.normalize("NFD", text)
+        if unicodedata.category(ch) != "Mn"
+    )
+    text = re.sub(r"[^\w\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _strip_address(text: str) -> str:
+    words = text.split(" ")
+    while len(words) > 1 and words[-1] in ADDRESS_TOKENS:
+        words.pop()
+    return " ".join(words)
+
+
+def _count_scripts(text: str) -> dict[str, int]:
+    counts = {"han": 0, "kana": 0, "hangul": 0, "latin": 0}
+    for ch in text:
+        code = ord(ch)
+        if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+            counts["han"] += 1
+        elif 0x3040 <= code <= 0x30FF:
+            counts["kana"] += 1
+        elif 0xAC00 <= code <= 0xD7AF:
+            counts["hangul"] += 1
+        elif ch.isascii() and ch.isalpha():
+            counts["latin"] += 1
+    return counts
+
+
+def detect_locale(text: str) -> Optional[str]:
+    """
+    Detect the locale of a message from its script, without any network call.
+
+    Args:
+        text: The user message
+
+    Returns:
+        A locale such as "zh-CN" or "en-US", or None when uncertain
+    """
+    counts = _count_scripts(text)
+    letters = sum(counts.values())
+    if not letters:
+        return None
+    if counts["kana"]:
+        return "ja-JP"
+    if counts["hangul"] / letters > 0.3:
+        return "ko-KR"
+    if counts["han"] / letters > 0.3:
+        return "zh-CN"
+    if counts["latin"] / letters > 0.9:
+        words = set(_normalize(text).split())
+        if words & ENGLISH_STOPWORDS:
+            return "en-US"
+    return None
+
+
+def _research_score(normalized: str) -> float:
+    words = normalized.split()
+    score = 0.0
+    for cue, weight in RESEARCH_CUES_EN.items():
+        if " " in cue:
+            if cue in normalized:
+                score += weight
+        elif cue in words:
+            score += weight
+    for cue, weight in RESEARCH_CUES_ZH.items():
+        if cue in normalized:
+            score += weight
+    return score
+
+
+def classify_message(text: str) -> IntentResult:
+    """
+    Classify a user message for the coordinator fast path.
+
+    Args:
+        text: The latest user message
+
+    Returns:
+        IntentResult with intent UNKNOWN when the LLM should decide
+    """
+    if not text or not text.strip():
+        return IntentResult(UNKNOWN, 0.0)
+
+    for pattern in OUT_OF_SCOPE_PATTERNS:
+        if pattern.search(text):
+            return IntentResult(OUT_OF_SCOPE, 0.95, detect_locale(text))
+    for pattern in SENSITIVE_TOPIC_PATTERNS:
+        if pattern.search(text):
+            return IntentResult(UNKNOWN, 0.0, detect_locale(text))
+
+    normalized = _normalize(text)
+    phrase = _strip_address(normalized)
+    compact = phrase.replace(" ", "")
+    for phrases, intent in (
+        (GREETING_PHRASES, GREETING),
+        (SMALL_TALK_PHRASES, SMALL_TALK),
+    ):
+        locale = phrases.get(phrase) or phrases.get(compact)
+        if locale:
+            return IntentResult(intent, 0.95, locale)
+
+    locale = detect_locale(text)
+    if locale not in ("en-US", "zh-CN"):
+        return IntentResult(UNKNOWN, 0.0, locale)
+
+    score = _research_score(normalized)
+    if "?" in text or "？" in text:
+        score += 0.5
+    if locale == "en-US":
+        words = normalized.split()
+        content_words = [
+            w for w in words if w not in ENGLISH_STOPWORDS | QUESTION_WORDS_EN
+        ]
+        long_enough = (
+            len(words) >= MIN_RESEARCH_WORDS_EN
+            and len(content_words) >= MIN_RESEARCH_CONTENT_WORDS_EN
+        )
+    else:
+        long_enough = _count_scripts(text)["han"] >= MIN_RESEARCH_CHARS_ZH
+    if long_enough and score >= RESEARCH_SCORE_THRESHOLD:
+        confidence = min(0.99, 0.6 + 0.1 * score)
+        return IntentResult(RESEARCH, confidence, locale, score)
+    return IntentResult(UNKNOWN, 0.0, locale, score)
+
+
+def render_reply(intent: str, locale: Optional[str]) -> str:
+    """Return the templated reply for a directly handled intent."""
+    templates = REPLY_TEMPLATES.get(intent, REPLY_TEMPLATES[GREETING])
+    if locale in templates:
+        return templates[locale]
+    if locale and locale.startswith("zh"):
+        return templates["zh-CN"]
+    return templates["en-US"]
+
+
+class TemplateReplyChatModel(BaseChatModel):
+    """
+    Chat model that answers with a fixed reply.
+
+    Running the templated reply through a chat model keeps the streaming
+    path identical to LLM replies: LangGraph emits its chunks as regular
+    message events for the coordinator.
+    """
+
+    reply: str
+
+    @property
+    def _llm_type(self) -> str:
+        return "template-reply"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = AIMessage(
+            content=self.reply, response_metadata={"finish_reason": "stop"}
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        chunk = ChatGenerationChunk(message=AIMessageChunk(content=self.reply))
+        if run_manager:
+            run_manager.on_llm_new_token(self.reply, chunk=chunk)
+        yield chunk
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="", response_metadata={"finish_reason": "stop"}
+            )
+        )
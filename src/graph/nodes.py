@@ -9,23 +9,36 @@ from typing import Annotated, Literal
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
+from langgraph.config import get_stream_writer
 from langgraph.types import Command, interrupt
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
 from src.agents import create_agent
 from src.tools import (
+    crawl_batch_tool,
     crawl_tool,
+    get_web_search_batch_tool,
     get_web_search_tool,
     get_retriever_tool,
     python_repl_tool,
 )
 
-from src.config.agents import AGENT_LLM_MAP
 from src.config.configuration import Configuration
 from src.llms.llm import get_llm_with_reasoning_effort, add_no_think_if_needed
+from src.llms.router import get_agent_llm_type
 from src.prompts.planner_model import Plan, StepType
 from src.prompts.template import apply_prompt_template
-from src.utils.json_utils import repair_json_output
+from src.tools.query_memo import start_research_run
+from src.graph.intent_classifier import (
+    GREETING,
+    OUT_OF_SCOPE,
+    RESEARCH,
+    SMALL_TALK,
+    TemplateReplyChatModel,
+    classify_message,
+    render_reply,
+)
+from src.utils.json_utils import IncrementalJSONArrayParser, repair_json_output
 
 from .types import State
 
@@ -56,7 +69,7 @@ def background_investigation_node(state: State, config: RunnableConfig):
         # For now, provide a simple background context
         # This avoids the complex tool calling issues while maintaining functionality
         # NOTE: If this node ever uses LLM calls in the future, make sure to add:
-        # llm = get_llm_with_reasoning_effort(AGENT_LLM_MAP["background_investigator"], "low")
+        # llm = get_llm_with_reasoning_effort(get_agent_llm_type("background_investigator"), "low")
         # messages = add_no_think_if_needed(messages, llm, "low")
         
         result_content = f"""Background investigation completed for: {query}
@@ -85,6 +98,30 @@ This background provides context for developing a comprehensive research plan.""
         }
 
 
+def _get_stream_writer():
+    """Return the LangGraph custom stream writer, or None outside a graph run."""
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return None
+
+
+def _emit_plan_step(stream_writer, index: int, step: dict) -> None:
+    """Push a completed plan step to the custom stream so clients can render partial plans."""
+    if not stream_writer or not isinstance(step, dict):
+        return
+    try:
+        stream_writer(
+            {
+                "type": "plan_step",
+                "index": index,
+                "step": step,
+            }
+        )
+    except Exception as e:
+        logger.warning(f"推送计划步骤失败: {e}")
+
+
 def planner_node(
     state: State, config: RunnableConfig
 ) -> Command[Literal["human_feedback", "reporter"]]:
@@ -93,6 +130,11 @@ def planner_node(
     configurable = Configuration.from_runnable_config(config)
     plan_iterations = state.get("plan_iterations", 0)
     max_plan_iterations = configurable.max_plan_iterations
+    if plan_iterations == 0:
+        # A new research request: searches of earlier requests in this
+        # conversation are not reused
+        run_id = start_research_run((config.get("configurable") or {}).get("thread_id"))
+        logger.info(f"开始新的研究运行: {run_id}")
     
     logger.info("Planner generating full plan")
     
@@ -102,7 +144,7 @@ def planner_node(
         return Command(goto="reporter")
     
     # Get LLM and messages
-    llm = get_llm_with_reasoning_effort(AGENT_LLM_MAP["planner"], "low")
+    llm = get_llm_with_reasoning_effort(get_agent_llm_type("planner"), "low")
     messages = apply_prompt_template("planner", state, configurable)
     
     # Convert to LangChain messages if needed
@@ -122,14 +164,22 @@ def planner_node(
     langchain_messages = add_no_think_if_needed(langchain_messages, llm, "low")
     logger.info("为规划员添加了 /no_think")
     
-    # Use safer LLM invocation to avoid callback issues
+    # Stream the plan and emit each step as soon as its JSON object is complete
     full_response = ""
+    step_parser = IncrementalJSONArrayParser("steps")
+    stream_writer = _get_stream_writer()
     
     try:
-        # Use simple invoke instead of streaming to avoid callback issues
-        response = llm.invoke(langchain_messages)
-        full_response = response.content if hasattr(response, 'content') else str(response)
-        logger.info(f"LLM响应: {len(full_response)} 字符")
+        for chunk in llm.stream(langchain_messages):
+            content = chunk.content if hasattr(chunk, 'content') else str(chunk)
+            if not content:
+                continue
+            full_response += content
+            steps = step_parser.feed(content)
+            first_index = step_parser.emitted - len(steps)
+            for offset, step in enumerate(steps):
+                _emit_plan_step(stream_writer, first_index + offset, step)
+        logger.info(f"LLM响应: {len(full_response)} 字符，流式输出 {step_parser.emitted} 个步骤")
     except Exception as e:
         logger.error(f"LLM调用失败: {e}")
         return Command(goto="__end__")
@@ -334,16 +384,87 @@ def human_feedback_node(
         )
 
 
+# Confidence required before the coordinator skips its LLM call
+FAST_PATH_MIN_CONFIDENCE = 0.8
+
+
+def _is_fast_path_enabled() -> bool:
+    return os.getenv("COORDINATOR_FAST_PATH", "true").lower() not in ("false", "0", "no")
+
+
+def _get_user_messages(state: State) -> list[str]:
+    texts = []
+    for msg in state.get("messages", []):
+        if isinstance(msg, dict):
+            if msg.get("role") == "user":
+                texts.append(str(msg.get("content", "")))
+        elif isinstance(msg, HumanMessage) and isinstance(msg.content, str):
+            texts.append(msg.content)
+    return texts
+
+
+def _coordinator_fast_path(state: State, configurable: Configuration):
+    """Handle obvious greetings and research questions without calling the LLM."""
+    if not _is_fast_path_enabled():
+        return None
+    user_messages = _get_user_messages(state)
+    if not user_messages:
+        return None
+    text = user_messages[-1].strip()
+    result = classify_message(text)
+    if result.confidence < FAST_PATH_MIN_CONFIDENCE:
+        return None
+
+    if result.intent in (GREETING, SMALL_TALK, OUT_OF_SCOPE):
+        locale = result.locale or state.get("locale", "en-US")
+        logger.info(f"协调员快速路径直接回复: intent={result.intent}, locale={locale}")
+        # Run the template through a chat model so the reply streams like an LLM answer
+        response = TemplateReplyChatModel(
+            reply=render_reply(result.intent, locale)
+        ).invoke([HumanMessage(content=text)])
+        return Command(
+            update={
+                "messages": [
+                    AIMessage(content=response.content, name="coordinator"),
+                ],
+                "locale": locale,
+                "research_topic": "",
+                "resources": configurable.resources,
+            },
+            goto="__end__",
+        )
+
+    # Follow-up turns may depend on earlier context, so only the first
+    # research question of a conversation skips the LLM.
+    if result.intent == RESEARCH and result.locale and len(user_messages) == 1:
+        logger.info(
+            f"协调员快速路径移交规划员: score={result.score:.2f}, locale={result.locale}"
+        )
+        return Command(
+            update={
+                "locale": result.locale,
+                "research_topic": text,
+                "resources": configurable.resources,
+            }
+        )
+    return None
+
+
 def coordinator_node(
     state: State, config: RunnableConfig
 ) -> Command[Literal["planner", "background_investigator", "__end__"]]:
     """Coordinator node that communicate with customers."""
     logger.info("协调员正在对话")
     configurable = Configuration.from_runnable_config(config)
+
+    fast_path = _coordinator_fast_path(state, configurable)
+    if fast_path is not None:
+        return fast_path
+
     messages = apply_prompt_template("coordinator", state)
     
     # Simple LLM setup with low reasoning effort
-    llm = get_llm_with_reasoning_effort(AGENT_LLM_MAP["coordinator"], "low")
+    llm = get_llm_with_reasoning_effort(get_agent_llm_type("coordinator"), "low")
     
     # Convert to LangChain messages if needed
     langchain_messages = []
@@ -720,7 +841,12 @@ async def researcher_node(
     """Researcher node that do research"""
     logger.info("研究员节点正在进行研究")
     configurable = Configuration.from_runnable_config(config)
-    tools = [get_web_search_tool(configurable.max_search_results), crawl_tool]
+    tools = [
+        get_web_search_tool(configurable.max_search_results),
+        get_web_search_batch_tool(configurable.max_search_results),
+        crawl_tool,
+        crawl_batch_tool,
+    ]
     retriever_tool = get_retriever_tool(state.get("resources", []))
     if retriever_tool:
         tools.insert(0, retriever_tool)
@@ -812,7 +938,7 @@ async def reporter_node(state: State, config: RunnableConfig):
     logger.info("报告员使用低推理模式进行稳定快速报告生成")
     
     llm = get_llm_with_reasoning_effort(
-        llm_type=AGENT_LLM_MAP["reporter"], 
+        llm_type=get_agent_llm_type("reporter"), 
         reasoning_effort="low"
     )
     
@@ -27,6 +27,7 @@ def _get_llm_type_config_keys() -> dict[str, str]:
         "reasoning": "REASONING_MODEL",
         "basic": "BASIC_MODEL",
         "vision": "VISION_MODEL",
+        "fast": "FAST_MODEL",
     }
 
 
@@ -99,10 +100,32 @@ def get_llm_by_type(
 
     conf = load_yaml_config(_get_config_file_path())
     llm = _create_llm_use_conf(llm_type, conf)
+    _attach_stats_callback(llm, llm_type)
     _llm_cache[llm_type] = llm
     return llm
 
 
+def _attach_stats_callback(llm, llm_type: LLMType) -> None:
+    """Report call latency and errors of this LLM to the model router."""
+    from src.llms.router import ModelStatsCallbackHandler
+
+    try:
+        callbacks = list(getattr(llm, "callbacks", None) or [])
+        callbacks.append(ModelStatsCallbackHandler(llm_type))
+        llm.callbacks = callbacks
+    except Exception as e:
+        print(f"Warning: Failed to attach model stats callback: {e}")
+
+
+def is_llm_type_configured(llm_type: str) -> bool:
+    """Check whether an LLM type has configuration in conf.yaml or the environment."""
+    config_key = _get_llm_type_config_keys().get(llm_type)
+    if not config_key:
+        return False
+    yaml_conf = load_yaml_config(_get_config_file_path()).get(config_key) or {}
+    return bool(yaml_conf) or bool(_get_env_llm_conf(llm_type))
+
+
 def get_llm_with_reasoning_effort(
     llm_type: LLMType = "basic", 
     reasoning_effort: str = None
@@ -139,7 +162,9 @@ def get_llm_with_reasoning_effort(
             if llm_type == "reasoning":
                 merged_conf["api_base"] = merged_conf.pop("base_url", None)
             
-            return ChatDeepSeek(**merged_conf)
+            llm = ChatDeepSeek(**merged_conf)
+            _attach_stats_callback(llm, llm_type)
+            return llm
     
     # For ChatOpenAI instances (including QwQ models), we'll handle /no_think at the message level
     # Store the reasoning effort preference on the LLM instance for later use
@@ -0,0 +1,336 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Latency-aware model routing.
+
+Each agent names a latency/quality tier (see ``AGENT_LLM_TIER``). A tier lists
+candidate LLM types in order of preference, configured through the optional
+``MODEL_ROUTING`` section of ``conf.yaml``. The router picks a configured
+candidate using live latency and error statistics collected from every LLM
+call, and falls back to neighbouring tiers when a tier has no usable model.
+
+The same model serves agents with very different reply lengths, so latencies
+are normalized to a reply of ``REFERENCE_OUTPUT_TOKENS`` tokens: the time to
+the first token plus the generation time scaled to that length. Otherwise the
+latency of a model would depend on which agents happened to call it.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.config import load_yaml_config
+from src.config.agents import AGENT_LLM_MAP, AGENT_LLM_TIER, LLMTier, LLMType
+from src.utils.token_utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Candidate LLM types per tier, used when conf.yaml has no MODEL_ROUTING section.
+# With only BASIC_MODEL configured every tier resolves to "basic".
+DEFAULT_TIER_CANDIDATES: dict[LLMTier, list[LLMType]] = {
+    "fast": ["fast", "basic"],
+    "balanced": ["basic"],
+    "strong": ["basic"],
+}
+
+# Tiers tried in order when a tier has no configured or healthy candidate
+TIER_FALLBACKS: dict[LLMTier, list[LLMTier]] = {
+    "fast": ["balanced", "strong"],
+    "balanced": ["strong", "fast"],
+    "strong": ["balanced", "fast"],
+}
+
+# Tiers where the fastest healthy candidate wins; other tiers keep preference order
+LATENCY_SORTED_TIERS: set[LLMTier] = {"fast", "balanced"}
+
+# Smoothing factor for the latency and error moving averages
+EWMA_ALPHA = 0.3
+# A model is considered unhealthy above this error rate ...
+UNHEALTHY_ERROR_RATE = 0.5
+# ... once it has at least this many samples ...
+MIN_SAMPLES_FOR_HEALTH = 3
+# ... until this many seconds have passed since its last error
+UNHEALTHY_COOLDOWN_SECONDS = 60.0
+# Reply length that recorded latencies are normalized to
+REFERENCE_OUTPUT_TOKENS = 256
+
+
+def normalized_latency(
+    total: float, output_tokens: int, first_token: Optional[float] = None
+) -> float:
+    """
+    Latency of a call scaled to a reply of REFERENCE_OUTPUT_TOKENS tokens.
+
+    Args:
+        total: Seconds from the start of the call to its end
+        output_tokens: Number of tokens the model generated
+        first_token: Seconds to the first streamed token, if known
+
+    Returns:
+        The time to the first token plus the generation time scaled to the
+        reference length; replies shorter than that are not scaled up, since
+        without a first-token time most of their latency is prompt processing
+    """
+    first_token = min(first_token or 0.0, total)
+    generation = total - first_token
+    if output_tokens > REFERENCE_OUTPUT_TOKENS:
+        generation *= REFERENCE_OUTPUT_TOKENS / output_tokens
+    return first_token + generation
+
+
+def _output_tokens(response: Any) -> int:
+    """Output tokens of an LLMResult, from usage metadata or estimated from its text."""
+    tokens = 0
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            usage = getattr(message, "usage_metadata", None) or {}
+            if usage.get("output_tokens"):
+                tokens += usage["output_tokens"]
+            else:
+                tokens += estimate_tokens(getattr(generation, "text", "") or "")
+    return tokens
+
+
+@dataclass
+class ModelStats:
+    """Rolling latency and error statistics for one LLM type."""
+
+    calls: int = 0
+    errors: int = 0
+    ewma_latency: Optional[float] = None
+    ewma_error_rate: float = 0.0
+    last_error_at: Optional[float] = None
+
+    def record(self, latency: float, success: bool) -> None:
+        self.calls += 1
+        if success:
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency = (
+                    EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma_latency
+                )
+        else:
+            self.errors += 1
+            self.last_error_at = time.monotonic()
+        self.ewma_error_rate = (
+            EWMA_ALPHA * (0.0 if success else 1.0)
+            + (1 - EWMA_ALPHA) * self.ewma_error_rate
+        )
+
+    def is_healthy(self) -> bool:
+        if self.calls < MIN_SAMPLES_FOR_HEALTH:
+            return True
+        if self.ewma_error_rate < UNHEALTHY_ERROR_RATE:
+            return True
+        if self.last_error_at is None:
+            return True
+        return time.monotonic() - self.last_error_at > UNHEALTHY_COOLDOWN_SECONDS
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "ewma_latency": self.ewma_latency,
+            "ewma_error_rate": round(self.ewma_error_rate, 4),
+            "healthy": self.is_healthy(),
+        }
+
+
+@dataclass
+class ModelRouter:
+    """Selects an LLM type for a tier based on configuration and live stats."""
+
+    tier_candidates: dict[str, list[str]] = field(
+        default_factory=lambda: {k: list(v) for k, v in DEFAULT_TIER_CANDIDATES.items()}
+    )
+    stats: dict[str, ModelStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, llm_type: str, latency: float, success: bool) -> None:
+        """Record the outcome of one LLM call."""
+        with self._lock:
+            self.stats.setdefault(llm_type, ModelStats()).record(latency, success)
+
+    def get_stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {k: v.to_dict() for k, v in self.stats.items()}
+
+    def _candidates(self, tier: str) -> list[str]:
+        from src.llms.llm import is_llm_type_configured
+
+        return [
+            c for c in self.tier_candidates.get(tier, []) if is_llm_type_configured(c)
+        ]
+
+    def _pick(self, tier: str, candidates: list[str]) -> Optional[str]:
+        with self._lock:
+            healthy = [
+                c for c in candidates if self.stats.get(c, ModelStats()).is_healthy()
+            ]
+            if not healthy:
+                return None
+            if tier not in LATENCY_SORTED_TIERS:
+                return healthy[0]
+            # Unmeasured candidates sort first so that they get explored;
+            # sorted() is stable, so ties keep the configured preference order.
+            return sorted(
+                healthy,
+                key=lambda c: self.stats.get(c, ModelStats()).ewma_latency or 0.0,
+            )[0]
+
+    def select(self, tier: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Select an LLM type for the given tier.
+
+        Args:
+            tier: Latency/quality tier ("fast", "balanced" or "strong")
+            default: LLM type to use when no tier has a usable candidate
+
+        Returns:
+            The selected LLM type
+        """
+        tiers = [tier, *TIER_FALLBACKS.get(tier, [])]
+        configured: list[str] = []
+        for t in tiers:
+            candidates = self._candidates(t)
+            configured.extend(c for c in candidates if c not in configured)
+            choice = self._pick(t, candidates)
+            if choice:
+                if t != tier:
+                    logger.info(f"模型档位 {tier} 无可用模型，回退到档位 {t}: {choice}")
+                return choice
+        # Every configured candidate is unhealthy: prefer any configured model
+        # over the static default so the call still has a chance to succeed.
+        if configured:
+            logger.warning(
+                f"模型档位 {tier} 的所有候选模型均不健康，使用 {configured[0]}"
+            )
+            return configured[0]
+        return default
+
+
+class ModelStatsCallbackHandler(BaseCallbackHandler):
+    """Callback handler that feeds normalized LLM call latency and errors to the router."""
+
+    run_inline = True
+
+    def __init__(self, llm_type: str, router: Optional[ModelRouter] = None):
+        self.llm_type = llm_type
+        self._router = router
+        self._started: Dict[UUID, float] = {}
+        self._first_token: Dict[UUID, float] = {}
+
+    @property
+    def router(self) -> ModelRouter:
+        return self._router or get_model_router()
+
+    def _start(self, run_id: UUID) -> None:
+        self._started[run_id] = time.monotonic()
+
+    def _finish(self, run_id: UUID, success: bool, response: Any = None) -> None:
+        started = self._started.pop(run_id, None)
+        first_token = self._first_token.pop(run_id, None)
+        if started is None:
+            return
+        latency = normalized_latency(
+            time.monotonic() - started,
+            _output_tokens(response),
+            first_token - started if first_token is not None else None,
+        )
+        self.router.record(self.llm_type, latency, success)
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id)
+
+    def on_llm_start(
+        self,
+        serialized: Dict[str, Any],
+        prompts: List[str],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id)
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        if run_id in self._started:
+            self._first_token.setdefault(run_id, time.monotonic())
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, True, response)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._finish(run_id, False)
+
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def _load_tier_candidates() -> dict[str, list[str]]:
+    """Load tier candidates from the MODEL_ROUTING section of conf.yaml."""
+    from src.llms.llm import _get_config_file_path
+
+    candidates = {k: list(v) for k, v in DEFAULT_TIER_CANDIDATES.items()}
+    routing = load_yaml_config(_get_config_file_path()).get("MODEL_ROUTING") or {}
+    if not isinstance(routing, dict):
+        logger.warning(f"MODEL_ROUTING 配置无效，使用默认路由: {routing}")
+        return candidates
+    for tier, types in routing.items():
+        if isinstance(types, str):
+            types = [types]
+        if not isinstance(types, list):
+            logger.warning(f"模型档位 {tier} 的配置无效: {types}")
+            continue
+        candidates[tier] = [str(t) for t in types]
+    return candidates
+
+
+def get_model_router() -> ModelRouter:
+    """Get the process-wide model router, creating it on first use."""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter(tier_candidates=_load_tier_candidates())
+    return _router
+
+
+def get_agent_llm_type(agent_name: str) -> LLMType:
+    """
+    Resolve the LLM type an agent should use for its next call.
+
+    Agents without a tier keep their static mapping from ``AGENT_LLM_MAP``.
+
+    Args:
+        agent_name: Name of the agent, e.g. "coordinator" or "reporter"
+
+    Returns:
+        The LLM type to pass to ``get_llm_with_reasoning_effort``
+    """
+    default = AGENT_LLM_MAP.get(agent_name, "basic")
+    tier = AGENT_LLM_TIER.get(agent_name)
+    if not tier:
+        return default
+    try:
+        return get_model_router().select(tier, default=default)
+    except Exception as e:
+        logger.warning(f"模型路由失败，使用静态映射 {agent_name} -> {default}: {e}")
+        return default
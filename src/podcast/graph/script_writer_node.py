@@ -5,7 +5,7 @@ import logging
 
 from langchain.schema import HumanMessage, SystemMessage
 
-from src.config.agents import AGENT_LLM_MAP
+from src.llms.router import get_agent_llm_type
 from src.llms.llm import get_llm_with_reasoning_effort, add_no_think_if_needed
 from src.prompts.template import get_prompt_template
 
@@ -19,7 +19,7 @@ def script_writer_node(state: PodcastState):
     logger.info("Generating script for podcast...")
     
     # 🔧 修复：使用低推理模式并添加 /no_think
-    model = get_llm_with_reasoning_effort(AGENT_LLM_MAP["podcast_script_writer"], "low")
+    model = get_llm_with_reasoning_effort(get_agent_llm_type("podcast_script_writer"), "low")
     
     messages = [
         SystemMessage(content=get_prompt_template("podcast/podcast_script_writer")),
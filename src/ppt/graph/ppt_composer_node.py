@@ -7,7 +7,7 @@ import uuid
 
 from langchain.schema import HumanMessage, SystemMessage
 
-from src.config.agents import AGENT_LLM_MAP
+from src.llms.router import get_agent_llm_type
 from src.llms.llm import get_llm_with_reasoning_effort, add_no_think_if_needed
 from src.prompts.template import get_prompt_template
 
@@ -20,7 +20,7 @@ def ppt_composer_node(state: PPTState):
     logger.info("Generating ppt content...")
     
     # 🔧 修复：使用低推理模式并添加 /no_think
-    model = get_llm_with_reasoning_effort(AGENT_LLM_MAP["ppt_composer"], "low")
+    model = get_llm_with_reasoning_effort(get_agent_llm_type("ppt_composer"), "low")
     
     messages = [
         SystemMessage(content=get_prompt_template("ppt/ppt_composer")),
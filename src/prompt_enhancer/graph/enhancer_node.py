@@ -5,7 +5,7 @@ import logging
 
 from langchain.schema import HumanMessage
 
-from src.config.agents import AGENT_LLM_MAP
+from src.llms.router import get_agent_llm_type
 from src.llms.llm import get_llm_with_reasoning_effort, add_no_think_if_needed
 from src.prompts.template import apply_prompt_template
 from src.prompt_enhancer.graph.state import PromptEnhancerState
@@ -17,7 +17,7 @@ def prompt_enhancer_node(state: PromptEnhancerState):
     """Node that enhances user prompts using AI analysis."""
     logger.info("Enhancing user prompt...")
 
-    model = get_llm_with_reasoning_effort(AGENT_LLM_MAP["prompt_enhancer"], "low")
+    model = get_llm_with_reasoning_effort(get_agent_llm_type("prompt_enhancer"), "low")
 
     try:
 
@@ -1,9 +1,16 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from .template import apply_prompt_template, get_prompt_template
+from .template import (
+    apply_prompt_template,
+    get_prompt_template,
+    get_reporter_token_report,
+    get_template_stats,
+)
 
 __all__ = [
     "apply_prompt_template",
     "get_prompt_template",
+    "get_reporter_token_report",
+    "get_template_stats",
 ]
@@ -3,10 +3,20 @@
 
 import os
 import dataclasses
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, meta, select_autoescape
 from langgraph.prebuilt.chat_agent_executor import AgentState
 from src.config.configuration import Configuration
+from src.utils.token_utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
 
 # Initialize Jinja2 environment
 env = Environment(
@@ -17,6 +27,238 @@ env = Environment(
 )
 
 
+# Maximum number of rendered prompts kept in memory
+RENDER_CACHE_SIZE = 256
+
+
+@dataclass
+class TemplateStats:
+    """Render statistics for one prompt template."""
+
+    renders: int = 0
+    cache_hits: int = 0
+    total_render_time: float = 0.0
+    last_output_size: int = 0
+    max_output_size: int = 0
+    last_output_tokens: int = 0
+
+    def to_dict(self) -> dict:
+        misses = self.renders - self.cache_hits
+        return {
+            "renders": self.renders,
+            "cache_hits": self.cache_hits,
+            "avg_render_ms": (
+                round(self.total_render_time / misses * 1000, 3) if misses else 0.0
+            ),
+            "last_output_size": self.last_output_size,
+            "max_output_size": self.max_output_size,
+            "last_output_tokens": self.last_output_tokens,
+        }
+
+
+class TemplateService:
+    """
+    Compiles prompt templates once and memoizes their renders.
+
+    Renders are cached by a hash of the variables the template actually
+    references (found with jinja2 meta analysis), so unrelated state such as
+    the message history does not invalidate the cache. Templates without
+    variables are rendered only once.
+    """
+
+    def __init__(self, environment: Environment, cache_size: int = RENDER_CACHE_SIZE):
+        self.env = environment
+        self.cache_size = cache_size
+        self._templates: dict[str, Template] = {}
+        self._variables: dict[str, frozenset[str]] = {}
+        self._cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._stats: dict[str, TemplateStats] = {}
+        self._available: set[str] | None = None
+        self._lock = threading.Lock()
+
+    def preload(self) -> None:
+        """Compile every prompt template found by the loader."""
+        for name in self.available_templates():
+            try:
+                self._load(name)
+            except Exception as e:
+                logger.warning(f"预编译提示词模板失败 {name}: {e}")
+
+    def _referenced_variables(self, name: str, seen: set[str]) -> set[str]:
+        source = self.env.loader.get_source(self.env, name)[0]
+        ast = self.env.parse(source)
+        variables = set(meta.find_undeclared_variables(ast))
+        for child in meta.find_referenced_templates(ast):
+            if child is None:
+                # Dynamic include: the cache key cannot be derived safely
+                raise ValueError(f"template {name} has a dynamic include")
+            if child not in seen:
+                seen.add(child)
+                variables |= self._referenced_variables(child, seen)
+        return variables
+
+    def _load(self, name: str) -> Template:
+        template = self._templates.get(name)
+        if template is not None:
+            return template
+        template = self.env.get_template(name)
+        try:
+            variables: frozenset[str] | None = frozenset(
+                self._referenced_variables(name, {name})
+            )
+        except ValueError:
+            variables = None
+        with self._lock:
+            self._templates[name] = template
+            if variables is not None:
+                self._variables[name] = variables
+        return template
+
+    def _cache_key(self, name: str, context: dict) -> str | None:
+        variables = self._variables.get(name)
+        if variables is None:
+            return None
+        try:
+            payload = json.dumps(
+                {k: context.get(k) for k in sorted(variables)},
+                sort_keys=True,
+                default=repr,
+                ensure_ascii=False,
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def render(self, name: str, **context) -> str:
+        """
+        Render a template, reusing a previous render when possible.
+
+        Args:
+            name: Template file name relative to the prompts directory
+            **context: Template variables
+
+        Returns:
+            The rendered template
+        """
+        template = self._load(name)
+        key = self._cache_key(name, context)
+        with self._lock:
+            stats = self._stats.setdefault(name, TemplateStats())
+            stats.renders += 1
+            if key is not None and (name, key) in self._cache:
+                self._cache.move_to_end((name, key))
+                stats.cache_hits += 1
+                return self._cache[(name, key)]
+
+        started = time.perf_counter()
+        output = template.render(**context)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            stats.total_render_time += elapsed
+            stats.last_output_size = len(output)
+            stats.max_output_size = max(stats.max_output_size, len(output))
+            stats.last_output_tokens = estimate_tokens(output)
+            if key is not None:
+                self._cache[(name, key)] = output
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return output
+
+    def available_templates(self) -> set[str]:
+        """Return the names of all templates known to the loader."""
+        if self._available is None:
+            self._available = set(self.env.list_templates(extensions=["md"]))
+        return self._available
+
+    def get_stats(self) -> dict[str, dict]:
+        """Return render statistics keyed by template name."""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+template_service = TemplateService(env)
+template_service.preload()
+
+
+def get_template_stats() -> dict[str, dict]:
+    """Return render time and output size statistics for each prompt template."""
+    return template_service.get_stats()
+
+
+REPORTER_CORE_TEMPLATE = "reporter/core.md"
+
+
+def _reporter_template_name(report_style, locale: str) -> str:
+    """Pick the reporter fragment for a style, preferring a locale-specific one."""
+    style = getattr(report_style, "value", report_style)
+    if not style:
+        return REPORTER_CORE_TEMPLATE
+    for name in (f"reporter/styles/{style}.{locale}.md", f"reporter/styles/{style}.md"):
+        if name in template_service.available_templates():
+            return name
+    return REPORTER_CORE_TEMPLATE
+
+
+def render_reporter_prompt(report_style, locale: str, current_time: str) -> str:
+    """
+    Assemble the reporter system prompt for one report style and locale.
+
+    The reporter prompt is split into a core template plus per-style and
+    per-locale fragments, so only the guidance for the requested style is
+    compiled and rendered. The body is cached per (style, locale) and only
+    the CURRENT_TIME header changes between calls.
+
+    Args:
+        report_style: A ReportStyle or its string value
+        locale: The report locale, e.g. "en-US" or "zh-CN"
+        current_time: Formatted current time for the prompt header
+
+    Returns:
+        The rendered reporter system prompt
+    """
+    body = template_service.render(
+        _reporter_template_name(report_style, locale), locale=locale
+    )
+    return f"---\nCURRENT_TIME: {current_time}\n---\n\n{body}"
+
+
+def get_reporter_token_report(locales: tuple[str, ...] = ("en-US", "zh-CN")) -> dict:
+    """
+    Report the estimated prompt tokens of the reporter per (style, locale).
+
+    ``all_styles_tokens`` is the size of every reporter fragment combined,
+    i.e. the guidance a single monolithic prompt would carry.
+
+    Returns:
+        Token estimates keyed by "<style>/<locale>"
+    """
+    from src.config.report_style import ReportStyle
+
+    sources = [
+        template_service.env.loader.get_source(template_service.env, name)[0]
+        for name in template_service.available_templates()
+        if name.startswith("reporter/")
+    ]
+    all_styles_tokens = sum(estimate_tokens(source) for source in sources)
+    report = {}
+    for style in ReportStyle:
+        for locale in locales:
+            tokens = estimate_tokens(
+                render_reporter_prompt(style, locale, "CURRENT_TIME")
+            )
+            report[f"{style.value}/{locale}"] = {
+                "tokens": tokens,
+                "all_styles_tokens": all_styles_tokens,
+                "saved_tokens": max(all_styles_tokens - tokens, 0),
+            }
+    return report
+
+
 def get_prompt_template(prompt_name: str) -> str:
     """
     Load and return a prompt template using Jinja2.
@@ -28,8 +270,7 @@ def get_prompt_template(prompt_name: str) -> str:
         The template string with proper variable substitution syntax
     """
     try:
-        template = env.get_template(f"{prompt_name}.md")
-        return template.render()
+        return template_service.render(f"{prompt_name}.md")
     except Exception as e:
         raise ValueError(f"Error loading template {prompt_name}: {e}")
 
@@ -58,8 +299,14 @@ def apply_prompt_template(
         state_vars.update(dataclasses.asdict(configurable))
 
     try:
-        template = env.get_template(f"{prompt_name}.md")
-        system_prompt = template.render(**state_vars)
+        if prompt_name == "reporter":
+            system_prompt = render_reporter_prompt(
+                state_vars.get("report_style"),
+                state_vars.get("locale", "en-US"),
+                state_vars["CURRENT_TIME"],
+            )
+        else:
+            system_prompt = template_service.render(f"{prompt_name}.md", **state_vars)
         return [{"role": "system", "content": system_prompt}] + state["messages"]
     except Exception as e:
         raise ValueError(f"Error applying template {prompt_name}: {e}")
@@ -5,7 +5,7 @@ import logging
 
 from langchain.schema import HumanMessage, SystemMessage
 
-from src.config.agents import AGENT_LLM_MAP
+from src.llms.router import get_agent_llm_type
 from src.llms.llm import get_llm_with_reasoning_effort, add_no_think_if_needed
 from src.prompts.template import get_prompt_template
 from src.prose.graph.state import ProseState
@@ -17,7 +17,7 @@ def prose_longer_node(state: ProseState):
     logger.info("Generating prose longer content...")
     
     # 🔧 修复：使用低推理模式并添加 /no_think
-    model = get_llm_with_reasoning_effort(AGENT_LLM_MAP["prose_writer"], "low")
+    model = get_llm_with_reasoning_effort(get_agent_llm_type("prose_writer"), "low")
     
     messages = [
         SystemMessage(content=get_prompt_template("prose/prose_longer")),
@@ -5,6 +5,7 @@ import base64
 import json
 import logging
 import os
+from contextlib import asynccontextmanager
 from typing import Annotated, List, cast
 from uuid import uuid4
 from datetime import datetime
@@ -22,6 +23,7 @@ from src.graph.builder import build_graph_with_memory
 from src.podcast.graph.builder import build_graph as build_podcast_graph
 from src.ppt.graph.builder import build_graph as build_ppt_graph
 from src.prose.graph.builder import build_graph as build_prose_graph
+from src.prompts.template import get_reporter_token_report, get_template_stats
 from src.prompt_enhancer.graph.builder import build_graph as build_prompt_enhancer_graph
 from src.rag.builder import build_retriever
 from src.rag.retriever import Resource
@@ -43,15 +45,37 @@ from src.server.rag_request import (
 from src.server.config_request import ConfigResponse
 from src.llms.llm import get_configured_llm_models
 from src.tools import VolcengineTTS
+from src.crawler.cache import get_crawl_cache_stats
+from src.crawler.crawler import get_crawl_backend_stats
+from src.crawler.dedup import get_page_dedup_stats
+from src.crawler.limits import get_crawl_domain_stats, get_fetch_stats
+from src.crawler.prefetch import get_prefetch_stats, shutdown_prefetcher
+from src.crawler.extraction import shutdown_extraction_pool
+from src.tools.query_memo import get_query_memo_stats
+from src.tools.search import get_hedge_stats
+from src.tools.search_cache import get_search_cache_stats
+from src.utils.circuit_breaker import get_circuit_breaker_states
+from src.utils.http_client import close_http_clients
+from src.utils.single_flight import get_single_flight_stats
 
 logger = logging.getLogger(__name__)
 
 INTERNAL_SERVER_ERROR_DETAIL = "Internal Server Error"
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_prefetcher()
+    # 关闭搜索与抓取工具共享的 HTTP 连接池
+    await close_http_clients()
+    shutdown_extraction_pool()
+
+
 app = FastAPI(
     title="DeerFlow API",
     description="API for Deer",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -125,7 +149,7 @@ async def _astream_workflow_generator(
         if messages:
             resume_msg += f" {messages[-1]['content']}"
         input_ = Command(resume=resume_msg)
-    async for agent, _, event_data in graph.astream(
+    async for agent, stream_mode, event_data in graph.astream(
         input_,
         config={
             "thread_id": thread_id,
@@ -137,7 +161,7 @@ async def _astream_workflow_generator(
             "report_style": report_style.value,
             "enable_deep_thinking": enable_deep_thinking,
         },
-        stream_mode=["messages", "updates"],
+        stream_mode=["messages", "updates", "custom"],
         subgraphs=True,
     ):
         try:
@@ -167,6 +191,20 @@ async def _astream_workflow_generator(
                         "activity",
                         {"activity": progress_map[agent_name]},
                     )
+            if stream_mode == "custom":
+                # Custom events pushed by nodes, e.g. plan steps streamed by the planner
+                if isinstance(event_data, dict) and event_data.get("type") == "plan_step":
+                    yield _make_event(
+                        "plan_step",
+                        {
+                            "thread_id": thread_id,
+                            "agent": agent_name or "planner",
+                            "role": "assistant",
+                            "index": event_data.get("index"),
+                            "step": event_data.get("step"),
+                        },
+                    )
+                continue
             if isinstance(event_data, dict):
                 if "__interrupt__" in event_data:
                     yield _make_event(
@@ -478,16 +516,58 @@ async def config():
     )
 
 
+@app.get("/api/prompts/stats")
+async def prompt_stats():
+    """Get render time and output size statistics for each prompt template."""
+    return get_template_stats()
+
+
+@app.get("/api/prompts/reporter/tokens")
+async def reporter_prompt_tokens():
+    """Get the estimated reporter prompt size for each report style and locale."""
+    return get_reporter_token_report()
+
+
+@app.get("/api/search/stats")
+async def search_stats():
+    """Get web search cache, request coalescing, hedging and query dedup statistics."""
+    return {
+        "cache": get_search_cache_stats(),
+        "single_flight": get_single_flight_stats(),
+        "hedge": get_hedge_stats(),
+        "query_memo": get_query_memo_stats(),
+    }
+
+
+@app.get("/api/crawl/stats")
+async def crawl_stats():
+    """Get crawl cache, backend, fetch size, domain health, duplicate page and prefetch statistics."""
+    return {
+        "cache": get_crawl_cache_stats(),
+        "backends": get_crawl_backend_stats(),
+        "fetch": get_fetch_stats(),
+        "domains": get_crawl_domain_stats(),
+        "dedup": get_page_dedup_stats(),
+        "prefetch": get_prefetch_stats(),
+    }
+
+
 @app.get("/api/health")
 async def health_check():
     """健康检查端点，用于检测服务器状态"""
     try:
         # 可以在这里添加更多的健康检查逻辑
         # 比如检查数据库连接、LLM服务状态等
+        breakers = get_circuit_breaker_states()
         return {
             "status": "healthy",
             "timestamp": datetime.utcnow().isoformat(),
-            "version": "1.0.0"
+            "version": "1.0.0",
+            # 熔断中的搜索引擎会被跳过，请求路由到其他可用引擎
+            "search_engines": breakers,
+            "skipped_search_engines": [
+                name for name, state in breakers.items() if state["state"] == "open"
+            ],
         }
     except Exception as e:
         return {
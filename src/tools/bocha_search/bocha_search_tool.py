@@ -4,6 +4,7 @@
 import json
 import logging
 import os
+import time
 from typing import Optional
 
 import httpx
@@ -14,6 +15,10 @@ from langchain.callbacks.manager import (
 from langchain_core.tools import BaseTool
 from pydantic import Field
 
+from src.tools.search_compaction import compact_search_results
+from src.utils.circuit_breaker import get_circuit_breaker
+from src.utils.http_client import get_async_http_client, get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,13 +34,50 @@ class BochaSearchTool(BaseTool):
     include_summary: bool = Field(default=True)
     search_type: str = Field(default="web-search")  # "web-search" 或 "ai-search"
     base_url: str = Field(default="https://api.bochaai.com/v1")
+    # 博查不可用或熔断时使用的备用搜索工具
+    fallback_tool: Optional[BaseTool] = Field(default=None)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if not self.api_key:
             raise ValueError("BOCHA_API_KEY environment variable is required")
     
+    @staticmethod
+    def _is_error_response(raw_response) -> bool:
+        if not isinstance(raw_response, dict) or not raw_response:
+            return True
+        code = raw_response.get("code")
+        return "error" in raw_response or bool(code and code != 200)
+
+    def _record_outcome(self, raw_response, started: float) -> None:
+        breaker = get_circuit_breaker("bocha")
+        if self._is_error_response(raw_response):
+            error = raw_response.get("error") if isinstance(raw_response, dict) else None
+            breaker.record_failure(str(error or raw_response))
+        else:
+            breaker.record_success(time.monotonic() - started)
+
     def _make_request(self, query: str) -> dict:
+        """发送请求到博查API，熔断器打开时直接返回错误"""
+        if not get_circuit_breaker("bocha").allow_request():
+            logger.warning("博查搜索熔断中，跳过本次请求")
+            return {"error": "博查搜索暂时不可用（熔断中）"}
+        started = time.monotonic()
+        raw_response = self._send_request(query)
+        self._record_outcome(raw_response, started)
+        return raw_response
+
+    async def _make_request_async(self, query: str) -> dict:
+        """异步发送请求到博查API，熔断器打开时直接返回错误"""
+        if not get_circuit_breaker("bocha").allow_request():
+            logger.warning("博查搜索熔断中，跳过本次请求")
+            return {"error": "博查搜索暂时不可用（熔断中）"}
+        started = time.monotonic()
+        raw_response = await self._send_request_async(query)
+        self._record_outcome(raw_response, started)
+        return raw_response
+
+    def _send_request(self, query: str) -> dict:
         """发送HTTP请求到博查API"""
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -52,18 +94,19 @@ class BochaSearchTool(BaseTool):
         url = f"{self.base_url}/{self.search_type}"
         
         try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(url, json=data, headers=headers)
-                response.raise_for_status()
-                
-                # 🚀 修复：确保响应内容是有效的JSON
-                response_json = response.json()
-                if response_json is None:
-                    logger.error("博查API返回的JSON为None")
-                    return {"error": "API返回空响应"}
-                
-                return response_json
-                
+            response = get_http_client().post(
+                url, json=data, headers=headers, timeout=30.0
+            )
+            response.raise_for_status()
+            
+            # 🚀 修复：确保响应内容是有效的JSON
+            response_json = response.json()
+            if response_json is None:
+                logger.error("博查API返回的JSON为None")
+                return {"error": "API返回空响应"}
+            
+            return response_json
+            
         except httpx.HTTPError as e:
             logger.error(f"博查API请求失败: {e}")
             return {"error": f"HTTP请求失败: {str(e)}"}
@@ -74,7 +117,7 @@ class BochaSearchTool(BaseTool):
             logger.error(f"博查API请求未知错误: {e}")
             return {"error": f"未知错误: {str(e)}"}
     
-    async def _make_request_async(self, query: str) -> dict:
+    async def _send_request_async(self, query: str) -> dict:
         """异步发送HTTP请求到博查API"""
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -91,18 +134,19 @@ class BochaSearchTool(BaseTool):
         url = f"{self.base_url}/{self.search_type}"
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, json=data, headers=headers)
-                response.raise_for_status()
-                
-                # 🚀 修复：确保响应内容是有效的JSON
-                response_json = response.json()
-                if response_json is None:
-                    logger.error("博查API返回的JSON为None")
-                    return {"error": "API返回空响应"}
-                
-                return response_json
-                
+            response = await get_async_http_client().post(
+                url, json=data, headers=headers, timeout=30.0
+            )
+            response.raise_for_status()
+            
+            # 🚀 修复：确保响应内容是有效的JSON
+            response_json = response.json()
+            if response_json is None:
+                logger.error("博查API返回的JSON为None")
+                return {"error": "API返回空响应"}
+            
+            return response_json
+            
         except httpx.HTTPError as e:
             logger.error(f"博查API异步请求失败: {e}")
             return {"error": f"HTTP请求失败: {str(e)}"}
@@ -253,8 +297,13 @@ class BochaSearchTool(BaseTool):
         try:
             logger.info(f"使用博查搜索: {query}")
             raw_response = self._make_request(query)
+            if self.fallback_tool is not None and self._is_error_response(raw_response):
+                logger.warning(f"博查搜索不可用，切换到备用搜索引擎: {raw_response}")
+                return self.fallback_tool._run(query)
             
-            formatted_results = self._format_results(raw_response)
+            formatted_results = compact_search_results(
+                self._format_results(raw_response), query
+            )
             if not formatted_results:
                 return json.dumps([{
                     "error": "未找到搜索结果", 
@@ -281,10 +330,15 @@ class BochaSearchTool(BaseTool):
         try:
             logger.info(f"使用博查异步搜索: {query}")
             raw_response = await self._make_request_async(query)
+            if self.fallback_tool is not None and self._is_error_response(raw_response):
+                logger.warning(f"博查搜索不可用，切换到备用搜索引擎: {raw_response}")
+                return await self.fallback_tool._arun(query)
             
             logger.info(f"博查异步请求完成，响应类型: {type(raw_response)}")
             
-            formatted_results = self._format_results(raw_response)
+            formatted_results = compact_search_results(
+                self._format_results(raw_response), query
+            )
             if not formatted_results:
                 logger.warning("格式化后的结果为空")
                 return json.dumps([{
@@ -1,39 +1,244 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import logging
-from typing import Annotated
+import os
+from typing import Annotated, List, Optional
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 from .decorators import log_io
 
 from src.crawler import Crawler
+from src.crawler.crawler import run_in_extract_executor
+from src.crawler.dedup import get_page_index
+from src.crawler.prefetch import record_prefetch_use
+from src.tools.query_memo import current_run_id
+from src.utils.single_flight import get_single_flight
+from src.utils.token_utils import estimate_tokens, truncate_to_tokens
+from src.utils.url_utils import canonicalize_url
 
 logger = logging.getLogger(__name__)
 
+MAX_CONTENT_CHARS = 5000
+QUERY_DESCRIPTION = (
+    "Optional. What you are looking for on the page; the most relevant sections "
+    "are kept first when the page is too long."
+)
+CONTENT_HEADER = "URL: {url}\n\nContent:\n"
+DUPLICATE_STUB = (
+    "URL: {url}\n\nContent: [Duplicate of {earlier}, which was already crawled "
+    "in this research run; its content is not repeated]"
+)
+
+
+def _flight_key(url: str, query: Optional[str]) -> str:
+    return f"{url.strip()}\n{query or ''}"
+
+
+@log_io
+def crawl(
+    url: Annotated[str, "The url to crawl."],
+    query: Annotated[Optional[str], QUERY_DESCRIPTION] = None,
+) -> str:
+    """Use this to crawl a url and get a readable content in markdown format."""
+    # Parallel steps often crawl the same page at the same time
+    result = get_single_flight("crawl").do(
+        _flight_key(url, query), lambda: _crawl(url, query)
+    )
+    return _stub_duplicate(url, result)
+
 
-@tool
 @log_io
-def crawl_tool(
+async def acrawl(
     url: Annotated[str, "The url to crawl."],
+    query: Annotated[Optional[str], QUERY_DESCRIPTION] = None,
 ) -> str:
     """Use this to crawl a url and get a readable content in markdown format."""
+    result = await get_single_flight("crawl").ado(
+        _flight_key(url, query), lambda: _acrawl(url, query)
+    )
+    return _stub_duplicate(url, result)
+
+
+crawl_tool = StructuredTool.from_function(
+    func=crawl,
+    coroutine=acrawl,
+    name="crawl_tool",
+)
+
+
+def _format_article(url: str, article, query: Optional[str] = None) -> str:
+    if article and hasattr(article, 'to_markdown'):
+        # Only the part of the article that is returned gets converted
+        content = article.to_markdown(max_chars=MAX_CONTENT_CHARS, query=query)
+        if content:
+            return CONTENT_HEADER.format(url=url) + content[:MAX_CONTENT_CHARS]
+        else:
+            return f"URL: {url}\n\nContent: [Empty content extracted]"
+    else:
+        return f"URL: {url}\n\nContent: [Failed to extract article content]"
+
+
+def _duplicate_of(url: str, content: str) -> Optional[str]:
+    """The earlier page of the current run that content nearly duplicates."""
+    index = get_page_index(current_run_id())
+    return index.check(url, content) if index is not None else None
+
+
+def _stub_duplicate(url: str, result: str) -> str:
+    # Checked outside the single flight, whose result may be shared with
+    # callers from other runs
+    header = CONTENT_HEADER.format(url=url)
+    if not result.startswith(header):
+        return result
+    earlier = _duplicate_of(url, result[len(header) :])
+    if earlier is None:
+        return result
+    return DUPLICATE_STUB.format(url=url, earlier=earlier)
+
+
+def _record_prefetch_use(url: str, article) -> None:
+    record_prefetch_use(url, getattr(article, "backend", None) == "cache")
+
+
+def _crawl_error(url: str, e: Exception) -> str:
+    if isinstance(e, IndexError):
+        error_msg = f"Failed to crawl {url}. IndexError: {str(e)} - This may be due to malformed HTML or parsing issues."
+    else:
+        error_msg = f"Failed to crawl {url}. Error: {str(e)}"
+    logger.error(error_msg)
+    return error_msg
+
+
+def _crawl(url: str, query: Optional[str] = None) -> str:
     try:
         crawler = Crawler()
         article = crawler.crawl(url)
-        if article and hasattr(article, 'to_markdown'):
-            content = article.to_markdown()
-            if content:
-                return f"URL: {url}\n\nContent:\n{content[:5000]}"
-            else:
-                return f"URL: {url}\n\nContent: [Empty content extracted]"
-        else:
-            return f"URL: {url}\n\nContent: [Failed to extract article content]"
-    except IndexError as e:
-        error_msg = f"Failed to crawl {url}. IndexError: {str(e)} - This may be due to malformed HTML or parsing issues."
-        logger.error(error_msg)
-        return error_msg
+        _record_prefetch_use(url, article)
+        return _format_article(url, article, query)
     except Exception as e:
-        error_msg = f"Failed to crawl {url}. Error: {str(e)}"
-        logger.error(error_msg)
-        return error_msg
+        return _crawl_error(url, e)
+
+
+async def _acrawl(url: str, query: Optional[str] = None) -> str:
+    try:
+        crawler = Crawler()
+        article = await crawler.acrawl(url)
+        _record_prefetch_use(url, article)
+        # Markdown conversion is CPU-bound
+        return await run_in_extract_executor(_format_article, url, article, query)
+    except Exception as e:
+        return _crawl_error(url, e)
+
+
+DEFAULT_BATCH_MAX_URLS = 5
+DEFAULT_BATCH_MAX_TOKENS = 8000
+TRUNCATED_MARKER = "\n\n[...truncated]"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _allocate_budget(sizes: List[int], budget: int) -> List[int]:
+    """
+    Split a token budget across pages: short pages keep all their text and the
+    rest is shared equally among the longer ones.
+    """
+    allocation = [0] * len(sizes)
+    remaining = budget
+    pending = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    while pending:
+        share = remaining // len(pending)
+        i = pending.pop(0)
+        allocation[i] = min(sizes[i], share)
+        remaining -= allocation[i]
+    return allocation
+
+
+async def _acrawl_markdown(url: str, max_tokens: int, query: Optional[str]) -> str:
+    article = await Crawler().acrawl(url)
+    _record_prefetch_use(url, article)
+    if not article or not hasattr(article, "to_markdown"):
+        raise ValueError("Failed to extract article content")
+    # No page gets more than the whole batch budget, so nothing beyond it is converted
+    return await run_in_extract_executor(
+        lambda: article.to_markdown(max_tokens=max_tokens, query=query)
+    )
+
+
+@log_io
+async def acrawl_batch(
+    urls: Annotated[List[str], "The urls to crawl; results keep this order."],
+    query: Annotated[Optional[str], QUERY_DESCRIPTION] = None,
+) -> str:
+    """Use this to crawl several urls at once and get their readable content in markdown format. Prefer it over calling crawl_tool repeatedly."""
+    max_urls = _env_int("CRAWL_BATCH_MAX_URLS", DEFAULT_BATCH_MAX_URLS)
+    unique_urls = []
+    seen = set()
+    for url in urls:
+        url = url.strip()
+        key = canonicalize_url(url)
+        if url and key not in seen:
+            seen.add(key)
+            unique_urls.append(url)
+    if len(unique_urls) > max_urls:
+        logger.warning(f"批量抓取最多 {max_urls} 个 URL，已忽略: {unique_urls[max_urls:]}")
+        unique_urls = unique_urls[:max_urls]
+    if not unique_urls:
+        return "No urls to crawl."
+
+    max_tokens = _env_int("CRAWL_BATCH_MAX_TOKENS", DEFAULT_BATCH_MAX_TOKENS)
+    outcomes = await asyncio.gather(
+        *(
+            get_single_flight("crawl_markdown").ado(
+                _flight_key(url, query),
+                lambda url=url: _acrawl_markdown(url, max_tokens, query),
+            )
+            for url in unique_urls
+        ),
+        return_exceptions=True,
+    )
+
+    contents = [o if isinstance(o, str) else "" for o in outcomes]
+    # Duplicates leave their share of the budget to the other pages
+    duplicate_of = [
+        _duplicate_of(url, c) if c else None for url, c in zip(unique_urls, contents)
+    ]
+    contents = [
+        c if earlier is None else "" for c, earlier in zip(contents, duplicate_of)
+    ]
+    budgets = _allocate_budget([estimate_tokens(c) for c in contents], max_tokens)
+    sections = []
+    for url, outcome, content, budget, earlier in zip(
+        unique_urls, outcomes, contents, budgets, duplicate_of
+    ):
+        if isinstance(outcome, BaseException):
+            sections.append(_crawl_error(url, outcome))
+        elif earlier is not None:
+            sections.append(DUPLICATE_STUB.format(url=url, earlier=earlier))
+        elif not content:
+            sections.append(f"URL: {url}\n\nContent: [Empty content extracted]")
+        else:
+            content = truncate_to_tokens(content, budget, marker=TRUNCATED_MARKER)
+            sections.append(f"URL: {url}\n\nContent:\n{content}")
+    return "\n\n---\n\n".join(sections)
+
+
+def crawl_batch(
+    urls: Annotated[List[str], "The urls to crawl; results keep this order."],
+    query: Annotated[Optional[str], QUERY_DESCRIPTION] = None,
+) -> str:
+    """Use this to crawl several urls at once and get their readable content in markdown format. Prefer it over calling crawl_tool repeatedly."""
+    return asyncio.run(acrawl_batch(urls, query))
+
+
+crawl_batch_tool = StructuredTool.from_function(
+    func=crawl_batch,
+    coroutine=acrawl_batch,
+    name="crawl_batch",
+)
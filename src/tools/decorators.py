@@ -1,6 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import logging
 import functools
 from typing import Any, Callable, Type, TypeVar
@@ -14,6 +15,8 @@ def log_io(func: Callable) -> Callable:
     """
     A decorator that logs the input parameters and output of a tool function.
 
+    Coroutine functions are wrapped with an async wrapper.
+
     Args:
         func: The tool function to be decorated
 
@@ -21,20 +24,33 @@ def log_io(func: Callable) -> Callable:
         The wrapped function with input/output logging
     """
 
-    @functools.wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        # Log input parameters
-        func_name = func.__name__
+    def log_call(args: tuple, kwargs: dict) -> None:
         params = ", ".join(
             [*(str(arg) for arg in args), *(f"{k}={v}" for k, v in kwargs.items())]
         )
-        logger.info(f"Tool {func_name} called with parameters: {params}")
+        logger.info(f"Tool {func.__name__} called with parameters: {params}")
+
+    if asyncio.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            log_call(args, kwargs)
+            result = await func(*args, **kwargs)
+            logger.info(f"Tool {func.__name__} returned: {result}")
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Log input parameters
+        log_call(args, kwargs)
 
         # Execute the function
         result = func(*args, **kwargs)
 
         # Log the output
-        logger.info(f"Tool {func_name} returned: {result}")
+        logger.info(f"Tool {func.__name__} returned: {result}")
 
         return result
 
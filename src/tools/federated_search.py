@@ -0,0 +1,335 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Federated web search.
+
+Queries several engines concurrently under one shared deadline and merges
+their rankings with reciprocal-rank fusion. URLs are canonicalized so that the
+same page returned by several engines is listed once and ranked higher.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from langchain_community.utilities import (
+    ArxivAPIWrapper,
+    BraveSearchWrapper,
+    DuckDuckGoSearchAPIWrapper,
+)
+from langchain_core.tools import BaseTool
+
+from src.config import SearchEngine
+from src.tools.search import (
+    LoggedBochaSearch,
+    LoggedTavilySearch,
+    SearchEngineError,
+    run_in_search_executor,
+)
+from src.tools.search_cache import is_error_result
+from src.tools.search_compaction import compact_search_results
+from src.utils.circuit_breaker import get_circuit_breaker
+from src.utils.url_utils import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Standard RRF constant; larger values flatten the contribution of top ranks
+RRF_K = 60
+DEFAULT_DEADLINE_SECONDS = 8.0
+MAX_IMAGES = 3
+
+EngineSearch = Callable[[str], Awaitable[List[dict]]]
+
+
+def get_federated_engines() -> List[str]:
+    """
+    Return the engines to federate.
+
+    FEDERATED_SEARCH_ENGINES is a comma-separated list of SearchEngine values.
+    By default every engine with credentials is used, plus DuckDuckGo.
+    """
+    configured = os.getenv("FEDERATED_SEARCH_ENGINES", "")
+    if configured.strip():
+        return [e.strip().lower() for e in configured.split(",") if e.strip()]
+    engines = []
+    if os.getenv("TAVILY_API_KEY", "").strip():
+        engines.append(SearchEngine.TAVILY.value)
+    if os.getenv("BOCHA_API_KEY", "").strip():
+        engines.append(SearchEngine.BOCHA.value)
+    if os.getenv("BRAVE_SEARCH_API_KEY", "").strip():
+        engines.append(SearchEngine.BRAVE_SEARCH.value)
+    engines.append(SearchEngine.DUCKDUCKGO.value)
+    return engines
+
+
+def _get_deadline() -> float:
+    try:
+        return float(os.getenv("FEDERATED_SEARCH_DEADLINE", DEFAULT_DEADLINE_SECONDS))
+    except ValueError:
+        return DEFAULT_DEADLINE_SECONDS
+
+
+def _parse_json_list(result) -> list:
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except ValueError:
+            return []
+    return result if isinstance(result, list) else []
+
+
+def _with_breaker(engine: str, search: EngineSearch) -> EngineSearch:
+    """Record the outcome and latency of each call on the engine's breaker."""
+    breaker = get_circuit_breaker(engine)
+
+    async def search_with_breaker(query: str) -> List[dict]:
+        started = time.monotonic()
+        try:
+            results = await search(query)
+        except Exception as e:
+            breaker.record_failure(str(e))
+            raise
+        breaker.record_success(time.monotonic() - started)
+        return results
+
+    return search_with_breaker
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Dict[str, List[dict]], top_k: int, k: int = RRF_K
+) -> List[dict]:
+    """
+    Merge per-engine rankings with reciprocal-rank fusion.
+
+    Args:
+        ranked_lists: Results per engine, best first; each result has a url
+        top_k: Number of merged results to return
+        k: RRF constant
+
+    Returns:
+        Merged results, best first, with the fused score and contributing engines
+    """
+    merged: Dict[str, dict] = {}
+    for engine, results in ranked_lists.items():
+        seen = set()
+        for rank, result in enumerate(results, start=1):
+            url = result.get("url")
+            if not url:
+                continue
+            key = canonicalize_url(url)
+            if key in seen:
+                continue
+            seen.add(key)
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {
+                    "type": "page",
+                    "title": result.get("title", ""),
+                    "url": url,
+                    "content": result.get("content", ""),
+                    "score": 0.0,
+                    "engines": [],
+                }
+            elif len(result.get("content") or "") > len(entry["content"] or ""):
+                entry["content"] = result["content"]
+            entry["score"] += 1.0 / (k + rank)
+            entry["engines"].append(engine)
+    ranked = sorted(merged.values(), key=lambda r: r["score"], reverse=True)
+    for entry in ranked:
+        entry["score"] = round(entry["score"], 6)
+    return ranked[:top_k]
+
+
+class FederatedSearchTool(BaseTool):
+    """Searches several engines concurrently and fuses their rankings."""
+
+    name: str = "web_search"
+    description: str = "搜索网络信息"
+    max_search_results: int = 5
+    engines: List[str] = []
+    deadline: float = DEFAULT_DEADLINE_SECONDS
+
+    def __init__(
+        self,
+        max_search_results: int,
+        engines: Optional[List[str]] = None,
+        deadline: Optional[float] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.max_search_results = max_search_results
+        self.engines = engines if engines is not None else get_federated_engines()
+        self.deadline = deadline if deadline is not None else _get_deadline()
+
+    def _engine_searches(self, images: List[dict]) -> Dict[str, EngineSearch]:
+        searches: Dict[str, EngineSearch] = {}
+        for engine in self.engines:
+            try:
+                search = self._build_engine_search(engine, images)
+            except Exception as e:
+                logger.warning(f"联邦搜索引擎 {engine} 初始化失败，已跳过: {e}")
+                continue
+            if search is None:
+                logger.warning(f"联邦搜索不支持的引擎: {engine}")
+                continue
+            if not get_circuit_breaker(engine).allow_request():
+                logger.warning(f"联邦搜索引擎 {engine} 熔断中，已跳过")
+                continue
+            searches[engine] = _with_breaker(engine, search)
+        return searches
+
+    def _build_engine_search(
+        self, engine: str, images: List[dict]
+    ) -> Optional[EngineSearch]:
+        """Build the search coroutine for one engine; Tavily images go to images."""
+        k = self.max_search_results
+        if engine == SearchEngine.TAVILY.value:
+            tool = LoggedTavilySearch(
+                name="web_search_tavily",
+                max_results=k,
+                include_raw_content=False,
+                include_images=True,
+                include_image_descriptions=True,
+            )
+
+            async def search_tavily(query: str) -> List[dict]:
+                result = await tool._arun(query)
+                if is_error_result(result):
+                    raise SearchEngineError(f"Tavily 搜索返回错误: {result}")
+                results = _parse_json_list(result)
+                images.extend(r for r in results if r.get("type") == "image")
+                return [r for r in results if r.get("type") == "page"]
+
+            return search_tavily
+
+        if engine == SearchEngine.BOCHA.value:
+            tool = LoggedBochaSearch(
+                name="web_search_bocha", max_results=k, include_images=False
+            )
+
+            # Calls the API directly: the breaker is checked and recorded here,
+            # not by the tool's own _arun, so a half-open probe is used once
+            async def search_bocha(query: str) -> List[dict]:
+                response = await tool._send_request_async(query)
+                if tool._is_error_response(response):
+                    raise SearchEngineError(f"博查搜索返回错误: {response}")
+                results = compact_search_results(tool._format_results(response), query)
+                return [r for r in results if "error" not in r]
+
+            return search_bocha
+
+        if engine == SearchEngine.DUCKDUCKGO.value:
+            wrapper = DuckDuckGoSearchAPIWrapper()
+
+            async def search_duckduckgo(query: str) -> List[dict]:
+                results = await run_in_search_executor(wrapper.results, query, k)
+                return [
+                    {
+                        "title": r.get("title", ""),
+                        "url": r.get("link", ""),
+                        "content": r.get("snippet", ""),
+                    }
+                    for r in results
+                ]
+
+            return search_duckduckgo
+
+        if engine == SearchEngine.BRAVE_SEARCH.value:
+            wrapper = BraveSearchWrapper(
+                api_key=os.getenv("BRAVE_SEARCH_API_KEY", ""),
+                search_kwargs={"count": k},
+            )
+
+            async def search_brave(query: str) -> List[dict]:
+                results = _parse_json_list(
+                    await run_in_search_executor(wrapper.run, query)
+                )
+                return [
+                    {
+                        "title": r.get("title", ""),
+                        "url": r.get("link", ""),
+                        "content": r.get("snippet", ""),
+                    }
+                    for r in results
+                ]
+
+            return search_brave
+
+        if engine == SearchEngine.ARXIV.value:
+            wrapper = ArxivAPIWrapper(top_k_results=k, load_max_docs=k)
+
+            async def search_arxiv(query: str) -> List[dict]:
+                docs = await run_in_search_executor(
+                    wrapper.get_summaries_as_docs, query
+                )
+                return [
+                    {
+                        "title": doc.metadata.get("Title", ""),
+                        "url": doc.metadata.get("Entry ID", ""),
+                        "content": doc.page_content,
+                    }
+                    for doc in docs
+                    if doc.metadata.get("Entry ID")
+                ]
+
+            return search_arxiv
+
+        return None
+
+    def _run(self, query: str) -> str:
+        """同步执行联邦搜索"""
+        return asyncio.run(self._arun(query))
+
+    async def _arun(self, query: str) -> str:
+        """并发查询所有引擎，在截止时间内融合已返回的结果"""
+        images: List[dict] = []
+        searches = self._engine_searches(images)
+        if not searches:
+            return json.dumps({"error": "没有可用的联邦搜索引擎"}, ensure_ascii=False)
+
+        tasks = {
+            asyncio.ensure_future(search(query)): engine
+            for engine, search in searches.items()
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+            get_circuit_breaker(tasks[task]).record_failure(
+                f"超过截止时间 {self.deadline}s"
+            )
+            logger.warning(
+                f"联邦搜索引擎 {tasks[task]} 超过截止时间 {self.deadline}s，已取消"
+            )
+
+        ranked_lists: Dict[str, List[dict]] = {}
+        errors = {}
+        for task in done:
+            engine = tasks[task]
+            try:
+                ranked_lists[engine] = task.result()
+            except Exception as e:
+                logger.warning(f"联邦搜索引擎 {engine} 失败: {e}")
+                errors[engine] = str(e)
+
+        results = reciprocal_rank_fusion(ranked_lists, self.max_search_results)
+        logger.info(
+            f"联邦搜索完成: {len(ranked_lists)}/{len(tasks)} 个引擎返回，融合后 {len(results)} 条结果"
+        )
+        if not results:
+            return json.dumps(
+                {"error": "所有联邦搜索引擎都未返回结果", "details": errors},
+                ensure_ascii=False,
+            )
+        image_results = [
+            {
+                "type": "image",
+                "image_url": image.get("image_url", ""),
+                "image_description": image.get("image_description", ""),
+            }
+            for image in images[:MAX_IMAGES]
+        ]
+        return json.dumps(results + image_results, ensure_ascii=False)
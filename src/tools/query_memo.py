@@ -0,0 +1,217 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Run-scoped suppression of near-duplicate search queries.
+
+Within one research run the agents often search for queries that differ only
+in word order, punctuation or a filler word. Each run keeps a memo of the
+queries it searched; a new query whose terms are similar enough to an earlier
+one gets the earlier result back, with a note, instead of another search.
+A run is one research request: the planner starts a new run of its LangGraph
+thread each time it plans a new request, so queries of earlier requests in the
+same conversation are searched again.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from langchain_core.runnables import ensure_config
+
+from src.utils.text_utils import tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+MAX_RUNS = 256
+MAX_QUERIES_PER_RUN = 200
+
+DUPLICATE_NOTE = (
+    'Note: this query is a near-duplicate of the earlier query "{earlier}" in this '
+    "research run, so its results are returned instead of searching again. "
+    "Use a substantially different query to get new sources.\n\n"
+)
+
+
+def is_query_memo_enabled() -> bool:
+    return os.getenv("SEARCH_QUERY_DEDUP_ENABLED", "true").lower() not in (
+        "false",
+        "0",
+        "no",
+    )
+
+
+def get_similarity_threshold() -> float:
+    try:
+        return float(
+            os.getenv("SEARCH_QUERY_DEDUP_THRESHOLD", DEFAULT_SIMILARITY_THRESHOLD)
+        )
+    except ValueError:
+        return DEFAULT_SIMILARITY_THRESHOLD
+
+
+def query_terms(query: str) -> FrozenSet[str]:
+    """Order-insensitive term set of a query, without punctuation and filler words."""
+    return frozenset(tokenize(query, drop_stopwords=True))
+
+
+def query_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """
+    Jaccard similarity of two query term sets.
+
+    Queries that mention different numbers (years, amounts, versions) are
+    never similar, since "market size 2023" and "market size 2024" ask for
+    different facts.
+    """
+    if not a or not b:
+        return 0.0
+    if {t for t in a if t.isdigit()} != {t for t in b if t.isdigit()}:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class QueryMemo:
+    """Searched queries and their results for one run."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.lookups = 0
+        self.suppressed = 0
+        self._entries: "OrderedDict[Tuple[str, FrozenSet[str]], Tuple[str, Any]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def lookup(self, engine: str, query: str) -> Optional[Tuple[str, Any]]:
+        """Return (earlier query, result) for a near-duplicate query, or None."""
+        terms = query_terms(query)
+        threshold = get_similarity_threshold()
+        with self._lock:
+            self.lookups += 1
+            best = None
+            best_score = 0.0
+            for (entry_engine, entry_terms), entry in self._entries.items():
+                if entry_engine != engine:
+                    continue
+                score = query_similarity(terms, entry_terms)
+                if score >= threshold and score > best_score:
+                    best, best_score = entry, score
+            if best is None:
+                return None
+            self.suppressed += 1
+            suppressed = self.suppressed
+        logger.info(
+            f'抑制近重复查询 [{self.run_id}] "{query}" ≈ "{best[0]}" '
+            f"(相似度 {best_score:.2f}，本次运行已抑制 {suppressed}/{self.lookups} 次)"
+        )
+        return best
+
+    def store(self, engine: str, query: str, result: Any) -> None:
+        terms = query_terms(query)
+        if not terms:
+            return
+        with self._lock:
+            self._entries[(engine, terms)] = (query, result)
+            while len(self._entries) > MAX_QUERIES_PER_RUN:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "queries": len(self._entries),
+                "lookups": self.lookups,
+                "suppressed": self.suppressed,
+            }
+
+
+_memos: "OrderedDict[str, QueryMemo]" = OrderedDict()
+_memos_lock = threading.Lock()
+
+
+# Research runs started so far per thread_id
+_run_counts: "OrderedDict[str, int]" = OrderedDict()
+_run_counts_lock = threading.Lock()
+
+
+def _current_thread_id() -> Optional[str]:
+    config = ensure_config()
+    thread_id = (config.get("configurable") or {}).get("thread_id") or (
+        config.get("metadata") or {}
+    ).get("thread_id")
+    return str(thread_id) if thread_id else None
+
+
+def _run_id(thread_id: str, count: int) -> str:
+    return f"{thread_id}#{count}" if count else thread_id
+
+
+def start_research_run(thread_id: Optional[str] = None) -> Optional[str]:
+    """
+    Start a new research run of a thread (the caller's by default) and return
+    its id. Run-scoped state of the thread's earlier runs is no longer used.
+    """
+    thread_id = thread_id or _current_thread_id()
+    if not thread_id:
+        return None
+    with _run_counts_lock:
+        count = _run_counts.get(thread_id, 0) + 1
+        _run_counts[thread_id] = count
+        _run_counts.move_to_end(thread_id)
+        while len(_run_counts) > MAX_RUNS:
+            _run_counts.popitem(last=False)
+    return _run_id(thread_id, count)
+
+
+def current_run_id() -> Optional[str]:
+    """The id of the research run the caller belongs to, if any."""
+    thread_id = _current_thread_id()
+    if not thread_id:
+        return None
+    with _run_counts_lock:
+        count = _run_counts.get(thread_id, 0)
+    return _run_id(thread_id, count)
+
+
+def get_query_memo(run_id: Optional[str] = None) -> Optional[QueryMemo]:
+    """Get the memo of the current run; None outside of a run or when disabled."""
+    if not is_query_memo_enabled():
+        return None
+    run_id = run_id or current_run_id()
+    if not run_id:
+        return None
+    with _memos_lock:
+        memo = _memos.get(run_id)
+        if memo is None:
+            memo = _memos[run_id] = QueryMemo(run_id)
+            while len(_memos) > MAX_RUNS:
+                _memos.popitem(last=False)
+        else:
+            _memos.move_to_end(run_id)
+        return memo
+
+
+def get_query_memo_stats() -> dict:
+    """Suppression counters summed over the tracked runs."""
+    with _memos_lock:
+        memos: List[QueryMemo] = list(_memos.values())
+    stats: Dict[str, int] = {"runs": len(memos), "lookups": 0, "suppressed": 0}
+    for memo in memos:
+        memo_stats = memo.get_stats()
+        stats["lookups"] += memo_stats["lookups"]
+        stats["suppressed"] += memo_stats["suppressed"]
+    return stats
+
+
+def with_duplicate_note(earlier: str, result: Any) -> Any:
+    """
+    Prefix a string result, or the string content of a (content, artifact)
+    result, with the near-duplicate note.
+    """
+    if isinstance(result, tuple) and len(result) == 2:
+        return (with_duplicate_note(earlier, result[0]), result[1])
+    if isinstance(result, str):
+        return DUPLICATE_NOTE.format(earlier=earlier) + result
+    return result
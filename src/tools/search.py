@@ -1,9 +1,15 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import concurrent.futures
 import json
 import logging
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from langchain_community.tools import BraveSearch, DuckDuckGoSearchResults
@@ -18,6 +24,8 @@ from src.tools.tavily_search.tavily_search_results_with_images import (
 from src.tools.bocha_search import BochaSearchTool
 
 from src.tools.decorators import create_logged_tool
+from src.tools.search_cache import create_cached_tool, is_error_result
+from src.utils.circuit_breaker import get_circuit_breaker
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +36,111 @@ LoggedBraveSearch = create_logged_tool(BraveSearch)
 LoggedArxivSearch = create_logged_tool(ArxivQueryRun)
 LoggedBochaSearch = create_logged_tool(BochaSearchTool)
 
+# Bounded pool for search backends that only offer a blocking API, so that
+# concurrent searches cannot starve the event loop or spawn unbounded threads
+SEARCH_EXECUTOR_MAX_WORKERS = int(os.getenv("SEARCH_EXECUTOR_MAX_WORKERS", "8"))
+_search_executor = ThreadPoolExecutor(
+    max_workers=SEARCH_EXECUTOR_MAX_WORKERS, thread_name_prefix="web-search"
+)
+
+
+async def run_in_search_executor(fn, *args):
+    """Run a blocking search call in the bounded search thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_search_executor, fn, *args)
+
+
+# Synchronous hedging has its own pool: _run is itself often called from a
+# search executor thread (batch and federated searches), and waiting there on
+# futures queued behind it in the same bounded pool would deadlock
+_hedge_executor = ThreadPoolExecutor(
+    max_workers=2 * SEARCH_EXECUTOR_MAX_WORKERS, thread_name_prefix="web-search-hedge"
+)
+
+# Hedged fallback: DuckDuckGo starts when Tavily has not answered within the
+# hedge delay, and the first good result wins. The delay is fixed through
+# SEARCH_HEDGE_DELAY (seconds) or derived from the p95 Tavily latency.
+DEFAULT_HEDGE_DELAY = 2.0
+MIN_HEDGE_DELAY = 0.2
+MAX_HEDGE_DELAY = 10.0
+HEDGE_LATENCY_WINDOW = 100
+MIN_HEDGE_LATENCY_SAMPLES = 10
+
+
+class SearchEngineError(Exception):
+    """Raised when a search engine returns an error payload."""
+
+
+def is_hedging_enabled() -> bool:
+    return os.getenv("SEARCH_FALLBACK_MODE", "hedged").lower() != "sequential"
+
+
+class HedgeStats:
+    """Tracks engine latencies plus hedge and win rates of hedged searches."""
+
+    def __init__(self):
+        self.searches = 0
+        self.hedged = 0
+        self.wins: dict[str, int] = {}
+        self.latencies: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record_latency(self, engine: str, latency: float) -> None:
+        with self._lock:
+            self.latencies.setdefault(
+                engine, deque(maxlen=HEDGE_LATENCY_WINDOW)
+            ).append(latency)
+
+    def record(self, winner: Optional[str], hedged: bool) -> None:
+        with self._lock:
+            self.searches += 1
+            if hedged:
+                self.hedged += 1
+            if winner:
+                self.wins[winner] = self.wins.get(winner, 0) + 1
+
+    def p95_latency(self, engine: str) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self.latencies.get(engine, ()))
+        if len(samples) < MIN_HEDGE_LATENCY_SAMPLES:
+            return None
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    def hedge_delay(self, engine: str) -> float:
+        configured = os.getenv("SEARCH_HEDGE_DELAY")
+        if configured:
+            try:
+                return max(float(configured), 0.0)
+            except ValueError:
+                logger.warning(f"无效的 SEARCH_HEDGE_DELAY: {configured}")
+        p95 = self.p95_latency(engine)
+        if p95 is None:
+            return DEFAULT_HEDGE_DELAY
+        return min(max(p95, MIN_HEDGE_DELAY), MAX_HEDGE_DELAY)
+
+    def to_dict(self) -> dict:
+        p95 = self.p95_latency("tavily")
+        with self._lock:
+            searches = self.searches
+            return {
+                "searches": searches,
+                "hedged": self.hedged,
+                "hedge_rate": round(self.hedged / searches, 4) if searches else 0.0,
+                "wins": dict(self.wins),
+                "win_rate": {
+                    engine: round(wins / searches, 4)
+                    for engine, wins in self.wins.items()
+                },
+                "tavily_p95_latency": p95,
+            }
+
+
+hedge_stats = HedgeStats()
+
+
+def get_hedge_stats() -> dict:
+    return hedge_stats.to_dict()
+
 
 class FallbackSearchTool(BaseTool):
     """搜索工具，支持从 Tavily 回退到 DuckDuckGo"""
@@ -64,46 +177,206 @@ class FallbackSearchTool(BaseTool):
         except Exception as e:
             logger.warning(f"Tavily 搜索工具初始化失败: {e}，将使用 DuckDuckGo 作为回退")
     
+    def _tavily_allowed(self) -> bool:
+        """Tavily is skipped while its circuit breaker is open."""
+        if not self.tavily_tool:
+            return False
+        if get_circuit_breaker("tavily").allow_request():
+            return True
+        logger.info("Tavily 熔断中，直接使用 DuckDuckGo")
+        return False
+
+    @staticmethod
+    def _check_tavily_result(result: str, started: float) -> str:
+        breaker = get_circuit_breaker("tavily")
+        if is_error_result(result):
+            breaker.record_failure(str(result))
+            raise SearchEngineError(f"Tavily 搜索返回错误: {result}")
+        breaker.record_success(time.monotonic() - started)
+        return result
+
+    def _search_tavily(self, query: str) -> str:
+        logger.info(f"尝试使用 Tavily 搜索: {query}")
+        started = time.monotonic()
+        try:
+            result = self.tavily_tool._run(query)
+        except Exception as e:
+            get_circuit_breaker("tavily").record_failure(str(e))
+            raise
+        return self._check_tavily_result(result, started)
+
+    async def _asearch_tavily(self, query: str) -> str:
+        logger.info(f"尝试使用 Tavily 异步搜索: {query}")
+        started = time.monotonic()
+        try:
+            result = await self.tavily_tool._arun(query)
+        except Exception as e:
+            get_circuit_breaker("tavily").record_failure(str(e))
+            raise
+        return self._check_tavily_result(result, started)
+
+    def _search_duckduckgo(self, query: str) -> str:
+        logger.info(f"使用 DuckDuckGo 搜索: {query}")
+        # DuckDuckGo is the last resort, so its breaker is only tracked for health reporting
+        breaker = get_circuit_breaker("duckduckgo")
+        started = time.monotonic()
+        try:
+            result = self.duckduckgo_tool._run(query)
+        except Exception as e:
+            breaker.record_failure(str(e))
+            raise
+        breaker.record_success(time.monotonic() - started)
+        # DuckDuckGoSearchResults returns (content, artifact)
+        if isinstance(result, tuple):
+            result = result[0]
+        return result
+
+    async def _asearch_duckduckgo(self, query: str) -> str:
+        return await run_in_search_executor(self._search_duckduckgo, query)
+
+    @staticmethod
+    def _all_failed(error: Exception) -> str:
+        logger.error(f"所有搜索引擎都失败了: {error}")
+        return json.dumps([{"error": "所有搜索引擎都不可用", "details": str(error)}])
+
     def _run(self, query: str) -> str:
-        """执行搜索，优先使用 Tavily，失败时回退到 DuckDuckGo"""
-        
-        # 首先尝试使用 Tavily
-        if self.tavily_tool:
+        """执行搜索，优先使用 Tavily，慢或失败时由 DuckDuckGo 对冲或回退"""
+        use_tavily = self._tavily_allowed()
+        if use_tavily and is_hedging_enabled():
+            return self._run_hedged(query)
+
+        if use_tavily:
             try:
-                logger.info(f"尝试使用 Tavily 搜索: {query}")
-                result = self.tavily_tool._run(query)
+                result = self._search_tavily(query)
                 logger.info("Tavily 搜索成功")
                 return result
             except Exception as e:
                 logger.warning(f"Tavily 搜索失败: {e}，回退到 DuckDuckGo")
-        
-        # 回退到 DuckDuckGo
+
         try:
-            logger.info(f"使用 DuckDuckGo 搜索: {query}")
-            result = self.duckduckgo_tool._run(query)
+            result = self._search_duckduckgo(query)
             logger.info("DuckDuckGo 搜索成功")
             return result
         except Exception as e:
-            logger.error(f"DuckDuckGo 搜索也失败了: {e}")
-            return json.dumps([{"error": "所有搜索引擎都不可用", "details": str(e)}])
-    
+            return self._all_failed(e)
+
+    def _run_hedged(self, query: str) -> str:
+        delay = hedge_stats.hedge_delay("tavily")
+        started = time.monotonic()
+        futures = {_hedge_executor.submit(self._search_tavily, query): "tavily"}
+        done, _ = concurrent.futures.wait(futures, timeout=delay)
+        hedged = not done
+        secondary_started = False
+        last_error: Exception = SearchEngineError("no search engine finished")
+
+        while True:
+            if not secondary_started and (hedged or not futures):
+                if hedged:
+                    logger.info(f"Tavily {delay:.2f}s 内未返回，启动 DuckDuckGo 对冲搜索")
+                futures[_hedge_executor.submit(self._search_duckduckgo, query)] = "duckduckgo"
+                secondary_started = True
+            if not futures:
+                hedge_stats.record(None, hedged)
+                return self._all_failed(last_error)
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                engine = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"{engine} 搜索失败: {e}")
+                    last_error = e
+                    continue
+                if engine == "tavily":
+                    hedge_stats.record_latency(engine, time.monotonic() - started)
+                for other in futures:
+                    # Threads that already started cannot be interrupted;
+                    # their result is simply discarded.
+                    other.cancel()
+                hedge_stats.record(engine, hedged)
+                logger.info(f"{engine} 搜索成功")
+                return result
+
     async def _arun(self, query: str) -> str:
-        """异步执行搜索"""
-        return self._run(query)
+        """异步执行搜索，Tavily 使用原生异步接口，DuckDuckGo 在有界线程池中执行"""
+        use_tavily = self._tavily_allowed()
+        if use_tavily and is_hedging_enabled():
+            return await self._arun_hedged(query)
+
+        if use_tavily:
+            try:
+                result = await self._asearch_tavily(query)
+                logger.info("Tavily 搜索成功")
+                return result
+            except Exception as e:
+                logger.warning(f"Tavily 搜索失败: {e}，回退到 DuckDuckGo")
+
+        try:
+            result = await self._asearch_duckduckgo(query)
+            logger.info("DuckDuckGo 搜索成功")
+            return result
+        except Exception as e:
+            return self._all_failed(e)
+
+    async def _arun_hedged(self, query: str) -> str:
+        delay = hedge_stats.hedge_delay("tavily")
+        started = time.monotonic()
+        tasks = {asyncio.ensure_future(self._asearch_tavily(query)): "tavily"}
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        hedged = not done
+        secondary_started = False
+        last_error: Exception = SearchEngineError("no search engine finished")
+
+        try:
+            while True:
+                if not secondary_started and (hedged or not tasks):
+                    if hedged:
+                        logger.info(f"Tavily {delay:.2f}s 内未返回，启动 DuckDuckGo 对冲搜索")
+                    tasks[asyncio.ensure_future(self._asearch_duckduckgo(query))] = "duckduckgo"
+                    secondary_started = True
+                if not tasks:
+                    hedge_stats.record(None, hedged)
+                    return self._all_failed(last_error)
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    engine = tasks.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.warning(f"{engine} 搜索失败: {e}")
+                        last_error = e
+                        continue
+                    if engine == "tavily":
+                        hedge_stats.record_latency(engine, time.monotonic() - started)
+                    hedge_stats.record(engine, hedged)
+                    logger.info(f"{engine} 搜索成功")
+                    return result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+# Search tools returned to agents are served from the persistent search cache
+CachedFallbackSearch = create_cached_tool(FallbackSearchTool, "fallback")
+CachedDuckDuckGoSearch = create_cached_tool(LoggedDuckDuckGoSearch, "duckduckgo")
+CachedBraveSearch = create_cached_tool(LoggedBraveSearch, "brave_search")
+CachedArxivSearch = create_cached_tool(LoggedArxivSearch, "arxiv")
+CachedBochaSearch = create_cached_tool(LoggedBochaSearch, "bocha")
 
 
 # Get the selected search tool
 def get_web_search_tool(max_search_results: int):
     # 如果配置为使用回退机制或者是 Tavily，则使用回退工具
     if SELECTED_SEARCH_ENGINE in [SearchEngine.TAVILY.value, "fallback", "auto"]:
-        return FallbackSearchTool(max_search_results)
+        return CachedFallbackSearch(max_search_results)
     elif SELECTED_SEARCH_ENGINE == SearchEngine.DUCKDUCKGO.value:
-        return LoggedDuckDuckGoSearch(
+        return CachedDuckDuckGoSearch(
             name="web_search",
             num_results=max_search_results,
         )
     elif SELECTED_SEARCH_ENGINE == SearchEngine.BRAVE_SEARCH.value:
-        return LoggedBraveSearch(
+        return CachedBraveSearch(
             name="web_search",
             search_wrapper=BraveSearchWrapper(
                 api_key=os.getenv("BRAVE_SEARCH_API_KEY", ""),
@@ -111,7 +384,7 @@ def get_web_search_tool(max_search_results: int):
             ),
         )
     elif SELECTED_SEARCH_ENGINE == SearchEngine.ARXIV.value:
-        return LoggedArxivSearch(
+        return CachedArxivSearch(
             name="web_search",
             api_wrapper=ArxivAPIWrapper(
                 top_k_results=max_search_results,
@@ -120,13 +393,20 @@ def get_web_search_tool(max_search_results: int):
             ),
         )
     elif SELECTED_SEARCH_ENGINE == SearchEngine.BOCHA.value:
-        return LoggedBochaSearch(
+        return CachedBochaSearch(
             name="web_search",
             max_results=max_search_results,
             include_images=True,
             include_summary=True,
+            # Used while Bocha is failing or its circuit breaker is open
+            fallback_tool=FallbackSearchTool(max_search_results),
         )
+    elif SELECTED_SEARCH_ENGINE == SearchEngine.FEDERATED.value:
+        # Imported here because the federated tool builds on this module
+        from src.tools.federated_search import FederatedSearchTool
+
+        return create_cached_tool(FederatedSearchTool, "federated")(max_search_results)
     else:
         # 默认使用回退机制
         logger.info(f"未识别的搜索引擎 {SELECTED_SEARCH_ENGINE}，使用回退机制")
-        return FallbackSearchTool(max_search_results)
+        return CachedFallbackSearch(max_search_results)
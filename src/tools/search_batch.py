@@ -0,0 +1,150 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Batch web search.
+
+Runs several queries concurrently through the configured search engine under
+one shared deadline, so a research step can gather its sources in a single
+tool call instead of one ReAct round trip per query.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import List, Type
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from src.tools.search import get_web_search_tool
+from src.tools.search_cache import is_error_result, normalize_query
+from src.utils.url_utils import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUERIES = 5
+DEFAULT_DEADLINE_SECONDS = 20.0
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _parse_results(raw):
+    """Search tools return JSON strings for most engines and plain text for some."""
+    if isinstance(raw, str):
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw
+    return raw
+
+
+def _result_url(item) -> str:
+    if not isinstance(item, dict):
+        return ""
+    return item.get("url") or item.get("link") or item.get("image_url") or ""
+
+
+class WebSearchBatchInput(BaseModel):
+    queries: List[str] = Field(
+        description="Search queries to run at the same time, one per sub-question"
+    )
+
+
+class WebSearchBatchTool(BaseTool):
+    """Runs several web searches concurrently and groups the results by query."""
+
+    name: str = "web_search_batch"
+    description: str = (
+        "Run several web searches concurrently in one call. Use it when a step "
+        "needs sources for several sub-questions. Results are grouped by query "
+        "and a URL already returned for an earlier query is not repeated."
+    )
+    args_schema: Type[BaseModel] = WebSearchBatchInput
+    max_search_results: int = 5
+    max_queries: int = DEFAULT_MAX_QUERIES
+    deadline: float = DEFAULT_DEADLINE_SECONDS
+
+    def _run(self, queries: List[str]) -> str:
+        """同步执行批量搜索"""
+        return asyncio.run(self._arun(queries))
+
+    async def _arun(self, queries: List[str]) -> str:
+        """并发执行多个查询，在截止时间内返回按查询分组、按 URL 去重的结果"""
+        unique_queries = []
+        seen_queries = set()
+        for query in queries:
+            key = normalize_query(query)
+            if key and key not in seen_queries:
+                seen_queries.add(key)
+                unique_queries.append(query.strip())
+        dropped = unique_queries[self.max_queries :]
+        unique_queries = unique_queries[: self.max_queries]
+        if dropped:
+            logger.warning(f"批量搜索最多 {self.max_queries} 个查询，已忽略: {dropped}")
+        if not unique_queries:
+            return json.dumps({"error": "没有有效的搜索查询"}, ensure_ascii=False)
+
+        search_tool = get_web_search_tool(self.max_search_results)
+        tasks = [
+            asyncio.ensure_future(search_tool.ainvoke(query))
+            for query in unique_queries
+        ]
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+
+        groups = []
+        seen_urls = set()
+        for query, task in zip(unique_queries, tasks):
+            if task in pending:
+                logger.warning(f"批量搜索查询超过截止时间 {self.deadline}s: {query}")
+                groups.append({"query": query, "error": "搜索超时"})
+                continue
+            try:
+                raw = task.result()
+            except Exception as e:
+                logger.warning(f"批量搜索查询失败 {query}: {e}")
+                groups.append({"query": query, "error": str(e)})
+                continue
+            if is_error_result(raw):
+                groups.append({"query": query, "error": _parse_results(raw)})
+                continue
+            results = _parse_results(raw)
+            if isinstance(results, list):
+                unique_results = []
+                for item in results:
+                    url = _result_url(item)
+                    key = canonicalize_url(url) if url else None
+                    if key and key in seen_urls:
+                        continue
+                    if key:
+                        seen_urls.add(key)
+                    unique_results.append(item)
+                results = unique_results
+            groups.append({"query": query, "results": results})
+
+        logger.info(
+            f"批量搜索完成: {len(done)}/{len(tasks)} 个查询返回，去重后共 {len(seen_urls)} 个 URL"
+        )
+        return json.dumps(groups, ensure_ascii=False)
+
+
+def get_web_search_batch_tool(max_search_results: int) -> WebSearchBatchTool:
+    """
+    Get the batch search tool for the configured engine.
+
+    SEARCH_BATCH_MAX_QUERIES caps the queries per call and SEARCH_BATCH_DEADLINE
+    (seconds) is the deadline shared by all of them.
+    """
+    return WebSearchBatchTool(
+        max_search_results=max_search_results,
+        max_queries=int(_env_number("SEARCH_BATCH_MAX_QUERIES", DEFAULT_MAX_QUERIES)),
+        deadline=_env_number("SEARCH_BATCH_DEADLINE", DEFAULT_DEADLINE_SECONDS),
+    )
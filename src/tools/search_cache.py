@@ -0,0 +1,502 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Persistent TTL cache for web search results.
+
+Results are stored in a SQLite database keyed by engine, normalized query and
+result-count parameters, so repeated searches across threads, runs and server
+restarts do not spend paid API credits again. Each engine has its own TTL and
+the database is kept under a size budget by evicting the least recently used
+entries.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, ClassVar, Optional, Type, TypeVar
+
+from src.crawler.prefetch import is_prefetch_enabled, schedule_prefetch
+from src.tools.query_memo import current_run_id, get_query_memo, with_duplicate_note
+from src.utils.single_flight import get_single_flight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "search_cache.sqlite3")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+
+# Arxiv results change slowly; web results go stale within hours
+ENGINE_TTL_SECONDS: dict[str, int] = {
+    "tavily": DEFAULT_TTL_SECONDS,
+    "duckduckgo": DEFAULT_TTL_SECONDS,
+    "brave_search": DEFAULT_TTL_SECONDS,
+    "bocha": DEFAULT_TTL_SECONDS,
+    "fallback": DEFAULT_TTL_SECONDS,
+    "federated": DEFAULT_TTL_SECONDS,
+    "arxiv": 7 * 24 * 60 * 60,
+}
+
+# Tool attributes that change the result set and therefore the cache key
+CACHE_KEY_ATTRIBUTES = (
+    "max_results",
+    "num_results",
+    "max_search_results",
+    "search_depth",
+    "include_raw_content",
+    "include_images",
+    "include_image_descriptions",
+    "include_summary",
+    "include_domains",
+    "exclude_domains",
+    "freshness",
+    "engines",
+)
+
+
+# Plain-text tools (DuckDuckGo, Brave, Arxiv, crawl) report failures as text
+ERROR_RESULT_PREFIXES = (
+    "error",
+    "failed to",
+    "no good duckduckgo search result",
+)
+_RATE_LIMIT_RE = re.compile(r"\b(rate ?limit(ed)?|too many requests)\b", re.I)
+# Longer plain-text results are search results that may mention rate limits
+MAX_ERROR_TEXT_CHARS = 500
+
+
+def _is_error_text(text: str) -> bool:
+    text = text.strip()
+    if text.lower().startswith(ERROR_RESULT_PREFIXES):
+        return True
+    return len(text) <= MAX_ERROR_TEXT_CHARS and bool(_RATE_LIMIT_RE.search(text))
+
+
+def is_error_result(result: Any) -> bool:
+    """
+    Tools such as Tavily report failures as an {"error": ...} payload instead of
+    raising; Bocha returns a list made only of such error items, and plain-text
+    tools return an error message.
+    """
+    if isinstance(result, tuple) and len(result) == 2:
+        # content_and_artifact tools: the artifact holds the raw results
+        result = result[1]
+    parsed = result
+    if isinstance(result, str):
+        try:
+            parsed = json.loads(result)
+        except ValueError:
+            return _is_error_text(result)
+    if isinstance(parsed, list):
+        return bool(parsed) and all(
+            isinstance(item, dict) and "error" in item for item in parsed
+        )
+    return isinstance(parsed, dict) and "error" in parsed
+
+
+_URL_RE = re.compile(r"https?://[^\s\"'<>()\[\],]+")
+
+
+def result_urls(result: Any) -> list:
+    """Page URLs of a search result in rank order; images are left out."""
+    if isinstance(result, tuple) and len(result) == 2:
+        # content_and_artifact tools: the artifact holds the raw results
+        result = result[1]
+    parsed = result
+    if isinstance(result, str):
+        try:
+            parsed = json.loads(result)
+        except ValueError:
+            # Plain-text results (e.g. DuckDuckGo) list "link: <url>" entries
+            return list(dict.fromkeys(_URL_RE.findall(result)))
+    if isinstance(parsed, dict):
+        parsed = parsed.get("results") or []
+    if not isinstance(parsed, list):
+        return []
+    urls = []
+    for item in parsed:
+        if isinstance(item, dict) and item.get("type", "page") == "page":
+            url = item.get("url") or item.get("link")
+            if isinstance(url, str) and url.startswith(("http://", "https://")):
+                urls.append(url)
+    return list(dict.fromkeys(urls))
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", str(query)).strip().lower()
+
+
+def _engine_ttl(engine: str) -> int:
+    env_value = os.getenv(f"SEARCH_CACHE_TTL_{engine.upper()}")
+    if env_value:
+        try:
+            return int(env_value)
+        except ValueError:
+            logger.warning(f"无效的搜索缓存 TTL 配置 {engine}: {env_value}")
+    return ENGINE_TTL_SECONDS.get(engine, DEFAULT_TTL_SECONDS)
+
+
+class SearchCache:
+    """SQLite-backed search result cache with per-engine TTLs and LRU eviction."""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                engine TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_last_access "
+            "ON search_cache (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(engine: str, query: str, params: Optional[dict] = None) -> str:
+        payload = json.dumps(
+            [engine, normalize_query(query), params or {}],
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, engine: str, query: str, params: Optional[dict] = None) -> Any:
+        """Return the cached result, or None on a miss or an expired entry."""
+        key = self.make_key(engine, query, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, size, expires_at FROM search_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or row[2] <= now:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            self.bytes_saved += row[1]
+        return json.loads(row[0])
+
+    def set(
+        self,
+        engine: str,
+        query: str,
+        value: Any,
+        params: Optional[dict] = None,
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Store a result; values that are not JSON-serializable are skipped."""
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        key = self.make_key(engine, query, params)
+        now = time.time()
+        ttl = _engine_ttl(engine) if ttl is None else ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache "
+                "(key, engine, value, size, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, engine, payload, size, now + ttl, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM search_cache"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        to_free = total - self.max_bytes
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM search_cache ORDER BY last_access"
+        ):
+            victims.append((key,))
+            to_free -= size
+            if to_free <= 0:
+                break
+        self._conn.executemany("DELETE FROM search_cache WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_bytes": total,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def is_search_cache_enabled() -> bool:
+    return os.getenv("SEARCH_CACHE_ENABLED", "true").lower() not in ("false", "0", "no")
+
+
+def get_search_cache() -> SearchCache:
+    """Get the process-wide search cache, creating it on first use."""
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SearchCache(
+                    os.getenv("SEARCH_CACHE_PATH", DEFAULT_CACHE_PATH),
+                    int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+                )
+    return _search_cache
+
+
+def get_search_cache_stats() -> dict:
+    if not is_search_cache_enabled():
+        return {"enabled": False}
+    return {"enabled": True, **get_search_cache().get_stats()}
+
+
+class CachedToolMixin:
+    """
+    A mixin class that serves search tool results from the search cache.
+
+    On a cache miss, identical searches that are already in flight are
+    coalesced into one upstream call.
+    """
+
+    cache_engine: ClassVar[str] = "default"
+
+    def _cache_params(self) -> dict:
+        params = {}
+        for name in CACHE_KEY_ATTRIBUTES:
+            value = getattr(self, name, None)
+            if value is not None:
+                params[name] = value
+        # Brave and Arxiv keep their result count on the wrapper
+        search_kwargs = getattr(
+            getattr(self, "search_wrapper", None), "search_kwargs", None
+        )
+        if search_kwargs:
+            params["search_kwargs"] = search_kwargs
+        top_k_results = getattr(
+            getattr(self, "api_wrapper", None), "top_k_results", None
+        )
+        if top_k_results is not None:
+            params["top_k_results"] = top_k_results
+        return params
+
+    @staticmethod
+    def _cache_query(args: tuple, kwargs: dict) -> Optional[str]:
+        query = args[0] if args else kwargs.get("query")
+        return query if isinstance(query, str) else None
+
+    def _cache_lookup(self, query: Optional[str]) -> Any:
+        if query is None or not is_search_cache_enabled():
+            return None
+        try:
+            result = get_search_cache().get(
+                self.cache_engine, query, self._cache_params()
+            )
+        except Exception as e:
+            logger.warning(f"读取搜索缓存失败: {e}")
+            return None
+        if result is None:
+            return None
+        logger.info(f"搜索缓存命中 [{self.cache_engine}]: {query}")
+        # JSON has no tuples; content_and_artifact tools (e.g. DuckDuckGo) must
+        # return a (content, artifact) two-tuple
+        if (
+            getattr(self, "response_format", None) == "content_and_artifact"
+            and isinstance(result, list)
+            and len(result) == 2
+        ):
+            return tuple(result)
+        return result
+
+    def _cache_store(self, query: Optional[str], result: Any) -> None:
+        if query is None or not result or is_error_result(result):
+            return
+        if not is_search_cache_enabled():
+            return
+        try:
+            get_search_cache().set(
+                self.cache_engine, query, result, self._cache_params()
+            )
+        except Exception as e:
+            logger.warning(f"写入搜索缓存失败: {e}")
+
+    def _flight_key(self, query: Optional[str]) -> Optional[str]:
+        if query is None:
+            return None
+        return SearchCache.make_key(self.cache_engine, query, self._cache_params())
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        query = self._cache_query(args, kwargs)
+        cached = self._cache_lookup(query)
+        if cached is not None:
+            return cached
+        super_run = super()._run
+
+        def search() -> Any:
+            result = super_run(*args, **kwargs)
+            self._cache_store(query, result)
+            return result
+
+        key = self._flight_key(query)
+        if key is None:
+            return search()
+        return get_single_flight("search").do(key, search)
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        query = self._cache_query(args, kwargs)
+        # SQLite calls block, so they run off the event loop
+        cached = await asyncio.to_thread(self._cache_lookup, query)
+        if cached is not None:
+            return cached
+        super_arun = super()._arun
+
+        async def search() -> Any:
+            result = await super_arun(*args, **kwargs)
+            await asyncio.to_thread(self._cache_store, query, result)
+            return result
+
+        key = self._flight_key(query)
+        if key is None:
+            return await search()
+        return await get_single_flight("search").ado(key, search)
+
+
+class QueryMemoMixin:
+    """
+    A mixin class that answers near-duplicate queries of the current run from
+    the run's query memo instead of searching again.
+    """
+
+    cache_engine: ClassVar[str] = "default"
+
+    def _memo_lookup(self, query: Optional[str]):
+        if query is None:
+            return None, None
+        memo = get_query_memo()
+        if memo is None:
+            return None, None
+        return memo, memo.lookup(self.cache_engine, query)
+
+    def _memo_store(self, memo, query: Optional[str], result: Any) -> None:
+        if memo is not None and result and not is_error_result(result):
+            memo.store(self.cache_engine, query, result)
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        query = CachedToolMixin._cache_query(args, kwargs)
+        memo, duplicate = self._memo_lookup(query)
+        if duplicate is not None:
+            return with_duplicate_note(*duplicate)
+        result = super()._run(*args, **kwargs)
+        self._memo_store(memo, query, result)
+        return result
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        query = CachedToolMixin._cache_query(args, kwargs)
+        memo, duplicate = self._memo_lookup(query)
+        if duplicate is not None:
+            return with_duplicate_note(*duplicate)
+        result = await super()._arun(*args, **kwargs)
+        self._memo_store(memo, query, result)
+        return result
+
+
+class PrefetchMixin:
+    """
+    A mixin class that hands the top result URLs of each search of a run to
+    the crawl prefetcher, so that crawling them later hits the crawl cache.
+    """
+
+    def _prefetch(self, result: Any) -> None:
+        if not is_prefetch_enabled() or not result or is_error_result(result):
+            return
+        try:
+            schedule_prefetch(result_urls(result), current_run_id())
+        except Exception as e:
+            logger.debug(f"调度预取失败: {e}")
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        result = super()._run(*args, **kwargs)
+        self._prefetch(result)
+        return result
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        result = await super()._arun(*args, **kwargs)
+        self._prefetch(result)
+        return result
+
+
+def create_cached_tool(base_tool_class: Type[T], engine: str) -> Type[T]:
+    """
+    Factory function to create a version of a search tool backed by the search cache.
+
+    Near-duplicate queries within one run are answered from the run's query
+    memo first; other queries go through the persistent cache. The top
+    results are then prefetched into the crawl cache when that is enabled.
+
+    Args:
+        base_tool_class: The search tool class to wrap
+        engine: Engine name used in the cache key and for TTL lookup
+
+    Returns:
+        A new class that inherits from PrefetchMixin, QueryMemoMixin,
+        CachedToolMixin and the base tool class
+    """
+
+    class CachedTool(PrefetchMixin, QueryMemoMixin, CachedToolMixin, base_tool_class):
+        cache_engine: ClassVar[str] = engine
+
+    CachedTool.__name__ = f"Cached{base_tool_class.__name__}"
+    return CachedTool
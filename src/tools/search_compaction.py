@@ -0,0 +1,196 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Query-aware compaction of search results.
+
+Search engines return long snippets, summaries and page text plus metadata
+the agents never use. Before results reach the agent's context, each page's
+text is reduced to the passages that score highest against the query (BM25),
+within a per-result and a per-call token budget, and the redundant fields
+are dropped.
+"""
+
+import logging
+import os
+import re
+from typing import List, Optional
+
+from src.utils.text_utils import bm25_scores
+from src.utils.token_utils import estimate_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_MAX_TOKENS = 300
+DEFAULT_CALL_MAX_TOKENS = 2000
+# Results that would get less than this are kept without content
+MIN_RESULT_TOKENS = 30
+ELLIPSIS = "…"
+
+# Fields carrying page text; the longest one becomes the compacted content
+TEXT_FIELDS = ("raw_content", "summary", "content")
+# Fields kept as they are; everything else (icons, site names, sizes, ...) is dropped
+KEPT_FIELDS = (
+    "type",
+    "title",
+    "url",
+    "score",
+    "datePublished",
+    "published_date",
+    "image_url",
+    "imageUrl",
+    "image_description",
+)
+
+_PASSAGE_SPLIT_RE = re.compile(r"(?<=[。！？!?；;])|(?<=\.)\s+|\n+")
+MIN_PASSAGE_TOKENS = 10
+_CJK_PUNCTUATION = "。！？；"
+
+
+def is_compaction_enabled() -> bool:
+    return os.getenv("SEARCH_COMPACTION_ENABLED", "true").lower() not in (
+        "false",
+        "0",
+        "no",
+    )
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def get_result_max_tokens() -> int:
+    return _env_int("SEARCH_RESULT_MAX_TOKENS", DEFAULT_RESULT_MAX_TOKENS)
+
+
+def get_call_max_tokens() -> int:
+    return _env_int("SEARCH_CALL_MAX_TOKENS", DEFAULT_CALL_MAX_TOKENS)
+
+
+def _join(left: str, right: str) -> str:
+    # Chinese sentences are not separated by spaces
+    return left + right if left.endswith(tuple(_CJK_PUNCTUATION)) else f"{left} {right}"
+
+
+def split_passages(text: str) -> List[str]:
+    """Split text into sentence-sized passages, merging fragments that are too short."""
+    passages = []
+    current = ""
+    for piece in _PASSAGE_SPLIT_RE.split(text):
+        piece = (piece or "").strip()
+        if not piece:
+            continue
+        current = _join(current, piece) if current else piece
+        if estimate_tokens(current) >= MIN_PASSAGE_TOKENS:
+            passages.append(current)
+            current = ""
+    if current:
+        if passages:
+            passages[-1] = _join(passages[-1], current)
+        else:
+            passages.append(current)
+    return passages
+
+
+def compact_text(text: str, query: str, max_tokens: int) -> str:
+    """
+    Keep the passages of text most relevant to the query within max_tokens.
+
+    Passages are picked by BM25 score (earlier passages win ties) and returned
+    in their original order, joined by an ellipsis where text was skipped.
+    """
+    text = (text or "").strip()
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    passages = split_passages(text)
+    if len(passages) <= 1:
+        return truncate_to_tokens(text, max_tokens)
+
+    scores = bm25_scores(passages, query)
+    ranked = sorted(range(len(passages)), key=lambda i: (-scores[i], i))
+    chosen = []
+    used = 0
+    for i in ranked:
+        cost = estimate_tokens(passages[i]) + (1 if chosen else 0)
+        if used + cost > max_tokens:
+            continue
+        chosen.append(i)
+        used += cost
+    if not chosen:
+        # Even the best passage is too long on its own
+        return truncate_to_tokens(passages[ranked[0]], max_tokens)
+
+    chosen.sort()
+    parts = []
+    for previous, i in zip([None] + chosen, chosen):
+        if parts and i != previous + 1:
+            parts.append(ELLIPSIS)
+        parts.append(passages[i])
+    compacted = parts[0]
+    for part in parts[1:]:
+        compacted = _join(compacted, part)
+    return compacted
+
+
+def _is_error_item(item) -> bool:
+    return not isinstance(item, dict) or "error" in item
+
+
+def compact_search_results(
+    results: list,
+    query: Optional[str],
+    result_max_tokens: Optional[int] = None,
+    call_max_tokens: Optional[int] = None,
+) -> list:
+    """
+    Compact a list of search result dicts for the given query.
+
+    Results keep their order. Each page keeps its title, url, date and type plus
+    a single content field built from its longest text field; error items are
+    passed through unchanged. Once the per-call budget is spent, later results
+    keep their title and url only.
+
+    Args:
+        results: Search results as returned by the search tools
+        query: The search query
+        result_max_tokens: Token budget for one result's content
+        call_max_tokens: Token budget for the content of all results together
+
+    Returns:
+        The compacted results
+    """
+    if not query or not isinstance(results, list) or not is_compaction_enabled():
+        return results
+    result_max_tokens = (
+        get_result_max_tokens() if result_max_tokens is None else result_max_tokens
+    )
+    remaining = get_call_max_tokens() if call_max_tokens is None else call_max_tokens
+
+    compacted = []
+    before = after = 0
+    for item in results:
+        if _is_error_item(item):
+            compacted.append(item)
+            continue
+        entry = {key: item[key] for key in KEPT_FIELDS if item.get(key)}
+        texts = [item.get(field) or "" for field in TEXT_FIELDS]
+        text = max(texts, key=len) if texts else ""
+        if text or "content" in item:
+            budget = min(result_max_tokens, remaining)
+            content = (
+                compact_text(text, query, budget) if budget >= MIN_RESULT_TOKENS else ""
+            )
+            entry["content"] = content
+            tokens = estimate_tokens(content)
+            remaining -= tokens
+            before += estimate_tokens(text)
+            after += tokens
+        compacted.append(entry)
+    if before:
+        logger.info(f"搜索结果压缩: 约 {before} → {after} tokens")
+    return compacted
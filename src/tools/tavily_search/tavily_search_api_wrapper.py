@@ -5,13 +5,14 @@
 import json
 from typing import Dict, List, Optional
 
-import aiohttp
-import requests
 from langchain_community.utilities.tavily_search import TAVILY_API_URL
 from langchain_community.utilities.tavily_search import (
     TavilySearchAPIWrapper as OriginalTavilySearchAPIWrapper,
 )
 
+from src.tools.search_compaction import compact_search_results, is_compaction_enabled
+from src.utils.http_client import get_async_http_client, get_http_client
+
 
 class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
     def raw_results(
@@ -38,11 +39,7 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
             "include_images": include_images,
             "include_image_descriptions": include_image_descriptions,
         }
-        response = requests.post(
-            # type: ignore
-            f"{TAVILY_API_URL}/search",
-            json=params,
-        )
+        response = get_http_client().post(f"{TAVILY_API_URL}/search", json=params)
         response.raise_for_status()
         return response.json()
 
@@ -74,13 +71,13 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
                 "include_images": include_images,
                 "include_image_descriptions": include_image_descriptions,
             }
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(f"{TAVILY_API_URL}/search", json=params) as res:
-                    if res.status == 200:
-                        data = await res.text()
-                        return data
-                    else:
-                        raise Exception(f"Error {res.status}: {res.reason}")
+            res = await get_async_http_client().post(
+                f"{TAVILY_API_URL}/search", json=params
+            )
+            if res.status_code == 200:
+                return res.text
+            else:
+                raise Exception(f"Error {res.status_code}: {res.reason_phrase}")
 
         results_json_str = await fetch()
         return json.loads(results_json_str)
@@ -95,7 +92,12 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
         results = raw_results["results"]
         if not results:
             return []
-            
+
+        # Tavily echoes the query; with it the page text is compacted to the
+        # passages relevant to the query instead of being cut from the start
+        query = raw_results.get("query")
+        compacting = bool(query) and is_compaction_enabled()
+
         clean_results = []
         max_content_length = 5000  # 限制每个结果的内容长度
         
@@ -105,7 +107,7 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
                 
             # 截断内容以控制长度
             content = result.get("content", "")
-            if content and len(content) > max_content_length:
+            if not compacting and content and len(content) > max_content_length:
                 content = content[:max_content_length] + "..."
             
             clean_result = {
@@ -118,10 +120,13 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
             
             # 如果有原始内容，也要截断
             if raw_content := result.get("raw_content"):
-                if len(raw_content) > max_content_length:
+                if not compacting and len(raw_content) > max_content_length:
                     raw_content = raw_content[:max_content_length] + "..."
                 clean_result["raw_content"] = raw_content
             clean_results.append(clean_result)
+
+        if compacting:
+            clean_results = compact_search_results(clean_results, query)
         
         # 限制图片数量以减少 token 使用
         images = raw_results.get("images", [])
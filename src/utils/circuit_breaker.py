@@ -0,0 +1,197 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Circuit breakers for external providers.
+
+A breaker opens after a run of consecutive failures, where a call slower than
+the latency threshold also counts as a failure. While open, callers skip the
+provider and use an alternative. After the reset timeout a single half-open
+probe is let through: success closes the breaker, failure opens it again.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_LATENCY_THRESHOLD = 15.0
+DEFAULT_RESET_TIMEOUT = 30.0
+HEALTH_WINDOW = 20
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"无效的熔断器配置 {name}: {value}")
+        return default
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker with a rolling health score."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        latency_threshold: float = DEFAULT_LATENCY_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.failure_threshold = max(int(failure_threshold), 1)
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.rejected = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._outcomes: deque = deque(maxlen=HEALTH_WINDOW)
+        self._latencies: deque = deque(maxlen=HEALTH_WINDOW)
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return whether a call may go to the provider now."""
+        now = time.monotonic()
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probe_started_at = None
+            if self._state == HALF_OPEN:
+                # One probe at a time; a probe that never reported back (for
+                # example a cancelled hedge) is replaced after the reset timeout
+                probe = self._probe_started_at
+                if probe is None or now - probe >= self.reset_timeout:
+                    self._probe_started_at = now
+                    logger.info(f"熔断器 [{self.name}] 半开，放行探测请求")
+                    return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: float) -> None:
+        """Record a completed call; calls slower than the latency threshold count as failures."""
+        if latency > self.latency_threshold:
+            self.record_failure(f"响应过慢: {latency:.2f}s")
+            return
+        with self._lock:
+            self._outcomes.append(True)
+            self._latencies.append(latency)
+            self.consecutive_failures = 0
+            if self._state != CLOSED:
+                logger.info(f"熔断器 [{self.name}] 探测成功，恢复关闭状态")
+            self._state = CLOSED
+            self._probe_started_at = None
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._outcomes.append(False)
+            self.consecutive_failures += 1
+            self._last_error = error
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED
+                and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started_at = None
+                self.times_opened += 1
+                logger.warning(
+                    f"熔断器 [{self.name}] 打开，{self.reset_timeout:.0f}s 内跳过该服务: {error}"
+                )
+
+    def health_score(self) -> float:
+        """Share of successful calls among the most recent ones; 1.0 without data."""
+        with self._lock:
+            if not self._outcomes:
+                return 1.0
+            return round(sum(self._outcomes) / len(self._outcomes), 4)
+
+    def to_dict(self) -> dict:
+        health = self.health_score()
+        with self._lock:
+            latencies = list(self._latencies)
+            retry_in = None
+            if self._state == OPEN:
+                retry_in = round(
+                    max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0),
+                    2,
+                )
+            return {
+                "state": self._state,
+                "health_score": health,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+                "avg_latency": (
+                    round(sum(latencies) / len(latencies), 3) if latencies else None
+                ),
+                "retry_in": retry_in,
+                "last_error": self._last_error,
+            }
+
+
+_registry: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Get the process-wide breaker for a provider.
+
+    Thresholds come from CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_LATENCY_THRESHOLD (seconds) and CIRCUIT_BREAKER_RESET_TIMEOUT
+    (seconds).
+    """
+    with _registry_lock:
+        breaker = _registry.get(name)
+        if breaker is None:
+            breaker = _registry[name] = CircuitBreaker(
+                name,
+                failure_threshold=int(
+                    _env_number(
+                        "CIRCUIT_BREAKER_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD
+                    )
+                ),
+                latency_threshold=_env_number(
+                    "CIRCUIT_BREAKER_LATENCY_THRESHOLD", DEFAULT_LATENCY_THRESHOLD
+                ),
+                reset_timeout=_env_number(
+                    "CIRCUIT_BREAKER_RESET_TIMEOUT", DEFAULT_RESET_TIMEOUT
+                ),
+            )
+        return breaker
+
+
+def get_circuit_breaker_states() -> Dict[str, dict]:
+    """Return the state and health of every breaker."""
+    with _registry_lock:
+        breakers = list(_registry.values())
+    return {breaker.name: breaker.to_dict() for breaker in breakers}
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all breakers, e.g. after changing thresholds."""
+    with _registry_lock:
+        _registry.clear()
@@ -0,0 +1,132 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Process-wide pooled HTTP clients.
+
+Search and crawl tools share these clients so that repeated requests to the
+same API reuse keep-alive connections instead of paying for DNS, TCP and TLS
+setup on every call. Clients are created lazily and closed on app shutdown.
+
+An httpx.AsyncClient is bound to the event loop it first runs on, so one async
+client is kept per loop (tools also run under asyncio.run in worker threads).
+Each one is closed when its loop shuts down: the loop finalizes the client's
+lifetime generator in shutdown_asyncgens, which asyncio.run always calls.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import AsyncGenerator, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 30.0
+
+_client: Optional[httpx.Client] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, AsyncGenerator]]" = (weakref.WeakKeyDictionary())
+_lock = threading.Lock()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"无效的 HTTP 连接池配置 {name}: {os.getenv(name)}")
+        return default
+
+
+def _client_options() -> dict:
+    """
+    Pool limits come from HTTP_POOL_MAX_CONNECTIONS,
+    HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS, HTTP_POOL_KEEPALIVE_EXPIRY (seconds)
+    and HTTP_CLIENT_TIMEOUT (seconds).
+    """
+    return {
+        "limits": httpx.Limits(
+            max_connections=int(
+                _env_float("HTTP_POOL_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)
+            ),
+            max_keepalive_connections=int(
+                _env_float(
+                    "HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS",
+                    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                )
+            ),
+            keepalive_expiry=_env_float(
+                "HTTP_POOL_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY
+            ),
+        ),
+        "timeout": httpx.Timeout(_env_float("HTTP_CLIENT_TIMEOUT", DEFAULT_TIMEOUT)),
+        "follow_redirects": True,
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """Get the shared blocking HTTP client, creating it on first use."""
+    global _client
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(**_client_options())
+        return _client
+
+
+async def _client_lifetime(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def _bind_to_loop(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """
+    Start a lifetime generator for the client on the running loop.
+
+    The loop's asyncgen hooks register the generator on its first step, and
+    the loop closes it, and with it the client, in shutdown_asyncgens.
+    """
+    lifetime = _client_lifetime(client)
+    try:
+        lifetime.asend(None).send(None)
+    except StopIteration:
+        pass
+    return lifetime
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client, _ = _async_clients.get(loop, (None, None))
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_client_options())
+            _async_clients[loop] = (client, _bind_to_loop(client))
+        return client
+
+
+async def close_http_clients() -> None:
+    """Close the shared clients; called on app shutdown."""
+    global _client
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    with _lock:
+        client, _client = _client, None
+        async_clients = list(_async_clients.items())
+        _async_clients.clear()
+    if client is not None:
+        client.close()
+    for client_loop, (_, lifetime) in async_clients:
+        # Clients of other loops cannot be awaited here; they are closed when
+        # their own loops shut down
+        if client_loop is loop:
+            await lifetime.aclose()
+    logger.info("已关闭共享 HTTP 连接池")
@@ -37,3 +37,117 @@ def repair_json_output(content: str) -> str:
         except Exception as e:
             logger.warning(f"JSON repair failed: {e}")
     return content
+
+
+class IncrementalJSONArrayParser:
+    """
+    Incrementally parse a streamed JSON object and emit the elements of one of
+    its top-level array fields as soon as each element is complete.
+
+    Used by the planner to surface plan steps while the LLM is still
+    generating the rest of the plan. Leading text such as a ```json fence is
+    ignored; only the first top-level object is considered.
+
+    Example:
+        parser = IncrementalJSONArrayParser("steps")
+        for chunk in llm.stream(messages):
+            for step in parser.feed(chunk.content):
+                ...
+    """
+
+    def __init__(self, array_key: str):
+        self.array_key = array_key
+        self._text = ""
+        self._pos = 0
+        # Stack of open containers: "{" or "["
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string = ""
+        self._last_key = ""
+        self._array_depth = -1
+        self._element_start = -1
+        self._done = False
+        self.emitted = 0
+
+    def feed(self, chunk: str) -> list:
+        """
+        Feed the next chunk of text.
+
+        Args:
+            chunk: Newly streamed text
+
+        Returns:
+            list: Elements of the target array completed by this chunk
+        """
+        if not chunk or self._done:
+            return []
+        self._text += chunk
+        text = self._text
+
+        completed = []
+        while self._pos < len(text):
+            ch = text[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1 : self._pos]
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif ch == ":":
+                # The string just closed is a key of the enclosing object
+                if len(self._stack) == 1:
+                    self._last_key = self._last_string
+            elif ch in "{[":
+                if (
+                    ch == "["
+                    and len(self._stack) == 1
+                    and self._last_key == self.array_key
+                ):
+                    self._array_depth = len(self._stack) + 1
+                elif (
+                    ch == "{"
+                    and self._array_depth != -1
+                    and len(self._stack) == self._array_depth
+                ):
+                    self._element_start = self._pos
+                self._stack.append(ch)
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                if (
+                    ch == "}"
+                    and self._element_start != -1
+                    and (len(self._stack) == self._array_depth)
+                ):
+                    element = self._parse_element(
+                        text[self._element_start : self._pos + 1]
+                    )
+                    if element is not None:
+                        completed.append(element)
+                        self.emitted += 1
+                    self._element_start = -1
+                elif ch == "]" and len(self._stack) == self._array_depth - 1:
+                    self._array_depth = -1
+                if not self._stack:
+                    self._done = True
+                    self._pos += 1
+                    break
+            self._pos += 1
+        return completed
+
+    @staticmethod
+    def _parse_element(raw: str):
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            try:
+                return json_repair.loads(raw)
+            except Exception as e:
+                logger.warning(f"Failed to parse streamed JSON element: {e}")
+                return None
@@ -0,0 +1,116 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one upstream call: the first
+caller runs it, everyone else waits for its result. Exceptions are propagated
+to every waiter. Sync callers (tool threads) and async callers share the same
+in-flight table, so a search started from a worker thread also serves
+coroutines asking for the same key.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into a single call."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """Return the future for a key and whether the caller leads the call."""
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            # A running future cannot be cancelled, so a waiter that is
+            # cancelled (e.g. by a deadline) only stops waiting instead of
+            # cancelling the result every other caller is waiting for
+            future.set_running_or_notify_cancel()
+            self._in_flight[key] = future
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run fn for the key, or wait for the call already in flight."""
+        future, leader = self._join(key)
+        if not leader:
+            logger.debug(f"[{self.name}] 合并重复请求: {key}")
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._finish(key, future)
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of do; fn returns the awaitable to run."""
+        future, leader = self._join(key)
+        if not leader:
+            logger.debug(f"[{self.name}] 合并重复请求: {key}")
+            return await asyncio.wrap_future(future)
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._finish(key, future)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+            }
+
+
+_registry: Dict[str, SingleFlight] = {}
+_registry_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Get the process-wide single-flight group with the given name."""
+    with _registry_lock:
+        group = _registry.get(name)
+        if group is None:
+            group = _registry[name] = SingleFlight(name)
+        return group
+
+
+def get_single_flight_stats() -> Dict[str, dict]:
+    """Return call and coalesced-request counters for every group."""
+    with _registry_lock:
+        groups = list(_registry.values())
+    return {group.name: group.get_stats() for group in groups}
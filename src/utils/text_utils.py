@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Dependency-free tokenization for lexical matching of mixed Chinese/English text.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List
+
+# Latin words and numbers, or runs of CJK characters
+_TERM_RE = re.compile(r"[a-z0-9]+(?:['.][a-z0-9]+)*|[぀-ヿ㐀-䶿一-鿿가-힯]+")
+_CJK_START_RE = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯]")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = {
+    "a",
+    "an",
+    "and",
+    "are",
+    "as",
+    "at",
+    "be",
+    "by",
+    "for",
+    "from",
+    "how",
+    "in",
+    "is",
+    "it",
+    "of",
+    "on",
+    "or",
+    "the",
+    "to",
+    "what",
+    "when",
+    "where",
+    "which",
+    "who",
+    "why",
+    "with",
+    "的",
+    "了",
+    "和",
+    "是",
+    "在",
+    "与",
+    "及",
+    "或",
+}
+
+
+def tokenize(text: str, drop_stopwords: bool = False) -> List[str]:
+    """
+    Split text into lowercase matching terms.
+
+    Latin text is split into words. CJK text has no word boundaries, so each
+    run of CJK characters is split into overlapping character bigrams (a single
+    character stays a unigram), which matches Chinese words without a
+    segmentation dictionary.
+
+    Args:
+        text: The text to tokenize
+        drop_stopwords: Whether to drop common function words
+
+    Returns:
+        The terms in text order
+    """
+    terms = []
+    for match in _TERM_RE.findall((text or "").lower()):
+        if _CJK_START_RE.match(match):
+            if len(match) == 1:
+                terms.append(match)
+            else:
+                terms.extend(match[i : i + 2] for i in range(len(match) - 1))
+        else:
+            terms.append(match)
+    if drop_stopwords:
+        terms = [term for term in terms if term not in STOPWORDS]
+    return terms
+
+
+def bm25_scores(passages: List[str], query: str) -> List[float]:
+    """Score each passage against the query with BM25, using the passages as the corpus."""
+    query_terms = set(tokenize(query, drop_stopwords=True))
+    if not query_terms:
+        return [0.0] * len(passages)
+    docs = [Counter(tokenize(passage)) for passage in passages]
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+    n = len(docs)
+    scores = []
+    for doc, length in zip(docs, lengths):
+        score = 0.0
+        for term in query_terms:
+            tf = doc.get(term, 0)
+            if not tf:
+                continue
+            df = sum(1 for d in docs if term in d)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (avg_length or 1))
+            score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        scores.append(score)
+    return scores
@@ -0,0 +1,57 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Lightweight token estimation that needs no tokenizer download.
+"""
+
+import re
+
+_CJK_RE = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯＀-￯]")
+
+# Average number of non-CJK characters per token for English-like text
+CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text.
+
+    CJK characters count as roughly one token each; everything else is
+    estimated at about four characters per token.
+
+    Args:
+        text: The text to measure
+
+    Returns:
+        The estimated token count
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    other = len(text) - cjk
+    return cjk + int(round(other / CHARS_PER_TOKEN))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = "…") -> str:
+    """
+    Cut text to at most roughly max_tokens estimated tokens.
+
+    Args:
+        text: The text to cut
+        max_tokens: The token budget
+        marker: Appended when text was cut
+
+    Returns:
+        The text itself if it fits, otherwise its longest fitting prefix plus marker
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low].rstrip() + marker
@@ -0,0 +1,71 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+URL helpers shared by the search and crawl tools.
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = {
+    "gclid",
+    "fbclid",
+    "msclkid",
+    "yclid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "ref_src",
+    "spm",
+    "from",
+    "share_token",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonicalize a URL so that trivially different links to one page compare equal.
+
+    The scheme and host are lowercased, "www." and default ports are dropped,
+    http is treated as https, tracking parameters and fragments are removed,
+    the remaining query parameters are sorted and trailing slashes stripped.
+
+    Args:
+        url: The URL to canonicalize
+
+    Returns:
+        The canonical URL, or the stripped input if it is not an http(s) URL
+    """
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key.lower() not in TRACKING_PARAMS
+            and not key.lower().startswith(TRACKING_PREFIXES)
+        )
+    )
+    path = parts.path.rstrip("/") or ""
+    return urlunsplit(("https", host, path, query, ""))
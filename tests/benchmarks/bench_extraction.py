@@ -0,0 +1,82 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Compare article extractors on the saved HTML pages in tests/fixtures/html.
+
+For every extractor this reports the throughput (pages per second, including
+the markdown conversion) and the quality against tests/fixtures/html/expected.json:
+recall is the share of article passages found in the markdown, noise the
+share of boilerplate passages (navigation, ads, footers) that leaked into it.
+
+Usage:
+    uv run python -m tests.benchmarks.bench_extraction [--extractors fast,readability] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from src.crawler.extraction import EXTRACTORS, extract_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures", "html")
+
+
+def load_fixtures():
+    with open(os.path.join(FIXTURES_DIR, "expected.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    pages = {}
+    for name in expected:
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            pages[name] = f.read()
+    return pages, expected
+
+
+def score(markdown: str, expectation: dict) -> tuple:
+    text = " ".join(markdown.replace("\\", "").split())
+    found = sum(1 for passage in expectation["must_contain"] if passage in text)
+    leaked = sum(1 for passage in expectation["must_not_contain"] if passage in text)
+    return (
+        found / len(expectation["must_contain"]),
+        leaked / len(expectation["must_not_contain"]),
+    )
+
+
+def run(extractor: str, pages: dict, expected: dict, repeat: int) -> dict:
+    os.environ["CRAWLER_EXTRACTOR"] = extractor
+    results = {name: extract_page(html) for name, html in pages.items()}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages.values():
+            extract_page(html)
+    elapsed = time.perf_counter() - start
+
+    recalls, noises = zip(
+        *(score(results[name]["markdown"], expected[name]) for name in pages)
+    )
+    return {
+        "pages_per_second": len(pages) * repeat / elapsed,
+        "recall": sum(recalls) / len(recalls),
+        "noise": sum(noises) / len(noises),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--extractors", default=",".join(EXTRACTORS))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages, expected = load_fixtures()
+    print(f"{'extractor':<12} {'pages/s':>10} {'recall':>8} {'noise':>8}")
+    for extractor in args.extractors.split(","):
+        stats = run(extractor.strip(), pages, expected, args.repeat)
+        print(
+            f"{extractor:<12} {stats['pages_per_second']:>10.1f} "
+            f"{stats['recall']:>8.2f} {stats['noise']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1422,4 +1422,6 @@ async def test_researcher_node_without_resources(
     args, kwargs = patch_setup_and_execute_agent_step.call_args
     tools = args[3]
     assert patch_get_web_search_tool.return_value in tools
+    assert any(getattr(t, "name", None) == "web_search_batch" for t in tools)
+    assert any(getattr(t, "name", None) == "crawl_batch" for t in tools)
     assert result == "RESEARCHER_RESULT"
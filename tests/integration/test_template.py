@@ -143,3 +143,93 @@ def test_apply_prompt_template_reporter():
     messages_cn = apply_prompt_template("reporter", test_state_social_media_cn)
     system_content_cn = messages_cn[0]["content"]
     assert "小红书" in system_content_cn
+
+
+def test_template_service_memoizes_variable_free_render():
+    """Test that templates without variables are rendered only once"""
+    from jinja2 import DictLoader, Environment
+
+    from src.prompts.template import TemplateService
+
+    service = TemplateService(Environment(loader=DictLoader({"static.md": "hello"})))
+    service.preload()
+    assert service.render("static.md") == "hello"
+    assert service.render("static.md") == "hello"
+    stats = service.get_stats()["static.md"]
+    assert stats["renders"] == 2
+    assert stats["cache_hits"] == 1
+    assert stats["last_output_size"] == 5
+
+
+def test_template_service_cache_keys_on_referenced_variables():
+    """Test that only variables referenced by the template affect the cache"""
+    from jinja2 import DictLoader, Environment
+
+    from src.prompts.template import TemplateService
+
+    env = Environment(
+        loader=DictLoader(
+            {
+                "main.md": "{{ locale }} {% include 'part.md' %}",
+                "part.md": "{{ style }}",
+            }
+        )
+    )
+    service = TemplateService(env)
+    assert (
+        service.render("main.md", locale="en-US", style="a", messages=[1]) == "en-US a"
+    )
+    assert (
+        service.render("main.md", locale="en-US", style="a", messages=[2]) == "en-US a"
+    )
+    assert service.render("main.md", locale="en-US", style="b") == "en-US b"
+    assert service.render("main.md", locale="zh-CN", style="b") == "zh-CN b"
+    assert service.get_stats()["main.md"]["cache_hits"] == 1
+
+
+def test_get_template_stats_reports_rendered_templates():
+    """Test that stats are exposed for templates rendered through the module API"""
+    from src.prompts.template import get_template_stats
+
+    get_prompt_template("prose/prose_zap")
+    stats = get_template_stats()["prose/prose_zap.md"]
+    assert stats["renders"] >= 1
+    assert stats["max_output_size"] > 0
+
+
+def test_reporter_prompt_only_includes_locale_fragment_for_zh_cn():
+    """Test that zh-CN specific notes are not sent for other locales"""
+    en = apply_prompt_template(
+        "reporter", {"messages": [], "report_style": "academic", "locale": "en-US"}
+    )[0]["content"]
+    zh = apply_prompt_template(
+        "reporter", {"messages": [], "report_style": "academic", "locale": "zh-CN"}
+    )[0]["content"]
+    assert "CRITICAL FOR zh-CN LOCALE" not in en
+    assert "CRITICAL FOR zh-CN LOCALE" in zh
+    assert "文献综述与理论框架" in zh
+    assert "Literature Review & Theoretical Framework" in en
+    assert en.startswith("---\nCURRENT_TIME: ")
+
+
+def test_reporter_prompt_accepts_report_style_enum():
+    """Test that a ReportStyle enum selects the same fragment as its value"""
+    from src.config.report_style import ReportStyle
+    from src.prompts.template import render_reporter_prompt
+
+    assert render_reporter_prompt(
+        ReportStyle.NEWS, "en-US", "now"
+    ) == render_reporter_prompt("news", "en-US", "now")
+    default = render_reporter_prompt(None, "en-US", "now")
+    assert "You are a professional reporter" in default
+
+
+def test_get_reporter_token_report():
+    """Test that the token report covers every style and locale"""
+    from src.config.report_style import ReportStyle
+    from src.prompts.template import get_reporter_token_report
+
+    report = get_reporter_token_report()
+    assert len(report) == len(ReportStyle) * 2
+    for entry in report.values():
+        assert 0 < entry["tokens"] < entry["all_styles_tokens"]
@@ -72,3 +72,36 @@ def test_to_message_handles_empty_html():
     result = article.to_message()
     assert isinstance(result, list)
     assert result[0]["type"] == "text"
+
+
+def test_to_markdown_within_char_budget():
+    article = Article(
+        "Title", "".join(f"<p>Paragraph number {i}.</p>" for i in range(500))
+    )
+
+    result = article.to_markdown(max_chars=100)
+
+    assert result.startswith("# Title\n\nParagraph number 0.")
+    assert len(result) <= 100
+
+
+def test_to_markdown_budget_uses_precomputed_markdown():
+    article = Article("Title", "<p>ignored</p>", markdown_content="cached " * 50)
+
+    result = article.to_markdown(including_title=False, max_chars=20)
+
+    assert result == "cached cached cached"
+
+
+def test_markdown_cut_at_a_limit_is_reconverted_for_larger_budgets():
+    html = "".join(f"<p>Paragraph number {i}.</p>" for i in range(20))
+    article = Article(
+        "Title", html, markdown_content="Paragraph number 0.", markdown_max_chars=20
+    )
+
+    assert (
+        article.to_markdown(including_title=False, max_chars=20)
+        == "Paragraph number 0."
+    )
+    assert "Paragraph number 19." in article.to_markdown(max_chars=1000)
+    assert "Paragraph number 19." in article.to_markdown()
@@ -0,0 +1,88 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+
+import pytest
+
+from src.crawler.cache import CrawlCache, content_hash
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CrawlCache(str(tmp_path / "crawl"), ttl=60)
+
+
+def test_get_returns_none_on_miss(cache):
+    assert cache.get("https://example.com/") is None
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_put_and_get_roundtrip(cache):
+    digest = cache.put("https://example.com/a", "<html>页面</html>", etag='"e"')
+
+    page = cache.get("https://example.com/a")
+
+    assert page.html == "<html>页面</html>"
+    assert page.content_hash == digest == content_hash("<html>页面</html>")
+    assert page.etag == '"e"'
+    assert page.fresh
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_identical_content_is_stored_once(cache, tmp_path):
+    cache.put("https://a.example.com/", "<html>same</html>")
+    cache.put("https://b.example.com/", "<html>same</html>")
+
+    blobs = [f for _, _, files in os.walk(tmp_path / "crawl" / "html") for f in files]
+    assert len(blobs) == 1
+    assert cache.get_stats()["entries"] == 2
+
+
+def test_entries_older_than_ttl_are_stale(cache):
+    cache.ttl = 0
+    cache.put("https://example.com/a", "<html></html>")
+
+    page = cache.get("https://example.com/a")
+
+    assert page is not None and not page.fresh
+    assert cache.get_stats()["stale"] == 1
+
+
+def test_mark_revalidated_refreshes_entry(cache):
+    cache.put("https://example.com/a", "<html></html>", last_modified="Mon")
+    cache.ttl = 0
+    cache.mark_revalidated("https://example.com/a", etag='"new"')
+    cache.ttl = 60
+
+    page = cache.get("https://example.com/a")
+
+    assert page.fresh
+    assert page.etag == '"new"'
+    assert page.last_modified == "Mon"
+
+
+def test_extracted_roundtrip(cache):
+    digest = cache.put("https://example.com/a", "<html></html>")
+    assert cache.get_extracted(digest) is None
+
+    cache.put_extracted(digest, {"title": "T", "html_content": "<p/>", "markdown": "x"})
+
+    assert cache.get_extracted(digest)["markdown"] == "x"
+
+
+def test_eviction_drops_least_recently_used_pages(tmp_path):
+    cache = CrawlCache(str(tmp_path / "crawl"), max_bytes=1)
+    cache.put("https://example.com/old", "<html>old</html>")
+    cache.put("https://example.com/new", "<html>new</html>")
+
+    assert cache.get("https://example.com/old") is None
+    assert cache.get_stats()["evictions"] >= 1
+
+
+def test_index_survives_restart(tmp_path):
+    CrawlCache(str(tmp_path / "crawl")).put("https://example.com/a", "<html>a</html>")
+
+    page = CrawlCache(str(tmp_path / "crawl")).get("https://example.com/a")
+
+    assert page.html == "<html>a</html>"
@@ -4,6 +4,16 @@
 import pytest
 import src.crawler as crawler_module
 from src.crawler import Crawler
+from src.crawler.cache import CrawlCache
+
+
+@pytest.fixture(autouse=True)
+def no_crawl_cache(monkeypatch):
+    monkeypatch.setenv("CRAWL_CACHE_ENABLED", "false")
+    monkeypatch.setenv("CRAWLER_EXTRACT_PROCESSES", "0")
+    monkeypatch.setenv("CRAWLER_BACKEND", "jina")
+    # Revalidation requests must not depend on DNS in unit tests
+    monkeypatch.setenv("CRAWLER_ALLOW_PRIVATE_ADDRESSES", "true")
 
 
 def test_crawler_sets_article_url(monkeypatch):
@@ -70,3 +80,271 @@ def test_crawler_calls_dependencies(monkeypatch):
     assert calls["jina"][1] == "html"
     assert "extractor" in calls
     assert calls["extractor"] == "<html>dummy</html>"
+
+
+@pytest.mark.asyncio
+async def test_acrawl_fetches_async_and_extracts_off_loop(monkeypatch):
+    import threading
+
+    calls = {}
+
+    class DummyJinaClient:
+        def crawl(self, url, return_format=None):
+            raise AssertionError("sync fetch used by acrawl")
+
+        async def acrawl(self, url, return_format=None):
+            calls["jina"] = (url, return_format)
+            return "<html>dummy</html>"
+
+    class DummyReadabilityExtractor:
+        def extract_article(self, html):
+            calls["extract_thread"] = threading.current_thread().name
+
+            class DummyArticle:
+                url = None
+
+            return DummyArticle()
+
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
+    )
+
+    article = await Crawler().acrawl("http://example.com")
+
+    assert article.url == "http://example.com"
+    assert calls["jina"] == ("http://example.com", "html")
+    assert calls["extract_thread"].startswith("crawl-extract")
+
+
+@pytest.fixture
+def crawl_cache(tmp_path, monkeypatch):
+    cache = CrawlCache(str(tmp_path / "crawl"), ttl=60)
+    monkeypatch.setattr("src.crawler.crawler.get_crawl_cache", lambda: cache)
+    return cache
+
+
+class CountingJinaClient:
+    calls = 0
+
+    def crawl(self, url, return_format=None):
+        CountingJinaClient.calls += 1
+        return "<html><body><article><h1>T</h1><p>Body text</p></article></body></html>"
+
+    async def acrawl(self, url, return_format=None):
+        return self.crawl(url, return_format)
+
+
+class CountingExtractor:
+    calls = 0
+
+    def extract_article(self, html):
+        CountingExtractor.calls += 1
+        return crawler_module.Article("Title", "<p>Body <b>text</b></p>")
+
+
+@pytest.fixture
+def counting(monkeypatch):
+    CountingJinaClient.calls = 0
+    CountingExtractor.calls = 0
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", CountingJinaClient)
+    monkeypatch.setattr("src.crawler.crawler.ReadabilityExtractor", CountingExtractor)
+
+
+def test_cache_hit_skips_fetch_and_extraction(crawl_cache, counting):
+    first = Crawler().crawl("https://example.com/a")
+    second = Crawler().crawl("https://example.com/a#section")
+
+    assert CountingJinaClient.calls == 1
+    assert CountingExtractor.calls == 1
+    assert second.url == "https://example.com/a#section"
+    assert second.to_markdown() == first.to_markdown()
+    assert crawl_cache.get_stats()["extraction_hits"] == 1
+
+
+def test_cache_hit_returns_the_whole_page(crawl_cache, monkeypatch):
+    monkeypatch.setenv("CRAWLER_MARKDOWN_MAX_CHARS", "30")
+
+    class LongPageJinaClient:
+        def crawl(self, url, return_format=None):
+            return "<html>long</html>"
+
+    class LongExtractor:
+        def extract_article(self, html):
+            return crawler_module.Article(
+                "Title", "".join(f"<p>Paragraph {i}.</p>" for i in range(20))
+            )
+
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", LongPageJinaClient)
+    monkeypatch.setattr("src.crawler.crawler.ReadabilityExtractor", LongExtractor)
+
+    miss = Crawler().crawl("https://example.com/long")
+    hit = Crawler().crawl("https://example.com/long")
+
+    assert crawl_cache.get_stats()["extraction_hits"] == 1
+    assert "Paragraph 19." in hit.to_markdown()
+    assert hit.to_markdown() == miss.to_markdown()
+
+
+@pytest.mark.asyncio
+async def test_acrawl_uses_cache(crawl_cache, counting):
+    await Crawler().acrawl("https://example.com/a")
+    article = await Crawler().acrawl("https://example.com/a")
+
+    assert CountingJinaClient.calls == 1
+    assert "Body **text**" in article.to_markdown()
+
+
+@pytest.mark.asyncio
+async def test_acrawl_reads_the_cache_off_the_event_loop(
+    crawl_cache, counting, monkeypatch
+):
+    import threading
+
+    threads = []
+    get = crawl_cache.get
+
+    def recording_get(url):
+        threads.append(threading.current_thread())
+        return get(url)
+
+    monkeypatch.setattr(crawl_cache, "get", recording_get)
+
+    await Crawler().acrawl("https://example.com/a")
+
+    assert threads and threading.current_thread() not in threads
+
+
+@pytest.fixture
+def origin(monkeypatch):
+    """The origin server of conditional requests; set origin.response per test."""
+    import httpx
+
+    class Origin:
+        requests = []
+        response = httpx.Response(304, headers={"ETag": '"v1"'})
+
+    def handler(request):
+        Origin.requests.append(request)
+        return Origin.response
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("src.crawler.direct_client.get_http_client", lambda: client)
+    return Origin
+
+
+def test_stale_entry_is_revalidated(crawl_cache, counting, origin):
+    crawl_cache.ttl = 0
+    crawl_cache.put("https://example.com/a", "<html>cached</html>", etag='"v1"')
+
+    article = Crawler().crawl("https://example.com/a")
+
+    assert [r.headers.get("If-None-Match") for r in origin.requests] == ['"v1"']
+    assert article.backend == "cache"
+    assert CountingJinaClient.calls == 0
+    assert crawl_cache.get_stats()["revalidated"] == 1
+
+
+def test_changed_stale_entry_is_downloaded_once(crawl_cache, counting, origin):
+    import httpx
+
+    crawl_cache.ttl = 0
+    crawl_cache.put("https://example.com/a", "<html>cached</html>", etag='"v1"')
+    origin.response = httpx.Response(
+        200,
+        headers={"Content-Type": "text/html", "ETag": '"v2"'},
+        text="<html><body><p>New version</p></body></html>",
+    )
+
+    article = Crawler().crawl("https://example.com/a")
+
+    assert len(origin.requests) == 1
+    assert article.backend == "direct"
+    assert CountingJinaClient.calls == 0
+    assert crawl_cache.get("https://example.com/a").etag == '"v2"'
+
+
+@pytest.mark.asyncio
+async def test_acrawl_revalidates_stale_entry(crawl_cache, counting, monkeypatch):
+    import httpx
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(304)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(
+        "src.crawler.direct_client.get_async_http_client", lambda: client
+    )
+    crawl_cache.ttl = 0
+    crawl_cache.put(
+        "https://example.com/a", "<html>cached</html>", last_modified="Mon, 01 Jan 2024"
+    )
+
+    article = await Crawler().acrawl("https://example.com/a")
+
+    assert requests[0].headers["If-Modified-Since"] == "Mon, 01 Jan 2024"
+    assert article.backend == "cache"
+    assert CountingJinaClient.calls == 0
+
+
+def test_stale_entry_is_served_while_its_host_is_failing(
+    crawl_cache, counting, monkeypatch
+):
+    from src.crawler.limits import CrawlLimiter, DomainSkipped
+
+    limiter = CrawlLimiter(max_concurrency=4, max_per_host=2)
+    for _ in range(3):
+        limiter.record("https://example.com", 5.0, ok=False)
+    monkeypatch.setattr("src.crawler.crawler.get_crawl_limiter", lambda: limiter)
+    crawl_cache.ttl = 0
+    crawl_cache.put(
+        "https://example.com/a", "<html><body><p>Old copy</p></body></html>"
+    )
+
+    article = Crawler().crawl("https://example.com/a")
+
+    assert article.backend == "cache"
+    assert CountingJinaClient.calls == 0
+    with pytest.raises(DomainSkipped):
+        Crawler().crawl("https://example.com/b")
+
+
+def test_jina_failures_do_not_count_against_the_page_host(monkeypatch):
+    import httpx
+
+    from src.crawler.limits import CrawlLimiter
+
+    request = httpx.Request("GET", "https://r.jina.ai/")
+
+    class RateLimitedJinaClient:
+        def crawl(self, url, return_format=None):
+            raise httpx.HTTPStatusError(
+                "429",
+                request=request,
+                response=httpx.Response(429, request=request),
+            )
+
+    limiter = CrawlLimiter(max_concurrency=4, max_per_host=2)
+    monkeypatch.setattr("src.crawler.crawler.get_crawl_limiter", lambda: limiter)
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", RateLimitedJinaClient)
+
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            Crawler().crawl("https://example.com/a")
+
+    stats = limiter.get_domain_stats()
+    assert stats["r.jina.ai"]["error_rate"] == 1.0
+    assert stats["example.com"]["fetches"] == 0
+    limiter.check_domain("https://example.com/b")
+
+
+def test_stale_entry_without_validators_is_refetched(crawl_cache, counting):
+    crawl_cache.ttl = 0
+    crawl_cache.put("https://example.com/a", "<html>cached</html>")
+
+    Crawler().crawl("https://example.com/a")
+
+    assert CountingJinaClient.calls == 1
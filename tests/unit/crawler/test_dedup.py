@@ -0,0 +1,89 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from pathlib import Path
+
+from src.crawler.dedup import (
+    PageIndex,
+    get_page_dedup_stats,
+    get_page_index,
+    hamming_distance,
+    simhash,
+)
+
+FIXTURES = Path(__file__).parents[2] / "fixtures" / "html"
+
+ARTICLE = " ".join(
+    f"Paragraph {i} of the report says that chip exports rose by {i * 3} percent "
+    f"while memory prices in region {i % 7} kept falling through the quarter."
+    for i in range(40)
+)
+OTHER_ARTICLE = " ".join(
+    f"The museum's wing number {i} reopened with {i * 11} restored paintings, "
+    f"drawing visitors from city {i % 5} despite the heavy rain."
+    for i in range(40)
+)
+
+
+def syndicated(text):
+    return (
+        "Reposted from the wire service. Subscribe to our newsletter.\n\n"
+        + text
+        + "\n\nCopyright 2025 Mirror News. Share this story."
+    )
+
+
+def test_near_duplicates_have_close_fingerprints():
+    assert hamming_distance(simhash(ARTICLE), simhash(syndicated(ARTICLE))) <= 6
+    assert hamming_distance(simhash(ARTICLE), simhash(OTHER_ARTICLE)) > 16
+
+
+def test_chinese_text_is_fingerprinted():
+    text = (FIXTURES / "chinese_article.html").read_text(encoding="utf-8")
+
+    assert simhash(text) == simhash(text)
+    assert hamming_distance(simhash(text), simhash(syndicated(text))) <= 6
+
+
+class TestPageIndex:
+    def test_duplicate_reports_the_earlier_url(self):
+        index = PageIndex("run")
+
+        assert index.check("https://a.com/story", ARTICLE) is None
+        assert (
+            index.check("https://b.com/copy", syndicated(ARTICLE))
+            == "https://a.com/story"
+        )
+        assert index.check("https://c.com/other", OTHER_ARTICLE) is None
+        assert index.get_stats() == {
+            "pages": 3,
+            "duplicates": 1,
+            "duplicate_rate": 1 / 3,
+        }
+
+    def test_same_url_and_short_pages_are_never_duplicates(self):
+        index = PageIndex("run")
+        index.check("https://a.com/story", ARTICLE)
+
+        assert index.check("https://a.com/story/", ARTICLE) is None
+        assert index.check("https://b.com", "short") is None
+        assert index.check("https://c.com", "short") is None
+
+    def test_distance_from_env(self, monkeypatch):
+        monkeypatch.setenv("CRAWL_DEDUP_MAX_DISTANCE", "64")
+        index = PageIndex("run")
+        index.check("https://a.com", ARTICLE)
+
+        assert index.check("https://c.com", OTHER_ARTICLE) == "https://a.com"
+
+
+def test_index_requires_a_run(monkeypatch):
+    assert get_page_index(None) is None
+    assert get_page_index("dedup-run") is get_page_index("dedup-run")
+
+    get_page_index("dedup-run").check("https://a.com", ARTICLE)
+    stats = get_page_dedup_stats()
+    assert stats["by_run"]["dedup-run"]["pages"] >= 1
+
+    monkeypatch.setenv("CRAWL_DEDUP_ENABLED", "false")
+    assert get_page_index("dedup-run") is None
@@ -0,0 +1,276 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.crawler import Crawler
+from src.crawler.crawler import get_crawl_backend_stats
+from src.crawler.limits import get_fetch_stats
+from src.crawler.direct_client import (
+    DirectClient,
+    BlockedAddress,
+    FetchError,
+    SkippedContentType,
+    UnsupportedContentType,
+    decode_html,
+    looks_js_rendered,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fixtures", "html")
+
+with open(os.path.join(FIXTURES_DIR, "news_article.html"), "rb") as f:
+    ARTICLE = f.read()
+GBK_PAGE = (
+    '<html><head><meta charset="gbk"><title>标题</title></head>'
+    "<body><p>新能源汽车出口持续增长</p></body></html>"
+).encode("gbk")
+SPA_PAGE = (
+    b'<html><head><title>App</title></head><body><div id="root"></div>'
+    b'<script src="/bundle.js"></script></body></html>'
+)
+
+ROUTES = {
+    "/article": (
+        200,
+        {"Content-Type": "text/html; charset=utf-8", "ETag": '"a1"'},
+        ARTICLE,
+    ),
+    "/gbk": (200, {"Content-Type": "text/html"}, GBK_PAGE),
+    "/spa": (200, {"Content-Type": "text/html"}, SPA_PAGE),
+    "/big": (200, {"Content-Type": "text/html"}, b"<p>" + b"x" * 5000 + b"</p>"),
+    "/pdf": (200, {"Content-Type": "application/pdf"}, b"%PDF-1.4"),
+    "/zip": (200, {"Content-Type": "application/zip"}, b"PK" + b"\0" * 100000),
+    "/utf8-big": (
+        200,
+        {"Content-Type": "text/html"},
+        ("<p>" + "中文" * 2000 + "</p>").encode("utf-8"),
+    ),
+    "/error": (500, {"Content-Type": "text/html"}, b"oops"),
+    "/redirect": (302, {"Location": "/article"}, b""),
+    "/loop": (302, {"Location": "/loop"}, b""),
+    "/metadata": (
+        302,
+        {"Location": "http://169.254.169.254/latest/meta-data/"},
+        b"",
+    ),
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, headers, body = ROUTES.get(self.path, (404, {}, b"not found"))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def local_client(monkeypatch):
+    # A client of our own, so the shared pool is not bound to this test's loop
+    client = httpx.Client(trust_env=False)
+    monkeypatch.setattr("src.crawler.direct_client.get_http_client", lambda: client)
+    monkeypatch.setenv("CRAWL_CACHE_ENABLED", "false")
+    monkeypatch.setenv("CRAWLER_EXTRACT_PROCESSES", "0")
+    monkeypatch.setenv("CRAWLER_EXTRACTOR", "fast")
+    # The fixture server listens on loopback
+    monkeypatch.setenv("CRAWLER_ALLOW_PRIVATE_ADDRESSES", "true")
+    yield
+    client.close()
+
+
+def test_fetches_page_with_validators(server):
+    page = DirectClient().fetch(f"{server}/article")
+
+    assert "Battery manufacturers" in page.html
+    assert page.etag == '"a1"'
+    assert page.backend == "direct"
+
+
+def test_follows_redirects_up_to_limit(server):
+    page = DirectClient().fetch(f"{server}/redirect")
+    assert page.url == f"{server}/article"
+
+    with pytest.raises(FetchError):
+        DirectClient(max_redirects=3).fetch(f"{server}/loop")
+
+
+def test_detects_charset_from_meta_tag(server):
+    page = DirectClient().fetch(f"{server}/gbk")
+
+    assert "新能源汽车出口持续增长" in page.html
+
+
+def test_cuts_body_at_byte_cap(server):
+    before = get_fetch_stats().get("truncated", 0)
+
+    page = DirectClient(max_bytes=1000).fetch(f"{server}/big")
+
+    assert page.truncated
+    assert len(page.html) == 1000
+    assert get_fetch_stats()["truncated"] == before + 1
+
+
+def test_cut_inside_a_character_still_decodes_as_utf8(server):
+    page = DirectClient(max_bytes=1001).fetch(f"{server}/utf8-big")
+
+    assert page.html.startswith("<p>中文中文")
+    assert "\ufffd" not in page.html
+
+
+def test_content_type_allowlist(server):
+    before = get_fetch_stats().get("skipped", 0)
+
+    with pytest.raises(UnsupportedContentType):
+        DirectClient().fetch(f"{server}/pdf")
+    with pytest.raises(SkippedContentType):
+        DirectClient().fetch(f"{server}/zip")
+    with pytest.raises(httpx.HTTPStatusError):
+        DirectClient().fetch(f"{server}/error")
+
+    assert get_fetch_stats()["skipped"] == before + 1
+
+
+@pytest.mark.asyncio
+async def test_afetch(server, monkeypatch):
+    async with httpx.AsyncClient(trust_env=False) as client:
+        monkeypatch.setattr(
+            "src.crawler.direct_client.get_async_http_client", lambda: client
+        )
+        page = await DirectClient().afetch(f"{server}/redirect")
+
+    assert "Battery manufacturers" in page.html
+
+
+def test_decode_html_falls_back_to_gb18030():
+    assert decode_html("中文页面".encode("gbk")) == "中文页面"
+    assert decode_html("héllo".encode("utf-8")) == "héllo"
+
+
+def test_looks_js_rendered():
+    assert looks_js_rendered(SPA_PAGE.decode())
+    assert not looks_js_rendered(ARTICLE.decode())
+
+
+class JinaStub:
+    calls = []
+
+    def crawl(self, url, return_format=None):
+        JinaStub.calls.append(url)
+        return ARTICLE.decode()
+
+
+def test_non_public_addresses_are_refused(server, monkeypatch):
+    monkeypatch.setenv("CRAWLER_ALLOW_PRIVATE_ADDRESSES", "false")
+
+    for url in (
+        f"{server}/article",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://10.0.0.8/admin",
+        "http://[::1]/",
+        "http://[::ffff:127.0.0.1]/",
+        "file:///etc/passwd",
+    ):
+        with pytest.raises(BlockedAddress):
+            DirectClient().fetch(url)
+
+
+def test_redirects_to_non_public_addresses_are_refused(server, monkeypatch):
+    monkeypatch.setenv("CRAWLER_ALLOW_PRIVATE_ADDRESSES", "false")
+    # Only the fixture server counts as public here
+    monkeypatch.setattr(
+        "src.crawler.direct_client.is_public_address",
+        lambda address: address == "127.0.0.1",
+    )
+
+    assert "Battery" in DirectClient().fetch(f"{server}/redirect").html
+    with pytest.raises(BlockedAddress, match="169.254.169.254"):
+        DirectClient().fetch(f"{server}/metadata")
+
+
+@pytest.mark.asyncio
+async def test_async_fetch_refuses_non_public_addresses(server, monkeypatch):
+    monkeypatch.setenv("CRAWLER_ALLOW_PRIVATE_ADDRESSES", "false")
+
+    with pytest.raises(BlockedAddress):
+        await DirectClient().afetch(f"{server}/article")
+
+
+def test_crawler_does_not_send_blocked_urls_to_jina(server, jina, monkeypatch):
+    monkeypatch.setenv("CRAWLER_ALLOW_PRIVATE_ADDRESSES", "false")
+
+    with pytest.raises(BlockedAddress):
+        Crawler().crawl("http://169.254.169.254/latest/meta-data/")
+
+    assert jina.calls == []
+
+
+@pytest.fixture
+def jina(monkeypatch):
+    JinaStub.calls = []
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", JinaStub)
+    return JinaStub
+
+
+def test_crawler_extracts_directly_fetched_page(server, jina):
+    before = get_crawl_backend_stats().get("direct", 0)
+
+    article = Crawler().crawl(f"{server}/article")
+
+    assert article.backend == "direct"
+    assert "Battery manufacturers" in article.to_markdown()
+    assert jina.calls == []
+    assert get_crawl_backend_stats()["direct"] == before + 1
+
+
+@pytest.mark.parametrize(
+    "path, reason",
+    [
+        ("/spa", "js_rendered"),
+        ("/error", "http_500"),
+        ("/pdf", "UnsupportedContentType"),
+    ],
+)
+def test_crawler_falls_back_to_jina(server, jina, path, reason):
+    before = get_crawl_backend_stats().get(f"jina_fallback:{reason}", 0)
+
+    article = Crawler().crawl(f"{server}{path}")
+
+    assert article.backend == "jina"
+    assert jina.calls == [f"{server}{path}"]
+    assert get_crawl_backend_stats()[f"jina_fallback:{reason}"] == before + 1
+
+
+def test_crawler_does_not_send_binaries_to_jina(server, jina):
+    with pytest.raises(SkippedContentType):
+        Crawler().crawl(f"{server}/zip")
+
+    assert jina.calls == []
+
+
+def test_jina_backend_skips_direct_fetch(server, jina, monkeypatch):
+    monkeypatch.setenv("CRAWLER_BACKEND", "jina")
+
+    article = Crawler().crawl(f"{server}/article")
+
+    assert article.backend == "jina"
+    assert jina.calls == [f"{server}/article"]
@@ -0,0 +1,144 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from src.crawler import Article, Crawler
+from src.crawler.extraction import (
+    ExtractionPool,
+    ExtractionTimeout,
+    extract_page,
+    get_extraction_pool,
+    get_extractor_name,
+)
+
+PAGE = (
+    "<html><head><title>Title</title></head><body><article><h1>Title</h1>"
+    "<p>The first paragraph of the article, with enough text to count.</p>"
+    "<p>A second paragraph, also long enough to be scored as content.</p>"
+    "</article></body></html>"
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_extractor(monkeypatch):
+    monkeypatch.setenv("CRAWLER_EXTRACTOR", "fast")
+    monkeypatch.setenv("CRAWL_CACHE_ENABLED", "false")
+    monkeypatch.setenv("CRAWLER_BACKEND", "jina")
+
+
+def test_extractor_name_falls_back_to_readability(monkeypatch):
+    monkeypatch.setenv("CRAWLER_EXTRACTOR", "unknown")
+
+    assert get_extractor_name() == "readability"
+
+
+def test_extract_page_returns_markdown():
+    extracted = extract_page(PAGE)
+
+    assert extracted["title"] == "Title"
+    assert "The first paragraph" in extracted["markdown"]
+    assert not extracted["markdown"].startswith("# Title")
+
+
+def test_extract_page_enforces_cpu_timeout():
+    html = (
+        "<html><body>"
+        + "<div><p>Some words, and more words.</p></div>" * 20000
+        + "</body></html>"
+    )
+
+    with pytest.raises(ExtractionTimeout):
+        extract_page(html, cpu_timeout=0.01)
+
+
+def test_pool_extracts_in_worker_process():
+    pool = ExtractionPool(1)
+    try:
+        extracted = pool.extract(PAGE)
+    finally:
+        pool.shutdown()
+
+    assert "A second paragraph" in extracted["markdown"]
+
+
+def slow_task(html, cpu_timeout):
+    import time
+
+    time.sleep(float(html))
+    return {"title": "T", "html_content": "<p/>", "markdown": html}
+
+
+def test_queue_time_does_not_count_against_the_wall_timeout(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setenv("CRAWLER_EXTRACT_CPU_TIMEOUT", "0.3")
+    pool = ExtractionPool(1)
+    pool._task = slow_task
+    try:
+        # Each page takes 0.6s of the 0.9s limit, so the second one would
+        # time out if its wait for the only worker counted
+        with ThreadPoolExecutor(max_workers=2) as callers:
+            results = list(callers.map(pool.extract, ["0.6", "0.6"]))
+    finally:
+        pool.shutdown()
+
+    assert [r["markdown"] for r in results] == ["0.6", "0.6"]
+    assert pool.timeouts == 0
+
+
+def test_hung_worker_is_replaced(monkeypatch):
+    monkeypatch.setenv("CRAWLER_EXTRACT_CPU_TIMEOUT", "0.1")
+    pool = ExtractionPool(1)
+    pool._task = slow_task
+    try:
+        with pytest.raises(ExtractionTimeout):
+            pool.extract("30")
+        assert pool.timeouts == 1
+
+        assert pool.extract("0")["markdown"] == "0"
+    finally:
+        pool.shutdown()
+
+
+def test_readability_js_is_killed_after_the_timeout(monkeypatch):
+    import subprocess
+
+    monkeypatch.setenv("CRAWLER_EXTRACTOR", "readability")
+    monkeypatch.setattr("src.crawler.readability_extractor.have_node", lambda: True)
+
+    def hanging_node(args, timeout=None, **kwargs):
+        assert timeout == 0.5
+        raise subprocess.TimeoutExpired(args, timeout)
+
+    monkeypatch.setattr(
+        "src.crawler.readability_extractor.subprocess.run", hanging_node
+    )
+
+    with pytest.raises(ExtractionTimeout):
+        extract_page(PAGE, cpu_timeout=0.5)
+
+
+def test_pool_disabled_with_zero_processes(monkeypatch):
+    monkeypatch.setenv("CRAWLER_EXTRACT_PROCESSES", "0")
+
+    assert get_extraction_pool() is None
+
+
+def test_crawler_uses_pool_result(monkeypatch):
+    class DummyPool:
+        def extract(self, html):
+            return {"title": "T", "html_content": "<p>x</p>", "markdown": "from pool"}
+
+    class DummyJinaClient:
+        def crawl(self, url, return_format=None):
+            return PAGE
+
+    monkeypatch.setattr("src.crawler.crawler.get_extraction_pool", lambda: DummyPool())
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+
+    article = Crawler().crawl("https://example.com/")
+
+    assert isinstance(article, Article)
+    assert article.url == "https://example.com/"
+    assert article.to_markdown() == "# T\n\nfrom pool"
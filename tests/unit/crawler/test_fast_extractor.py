@@ -0,0 +1,49 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+
+import pytest
+
+from src.crawler.fast_extractor import FastExtractor
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fixtures", "html")
+
+with open(os.path.join(FIXTURES_DIR, "expected.json"), encoding="utf-8") as f:
+    EXPECTED = json.load(f)
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_extracts_article_without_boilerplate(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        article = FastExtractor().extract_article(f.read())
+
+    text = " ".join(article.to_markdown().replace("\\", "").split())
+    for passage in EXPECTED[name]["must_contain"]:
+        assert passage in text
+    for passage in EXPECTED[name]["must_not_contain"]:
+        assert passage not in text
+
+
+def test_title_prefers_heading_over_site_name():
+    html = (
+        "<html><head><title>Quarterly results | Example Corp</title></head>"
+        "<body><h1>Quarterly results</h1><p>Revenue grew, margins held, and "
+        "guidance was raised for the full year.</p></body></html>"
+    )
+
+    assert FastExtractor().extract_article(html).title == "Quarterly results"
+
+
+def test_title_strips_site_suffix_without_heading():
+    html = "<html><head><title>新能源汽车出口持续增长_财经频道</title></head><body></body></html>"
+
+    assert FastExtractor().extract_article(html).title == "新能源汽车出口持续增长"
+
+
+def test_empty_document():
+    article = FastExtractor().extract_article("")
+
+    assert article.title == ""
+    assert article.to_markdown(including_title=False) == ""
@@ -0,0 +1,55 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import json
+
+import httpx
+import pytest
+
+from src.crawler.jina_client import JinaClient
+
+
+def reader_transport(requests, status=200):
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(status, text="<html>page</html>")
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_acrawl_posts_to_reader_with_timeouts(monkeypatch):
+    requests = []
+    client = httpx.AsyncClient(transport=reader_transport(requests))
+    monkeypatch.setattr("src.crawler.jina_client.get_async_http_client", lambda: client)
+    monkeypatch.setenv("JINA_API_KEY", "jina_test")
+
+    html = await JinaClient().acrawl("https://example.com", return_format="html")
+
+    assert html == "<html>page</html>"
+    request = requests[0]
+    assert json.loads(request.content) == {"url": "https://example.com"}
+    assert request.headers["X-Return-Format"] == "html"
+    assert request.headers["Authorization"] == "Bearer jina_test"
+    assert request.extensions["timeout"]["connect"] == 10.0
+
+
+def test_crawl_raises_on_http_error(monkeypatch):
+    client = httpx.Client(transport=reader_transport([], status=502))
+    monkeypatch.setattr("src.crawler.jina_client.get_http_client", lambda: client)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        JinaClient().crawl("https://example.com")
+
+
+def test_crawl_caps_response_size(monkeypatch):
+    def handler(request):
+        return httpx.Response(200, text="<p>" + "x" * 10000 + "</p>")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("src.crawler.jina_client.get_http_client", lambda: client)
+    monkeypatch.setenv("CRAWLER_MAX_PAGE_BYTES", "500")
+
+    html = JinaClient().crawl("https://example.com")
+
+    assert len(html) == 500
@@ -0,0 +1,293 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.crawler.limits import (
+    CrawlLimiter,
+    DomainSkipped,
+    aread_capped,
+    get_crawl_timeout,
+    host_of,
+    read_capped,
+)
+
+
+async def run_fetches(limiter, urls):
+    active = {"all": 0, "max_all": 0}
+    per_host = {}
+
+    async def fetch(url):
+        host = host_of(url)
+        async with limiter.limit(url):
+            active["all"] += 1
+            per_host[host] = per_host.get(host, 0) + 1
+            active["max_all"] = max(active["max_all"], active["all"])
+            active[host] = max(active.get(host, 0), per_host[host])
+            await asyncio.sleep(0.02)
+            active["all"] -= 1
+            per_host[host] -= 1
+
+    await asyncio.gather(*(fetch(url) for url in urls))
+    return active
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit():
+    limiter = CrawlLimiter(max_concurrency=10, max_per_host=2)
+
+    active = await run_fetches(limiter, [f"https://a.com/{i}" for i in range(6)])
+
+    assert active["a.com"] == 2
+
+
+@pytest.mark.asyncio
+async def test_global_limit_across_hosts():
+    limiter = CrawlLimiter(max_concurrency=3, max_per_host=2)
+    urls = [f"https://host{i}.com/page" for i in range(8)]
+
+    active = await run_fetches(limiter, urls)
+
+    assert active["max_all"] == 3
+
+
+def test_limiter_works_across_event_loops():
+    limiter = CrawlLimiter(max_concurrency=2, max_per_host=1)
+
+    for _ in range(2):
+        asyncio.run(run_fetches(limiter, ["https://a.com/1", "https://b.com/1"]))
+
+
+def test_sync_limit():
+    limiter = CrawlLimiter(max_concurrency=1, max_per_host=1)
+
+    with limiter.limit_sync("https://a.com"):
+        assert not limiter._thread_global.acquire(blocking=False)
+    assert limiter._thread_global.acquire(blocking=False)
+
+
+def test_timeouts_from_env(monkeypatch):
+    monkeypatch.setenv("CRAWLER_CONNECT_TIMEOUT", "3")
+    monkeypatch.setenv("CRAWLER_READ_TIMEOUT", "12")
+
+    timeout = get_crawl_timeout()
+
+    assert timeout.connect == 3.0
+    assert timeout.read == 12.0
+
+
+REQUEST = httpx.Request("GET", "https://a.com/page")
+
+
+def chunked_response(chunks):
+    pulled = []
+
+    def stream():
+        for chunk in chunks:
+            pulled.append(chunk)
+            yield chunk
+
+    return httpx.Response(200, content=stream(), request=REQUEST), pulled
+
+
+def test_read_capped_stops_streaming_at_cap():
+    response, pulled = chunked_response([b"a" * 100] * 10)
+
+    content, truncated = read_capped(response, 250)
+
+    assert content == b"a" * 250
+    assert truncated
+    assert len(pulled) == 3
+
+
+def test_read_capped_under_cap():
+    response, _ = chunked_response([b"abc", b"def"])
+
+    assert read_capped(response, 100) == (b"abcdef", False)
+
+
+@pytest.mark.asyncio
+async def test_aread_capped_stops_streaming_at_cap():
+    pulled = []
+
+    async def stream():
+        for _ in range(10):
+            pulled.append(1)
+            yield b"a" * 100
+
+    response = httpx.Response(200, content=stream(), request=REQUEST)
+
+    content, truncated = await aread_capped(response, 150)
+
+    assert content == b"a" * 150
+    assert truncated
+    assert len(pulled) == 2
+
+
+def test_fetches_to_one_host_are_spaced():
+    limiter = CrawlLimiter(max_concurrency=4, max_per_host=4, min_interval=0.05)
+    starts = []
+
+    for _ in range(3):
+        with limiter.limit_sync("https://a.com/page"):
+            starts.append(time.monotonic())
+    with limiter.limit_sync("https://b.com/page"):
+        other_host = time.monotonic()
+
+    assert starts[1] - starts[0] >= 0.045
+    assert starts[2] - starts[1] >= 0.045
+    assert other_host - starts[2] < 0.04
+
+
+def fail(limiter, url, error):
+    with pytest.raises(type(error)):
+        with limiter.limit_sync(url):
+            raise error
+
+
+def test_failing_host_is_skipped_until_cooldown():
+    limiter = CrawlLimiter(max_concurrency=4, max_per_host=2, cooldown=60)
+    for _ in range(3):
+        fail(limiter, "https://down.com/x", httpx.ConnectError("refused"))
+
+    with pytest.raises(DomainSkipped, match="Use another source"):
+        with limiter.limit_sync("https://down.com/y"):
+            pass
+    with limiter.limit_sync("https://up.com/y"):
+        pass
+
+    limiter.cooldown = 0
+    with limiter.limit_sync("https://down.com/y"):
+        pass
+    assert limiter.get_domain_stats()["down.com"]["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_limit_skips_failing_host():
+    limiter = CrawlLimiter(max_concurrency=4, max_per_host=2)
+    for _ in range(3):
+        limiter.record("https://down.com", 5.0, ok=False)
+
+    with pytest.raises(DomainSkipped):
+        async with limiter.limit("https://down.com/page"):
+            pass
+
+
+def test_page_errors_do_not_count_against_host():
+    limiter = CrawlLimiter(max_concurrency=4, max_per_host=2)
+    error = httpx.HTTPStatusError(
+        "404", request=REQUEST, response=httpx.Response(404, request=REQUEST)
+    )
+    for _ in range(3):
+        fail(limiter, "https://a.com/missing", error)
+
+    with limiter.limit_sync("https://a.com/page"):
+        pass
+    assert limiter.get_domain_stats()["a.com"]["error_rate"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_fetches_do_not_count_against_host():
+    limiter = CrawlLimiter(max_concurrency=4, max_per_host=2)
+
+    async def fetch():
+        async with limiter.limit("https://a.com/page"):
+            await asyncio.sleep(1)
+
+    for _ in range(3):
+        task = asyncio.ensure_future(fetch())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert limiter.get_domain_stats()["a.com"]["error_rate"] == 0.0
+    async with limiter.limit("https://a.com/page"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_cancelled_slow_fetch_records_no_sample():
+    limiter = CrawlLimiter(max_concurrency=4, max_per_host=2, slow_seconds=10)
+    for _ in range(3):
+        limiter.record("https://slow.com", 25.0, ok=True)
+
+    async def fetch():
+        async with limiter.limit("https://slow.com/page"):
+            await asyncio.sleep(1)
+
+    task = asyncio.ensure_future(fetch())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    stats = limiter.get_domain_stats()["slow.com"]
+    assert stats["fetches"] == 3
+    assert stats["slow"]
+
+
+def test_forgotten_hosts_take_their_semaphores_along(monkeypatch):
+    monkeypatch.setattr("src.crawler.limits.MAX_TRACKED_DOMAINS", 3)
+    limiter = CrawlLimiter(max_concurrency=8, max_per_host=1)
+
+    with limiter.limit_sync("https://busy.com/page"):
+        for i in range(5):
+            with limiter.limit_sync(f"https://site{i}.com/page"):
+                pass
+        # A host with a fetch under way is kept, with its semaphore
+        assert "busy.com" in limiter._domains
+        with limiter.try_limit_sync("https://busy.com/other") as acquired:
+            assert not acquired
+
+    assert len(limiter._domains) == 3
+    assert "site0.com" not in limiter._domains
+
+
+def test_slow_host_gets_shorter_read_timeout(monkeypatch):
+    limiter = CrawlLimiter(max_concurrency=4, max_per_host=2, slow_seconds=10)
+    monkeypatch.setattr("src.crawler.limits.get_crawl_limiter", lambda: limiter)
+    for _ in range(3):
+        limiter.record("https://slow.com", 25.0, ok=True)
+
+    assert get_crawl_timeout("https://slow.com/page").read == 10.0
+    assert get_crawl_timeout("https://fast.com/page").read == 30.0
+    assert limiter.get_domain_stats()["slow.com"]["slow"]
+    with limiter.try_limit_sync("https://slow.com/page") as acquired:
+        assert not acquired
+
+
+@pytest.mark.asyncio
+async def test_try_limit_sync_yields_to_async_crawls():
+    limiter = CrawlLimiter(max_concurrency=2, max_per_host=2)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def crawl(url):
+        async with limiter.limit(url):
+            started.set()
+            await release.wait()
+
+    task = asyncio.ensure_future(crawl("https://a.com/page"))
+    await started.wait()
+    # The host has a free slot, but an async crawl is using it
+    with limiter.try_limit_sync("https://a.com/other") as acquired:
+        assert not acquired
+    with limiter.try_limit_sync("https://b.com/page") as acquired:
+        assert acquired
+
+    started.clear()
+    other = asyncio.ensure_future(crawl("https://c.com/page"))
+    await started.wait()
+    # Both crawl slots are in use by async crawls
+    with limiter.try_limit_sync("https://b.com/page") as acquired:
+        assert not acquired
+
+    release.set()
+    await asyncio.gather(task, other)
+    with limiter.try_limit_sync("https://a.com/other") as acquired:
+        assert acquired
@@ -0,0 +1,80 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+
+import pytest
+from markdownify import markdownify as md
+
+import src.crawler.markdown as markdown_module
+from src.crawler.fast_extractor import FastExtractor
+from src.crawler.markdown import html_to_markdown
+from src.utils.token_utils import estimate_tokens
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fixtures", "html")
+
+LONG_ARTICLE = (
+    "".join(
+        f"<h2>Section {i}</h2><p>Paragraph {i} talks about topic number {i} in some detail.</p>"
+        for i in range(1000)
+    )
+    + "<h2>Solar</h2><p>Photovoltaic panel efficiency reached a new record this year.</p>"
+)
+
+
+@pytest.mark.parametrize(
+    "name", ["news_article.html", "chinese_article.html", "docs_page.html"]
+)
+def test_unbounded_conversion_matches_markdownify(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        html = FastExtractor().extract_article(f.read()).html_content
+
+    assert html_to_markdown(html) == md(html).strip()
+
+
+def test_inline_content_stays_in_one_paragraph():
+    html = "<div>Hello <b>world</b>!<p>Para <a href='x'>link</a>.</p>tail</div>"
+
+    assert html_to_markdown(html) == "Hello **world**!\n\nPara [link](x).\n\ntail"
+
+
+def test_stops_at_char_budget_without_converting_the_rest(monkeypatch):
+    calls = []
+    original = markdown_module._block_markdown
+
+    def counting(converter, block):
+        calls.append(block)
+        return original(converter, block)
+
+    monkeypatch.setattr(markdown_module, "_block_markdown", counting)
+
+    result = html_to_markdown(LONG_ARTICLE, max_chars=300)
+
+    assert len(result) <= 300
+    assert result.startswith("Section 0\n---------")
+    assert len(calls) < 20
+
+
+def test_stops_at_token_budget():
+    result = html_to_markdown(LONG_ARTICLE, max_tokens=100)
+
+    assert 80 <= estimate_tokens(result) <= 100
+
+
+def test_query_prioritizes_matching_section_with_its_heading():
+    result = html_to_markdown(
+        LONG_ARTICLE, max_chars=400, query="photovoltaic efficiency"
+    )
+
+    assert "Solar\n-----" in result
+    assert "Photovoltaic panel efficiency" in result
+    assert len(result) <= 400
+
+
+def test_query_without_budget_converts_everything_in_order():
+    html = "<p>First paragraph.</p><p>Second paragraph about solar.</p>"
+
+    assert (
+        html_to_markdown(html, query="solar")
+        == "First paragraph.\n\nSecond paragraph about solar."
+    )
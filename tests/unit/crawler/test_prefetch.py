@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import time
+
+import pytest
+
+from src.crawler import Crawler
+from src.crawler.cache import CrawlCache
+from src.crawler.direct_client import FetchedPage
+from src.crawler.limits import CrawlLimiter
+from src.crawler.prefetch import Prefetcher, get_prefetcher, schedule_prefetch
+
+PAGE = "<html><body><article><p>{}</p></article></body></html>"
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = CrawlCache(str(tmp_path))
+    monkeypatch.setenv("CRAWLER_EXTRACT_PROCESSES", "0")
+    monkeypatch.setenv("CRAWLER_EXTRACTOR", "fast")
+    monkeypatch.setattr("src.crawler.prefetch.get_crawl_cache", lambda: cache)
+    monkeypatch.setattr(
+        "src.crawler.prefetch.get_crawl_limiter", lambda: CrawlLimiter(8, 2)
+    )
+    return cache
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return FetchedPage(url=url, html=PAGE.format("x" * 1000))
+
+    monkeypatch.setattr(Crawler, "_fetch", staticmethod(fetch))
+    return fetched
+
+
+def wait_idle(prefetcher):
+    deadline = time.monotonic() + 5
+    while prefetcher.get_stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_prefetched_pages_land_in_the_cache(cache, fetches):
+    prefetcher = Prefetcher()
+
+    assert prefetcher.schedule(["https://a.com/1", "https://b.com/2"], "run") == 2
+    wait_idle(prefetcher)
+
+    assert cache.is_fresh("https://a.com/1")
+    assert cache.is_fresh("https://b.com/2")
+    assert prefetcher.record_crawl("https://a.com/1", from_cache=True)
+    assert not prefetcher.record_crawl("https://a.com/1", from_cache=True)
+    stats = prefetcher.get_stats()
+    assert stats["prefetched"] == 2
+    assert stats["hits"] == 1
+    assert stats["hit_ratio"] == 0.5
+    assert stats["waste_ratio"] == 0.5
+    assert stats["wasted_bytes"] == stats["bytes"] // 2
+
+
+def test_cached_and_repeated_urls_are_not_fetched(cache, fetches):
+    cache.put("https://a.com/1", PAGE.format("cached"))
+    prefetcher = Prefetcher()
+
+    prefetcher.schedule(
+        ["https://a.com/1", "https://b.com/2", "https://b.com/2/"], "run"
+    )
+    wait_idle(prefetcher)
+
+    assert fetches == ["https://b.com/2"]
+    assert prefetcher.get_stats()["skipped_cached"] == 1
+
+
+def test_run_byte_budget(cache, fetches):
+    prefetcher = Prefetcher(workers=1, max_bytes=100)
+
+    prefetcher.schedule(["https://a.com/1"], "run")
+    wait_idle(prefetcher)
+
+    assert prefetcher.schedule(["https://b.com/2"], "run") == 0
+    assert prefetcher.schedule(["https://b.com/2"], "other-run") == 1
+    wait_idle(prefetcher)
+    assert fetches == ["https://a.com/1", "https://b.com/2"]
+
+
+def test_busy_hosts_are_skipped(cache, fetches, monkeypatch):
+    limiter = CrawlLimiter(8, 1)
+    monkeypatch.setattr("src.crawler.prefetch.get_crawl_limiter", lambda: limiter)
+    prefetcher = Prefetcher()
+
+    with limiter.limit_sync("https://a.com/other"):
+        prefetcher.schedule(["https://a.com/1"], "run")
+        wait_idle(prefetcher)
+
+    assert fetches == []
+    assert prefetcher.get_stats()["skipped_busy"] == 1
+
+
+def test_prefetch_is_opt_in(monkeypatch):
+    assert get_prefetcher() is None
+    assert schedule_prefetch(["https://a.com"], "run") == 0
+
+    monkeypatch.setenv("CRAWL_PREFETCH_ENABLED", "true")
+    assert get_prefetcher() is get_prefetcher()
+    assert schedule_prefetch(["https://a.com"], None) == 0
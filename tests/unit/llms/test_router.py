@@ -0,0 +1,140 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import uuid
+
+import pytest
+
+from src.llms import router as router_mod
+from src.llms.router import (
+    ModelRouter,
+    ModelStatsCallbackHandler,
+    normalized_latency,
+)
+
+
+@pytest.fixture
+def configured(monkeypatch):
+    types = {"basic", "fast"}
+    monkeypatch.setattr(
+        "src.llms.llm.is_llm_type_configured", lambda llm_type: llm_type in types
+    )
+    return types
+
+
+def test_select_prefers_configured_candidate(configured):
+    router = ModelRouter()
+    assert router.select("fast") == "fast"
+    assert router.select("strong") == "basic"
+
+
+def test_select_falls_back_to_next_tier(configured):
+    router = ModelRouter(
+        tier_candidates={"strong": ["reasoning"], "balanced": ["basic"]}
+    )
+    assert router.select("strong") == "basic"
+
+
+def test_select_returns_default_when_nothing_configured(monkeypatch):
+    monkeypatch.setattr("src.llms.llm.is_llm_type_configured", lambda llm_type: False)
+    router = ModelRouter()
+    assert router.select("fast", default="basic") == "basic"
+
+
+def test_fast_tier_picks_lowest_latency(configured):
+    router = ModelRouter(tier_candidates={"fast": ["fast", "basic"]})
+    router.record("fast", 3.0, True)
+    router.record("basic", 0.5, True)
+    assert router.select("fast") == "basic"
+
+
+def test_strong_tier_keeps_preference_order(configured):
+    router = ModelRouter(tier_candidates={"strong": ["fast", "basic"]})
+    router.record("fast", 3.0, True)
+    router.record("basic", 0.5, True)
+    assert router.select("strong") == "fast"
+
+
+def test_unhealthy_model_is_skipped(configured):
+    router = ModelRouter(tier_candidates={"fast": ["fast", "basic"]})
+    router.record("basic", 5.0, True)
+    for _ in range(5):
+        router.record("fast", 0.1, False)
+    assert router.get_stats()["fast"]["healthy"] is False
+    assert router.select("fast") == "basic"
+
+
+def test_all_unhealthy_still_returns_configured(configured):
+    router = ModelRouter(
+        tier_candidates={"fast": ["fast"], "balanced": [], "strong": []}
+    )
+    for _ in range(5):
+        router.record("fast", 0.1, False)
+    assert router.select("fast", default="basic") == "fast"
+
+
+def test_callback_handler_records_latency_and_errors():
+    router = ModelRouter()
+    handler = ModelStatsCallbackHandler("basic", router=router)
+    ok, failed = uuid.uuid4(), uuid.uuid4()
+    handler.on_chat_model_start({}, [[]], run_id=ok)
+    handler.on_llm_end(None, run_id=ok)
+    handler.on_llm_start({}, [""], run_id=failed)
+    handler.on_llm_error(RuntimeError("boom"), run_id=failed)
+    stats = router.get_stats()["basic"]
+    assert stats["calls"] == 2
+    assert stats["errors"] == 1
+    assert stats["ewma_latency"] is not None
+
+
+def test_long_replies_are_scaled_to_the_reference_length():
+    assert normalized_latency(2.0, 100) == 2.0
+    assert normalized_latency(40.0, 4096) == 2.5
+    assert normalized_latency(41.0, 4096, first_token=1.0) == 3.5
+
+
+def fake_call(handler, seconds, output_tokens, monkeypatch):
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, LLMResult
+
+    clock = iter([0.0, seconds])
+    monkeypatch.setattr(router_mod.time, "monotonic", lambda: next(clock))
+    message = AIMessage(
+        content="x",
+        usage_metadata={
+            "input_tokens": 10,
+            "output_tokens": output_tokens,
+            "total_tokens": 10 + output_tokens,
+        },
+    )
+    run_id = uuid.uuid4()
+    handler.on_chat_model_start({}, [[]], run_id=run_id)
+    handler.on_llm_end(
+        LLMResult(generations=[[ChatGeneration(message=message)]]), run_id=run_id
+    )
+
+
+def test_long_generations_do_not_flip_the_fast_tier(configured, monkeypatch):
+    router = ModelRouter(tier_candidates={"fast": ["fast", "basic"]})
+    fast = ModelStatsCallbackHandler("fast", router=router)
+    basic = ModelStatsCallbackHandler("basic", router=router)
+    for _ in range(3):
+        fake_call(fast, 2.0, 100, monkeypatch)
+        fake_call(basic, 3.0, 100, monkeypatch)
+    assert router.select("fast") == "fast"
+
+    # The reporter's long reports on "fast" take long, but not per token
+    for _ in range(3):
+        fake_call(fast, 60.0, 8000, monkeypatch)
+    assert router.select("fast") == "fast"
+
+
+def test_get_agent_llm_type_uses_static_map_without_tier(monkeypatch):
+    monkeypatch.setattr(router_mod, "AGENT_LLM_TIER", {})
+    assert router_mod.get_agent_llm_type("reporter") == "basic"
+
+
+def test_get_agent_llm_type_routes_by_tier(monkeypatch, configured):
+    monkeypatch.setattr(router_mod, "_router", ModelRouter())
+    assert router_mod.get_agent_llm_type("coordinator") == "fast"
+    assert router_mod.get_agent_llm_type("reporter") == "basic"
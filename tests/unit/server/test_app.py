@@ -328,6 +328,45 @@ class TestMCPEndpoint:
         assert response.json()["detail"] == "Internal Server Error"
 
 
+class TestPromptStatsEndpoint:
+    @patch("src.server.app.get_template_stats")
+    def test_prompt_stats(self, mock_stats, client):
+        mock_stats.return_value = {"coder.md": {"renders": 1, "cache_hits": 0}}
+
+        response = client.get("/api/prompts/stats")
+
+        assert response.status_code == 200
+        assert response.json()["coder.md"]["renders"] == 1
+
+
+class TestCrawlStatsEndpoint:
+    @patch("src.server.app.get_crawl_cache_stats")
+    def test_crawl_stats(self, mock_stats, client):
+        mock_stats.return_value = {"enabled": True, "hits": 3}
+
+        response = client.get("/api/crawl/stats")
+
+        assert response.status_code == 200
+        assert response.json()["cache"]["hits"] == 3
+
+
+class TestHealthEndpoint:
+    @patch("src.server.app.get_circuit_breaker_states")
+    def test_health_reports_open_breakers(self, mock_states, client):
+        mock_states.return_value = {
+            "tavily": {"state": "open", "health_score": 0.0},
+            "duckduckgo": {"state": "closed", "health_score": 1.0},
+        }
+
+        response = client.get("/api/health")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert data["search_engines"]["tavily"]["state"] == "open"
+        assert data["skipped_search_engines"] == ["tavily"]
+
+
 class TestRAGEndpoints:
     @patch("src.server.app.SELECTED_RAG_PROVIDER", "test_provider")
     def test_rag_config(self, client):
@@ -512,6 +551,42 @@ class TestAstreamWorkflowGenerator:
         assert "Plan requires approval" in events[0]
         assert "interrupt_id" in events[0]
 
+    @pytest.mark.asyncio
+    @patch("src.server.app.graph")
+    async def test_astream_workflow_generator_plan_step_event(self, mock_graph):
+        step = {"title": "Step 1", "description": "desc", "step_type": "research"}
+
+        async def mock_astream(*args, **kwargs):
+            assert "custom" in kwargs["stream_mode"]
+            yield ((), "custom", {"type": "plan_step", "index": 0, "step": step})
+            yield ((), "custom", {"type": "unknown"})
+
+        mock_graph.astream = mock_astream
+
+        generator = _astream_workflow_generator(
+            messages=[],
+            thread_id="test_thread",
+            resources=[],
+            max_plan_iterations=3,
+            max_step_num=10,
+            max_search_results=5,
+            auto_accepted_plan=True,
+            interrupt_feedback="",
+            mcp_settings={},
+            enable_background_investigation=False,
+            report_style=ReportStyle.ACADEMIC,
+            enable_deep_thinking=False,
+        )
+
+        events = []
+        async for event in generator:
+            events.append(event)
+
+        assert len(events) == 1
+        assert "event: plan_step" in events[0]
+        assert '"agent": "planner"' in events[0]
+        assert "Step 1" in events[0]
+
     @pytest.mark.asyncio
     @patch("src.server.app.graph")
     async def test_astream_workflow_generator_tool_message(self, mock_graph):
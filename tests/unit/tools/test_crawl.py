@@ -108,3 +108,218 @@ class TestCrawlTool:
         assert "Failed to crawl" in result
         assert "Markdown conversion error" in result
         mock_logger.error.assert_called_once()
+
+
+class TestAsyncCrawlTool:
+    @pytest.mark.asyncio
+    @patch("src.tools.crawl.Crawler")
+    async def test_ainvoke_uses_async_crawler(self, mock_crawler_class):
+        from unittest.mock import AsyncMock
+
+        mock_article = Mock()
+        mock_article.to_markdown.return_value = "# Async article"
+        mock_crawler = mock_crawler_class.return_value
+        mock_crawler.acrawl = AsyncMock(return_value=mock_article)
+
+        result = await crawl_tool.ainvoke({"url": "https://example.com/async"})
+
+        assert result == "URL: https://example.com/async\n\nContent:\n# Async article"
+        mock_crawler.acrawl.assert_awaited_once_with("https://example.com/async")
+        mock_crawler.crawl.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("src.tools.crawl.Crawler")
+    async def test_query_and_budget_reach_markdown_conversion(self, mock_crawler_class):
+        from unittest.mock import AsyncMock
+
+        mock_article = Mock()
+        mock_article.to_markdown.return_value = "# Relevant part"
+        mock_crawler_class.return_value.acrawl = AsyncMock(return_value=mock_article)
+
+        await crawl_tool.ainvoke(
+            {"url": "https://example.com/long", "query": "battery recycling"}
+        )
+
+        mock_article.to_markdown.assert_called_once_with(
+            max_chars=5000, query="battery recycling"
+        )
+
+    @pytest.mark.asyncio
+    @patch("src.tools.crawl.Crawler")
+    async def test_mirror_of_an_earlier_page_returns_a_stub(self, mock_crawler_class):
+        from unittest.mock import AsyncMock
+
+        article = " ".join(f"Sentence {i} about battery recycling." for i in range(60))
+        mock_article = Mock()
+        mock_article.to_markdown.return_value = article
+        mock_crawler_class.return_value.acrawl = AsyncMock(return_value=mock_article)
+        config = {"configurable": {"thread_id": "crawl-tool-dedup-run"}}
+
+        first = await crawl_tool.ainvoke({"url": "https://a.com/news"}, config=config)
+        mirror = await crawl_tool.ainvoke({"url": "https://b.com/news"}, config=config)
+
+        assert first.endswith(article)
+        assert mirror.startswith(
+            "URL: https://b.com/news\n\nContent: [Duplicate of https://a.com/news"
+        )
+
+    @pytest.mark.asyncio
+    @patch("src.tools.crawl.Crawler")
+    async def test_mirror_in_a_later_research_run_is_returned_in_full(
+        self, mock_crawler_class
+    ):
+        from unittest.mock import AsyncMock
+
+        from src.tools.query_memo import start_research_run
+
+        article = " ".join(f"Sentence {i} about solar subsidies." for i in range(60))
+        mock_article = Mock()
+        mock_article.to_markdown.return_value = article
+        mock_crawler_class.return_value.acrawl = AsyncMock(return_value=mock_article)
+        config = {"configurable": {"thread_id": "crawl-tool-dedup-thread"}}
+
+        await crawl_tool.ainvoke({"url": "https://a.com/solar"}, config=config)
+        start_research_run("crawl-tool-dedup-thread")
+        mirror = await crawl_tool.ainvoke({"url": "https://b.com/solar"}, config=config)
+
+        assert mirror.endswith(article)
+
+    @pytest.mark.asyncio
+    @patch("src.tools.crawl.Crawler")
+    @patch("src.tools.crawl.logger")
+    async def test_ainvoke_reports_errors(self, mock_logger, mock_crawler_class):
+        from unittest.mock import AsyncMock
+
+        mock_crawler_class.return_value.acrawl = AsyncMock(
+            side_effect=Exception("Timeout")
+        )
+
+        result = await crawl_tool.ainvoke({"url": "https://example.com/slow"})
+
+        assert "Failed to crawl" in result
+        assert "Timeout" in result
+        mock_logger.error.assert_called_once()
+
+
+class TestCrawlBatchTool:
+    @pytest.fixture
+    def pages(self):
+        with patch("src.tools.crawl._acrawl_markdown") as mock:
+            yield mock
+
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order_and_report_failures(self, pages):
+        import asyncio
+
+        from src.tools.crawl import crawl_batch_tool
+
+        async def fetch(url, *args):
+            if "broken" in url:
+                raise Exception("HTTP 502")
+            await asyncio.sleep(0.05 if url.endswith("/slow") else 0)
+            return f"# Page {url}"
+
+        pages.side_effect = fetch
+
+        result = await crawl_batch_tool.ainvoke(
+            {
+                "urls": [
+                    "https://a.com/slow",
+                    "https://b.com/broken",
+                    "https://c.com",
+                    "https://www.c.com/",
+                ]
+            }
+        )
+
+        sections = result.split("\n\n---\n\n")
+        assert len(sections) == 3
+        assert (
+            sections[0]
+            == "URL: https://a.com/slow\n\nContent:\n# Page https://a.com/slow"
+        )
+        assert "Failed to crawl https://b.com/broken" in sections[1]
+        assert "HTTP 502" in sections[1]
+        assert sections[2].startswith("URL: https://c.com\n")
+
+    @pytest.mark.asyncio
+    async def test_pages_share_a_token_budget(self, pages, monkeypatch):
+        from src.tools.crawl import crawl_batch_tool
+        from src.utils.token_utils import estimate_tokens
+
+        monkeypatch.setenv("CRAWL_BATCH_MAX_TOKENS", "300")
+        texts = {
+            "https://short.com": "short page",
+            "https://long1.com": "word " * 2000,
+            "https://long2.com": "text " * 2000,
+        }
+
+        async def fetch(url, *args):
+            return texts[url]
+
+        pages.side_effect = fetch
+
+        result = await crawl_batch_tool.ainvoke({"urls": list(texts)})
+
+        sections = result.split("\n\n---\n\n")
+        assert sections[0].endswith("short page")
+        assert "[...truncated]" in sections[1]
+        assert estimate_tokens(result) < 400
+
+    @pytest.mark.asyncio
+    async def test_url_count_is_capped(self, pages, monkeypatch):
+        from src.tools.crawl import crawl_batch_tool
+
+        monkeypatch.setenv("CRAWL_BATCH_MAX_URLS", "2")
+
+        async def fetch(url, *args):
+            return "content"
+
+        pages.side_effect = fetch
+
+        result = await crawl_batch_tool.ainvoke(
+            {"urls": ["https://a.com", "https://b.com", "https://c.com"]}
+        )
+
+        assert result.count("URL: ") == 2
+
+    @pytest.mark.asyncio
+    async def test_near_duplicates_in_a_run_return_a_stub(self, pages):
+        from src.tools.crawl import crawl_batch_tool
+
+        article = " ".join(
+            f"Sentence {i} about chip exports and prices." for i in range(60)
+        )
+        texts = {
+            "https://a.com/story": article,
+            "https://mirror.com/story": "Reposted. " + article,
+            "https://b.com": " ".join(
+                f"Museum wing {i} reopened today." for i in range(80)
+            ),
+        }
+
+        async def fetch(url, *args):
+            return texts[url]
+
+        pages.side_effect = fetch
+        config = {"configurable": {"thread_id": "crawl-dedup-run"}}
+
+        result = await crawl_batch_tool.ainvoke({"urls": list(texts)}, config=config)
+        again = await crawl_batch_tool.ainvoke({"urls": ["https://b.com"]})
+
+        sections = result.split("\n\n---\n\n")
+        assert sections[0].endswith(article)
+        assert sections[1] == (
+            "URL: https://mirror.com/story\n\nContent: [Duplicate of https://a.com/story, "
+            "which was already crawled in this research run; its content is not repeated]"
+        )
+        assert "Museum wing 79" in sections[2]
+        # Outside of a run nothing is deduplicated
+        assert "Museum wing 79" in again
+
+
+def test_allocate_budget_gives_leftovers_to_long_pages():
+    from src.tools.crawl import _allocate_budget
+
+    assert _allocate_budget([10, 1000, 1000], 310) == [10, 150, 150]
+    assert _allocate_budget([10, 20], 100) == [10, 20]
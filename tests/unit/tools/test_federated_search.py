@@ -0,0 +1,183 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.config import SearchEngine
+from src.tools.federated_search import (
+    FederatedSearchTool,
+    get_federated_engines,
+    reciprocal_rank_fusion,
+)
+from src.utils.circuit_breaker import get_circuit_breaker, reset_circuit_breakers
+
+
+@pytest.fixture(autouse=True)
+def fresh_circuit_breakers():
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+def page(url, title="t", content="c"):
+    return {"title": title, "url": url, "content": content}
+
+
+class TestReciprocalRankFusion:
+    def test_results_found_by_several_engines_rank_first(self):
+        merged = reciprocal_rank_fusion(
+            {
+                "tavily": [page("https://a.com"), page("https://b.com")],
+                "duckduckgo": [page("https://c.com"), page("http://www.b.com/")],
+            },
+            top_k=3,
+        )
+
+        assert merged[0]["url"] == "https://b.com"
+        assert merged[0]["engines"] == ["tavily", "duckduckgo"]
+        assert len(merged) == 3
+
+    def test_duplicates_within_one_engine_count_once(self):
+        merged = reciprocal_rank_fusion(
+            {"tavily": [page("https://a.com"), page("https://a.com/?utm_source=x")]},
+            top_k=5,
+        )
+
+        assert len(merged) == 1
+        assert merged[0]["score"] == pytest.approx(1 / 61, rel=1e-4)
+
+    def test_longest_snippet_is_kept(self):
+        merged = reciprocal_rank_fusion(
+            {
+                "tavily": [page("https://a.com", content="short")],
+                "bocha": [page("https://a.com", content="a much longer snippet")],
+            },
+            top_k=5,
+        )
+
+        assert merged[0]["content"] == "a much longer snippet"
+
+
+class TestFederatedSearchTool:
+    @pytest.fixture
+    def tool(self):
+        return FederatedSearchTool(
+            max_search_results=2, engines=["tavily", "duckduckgo"], deadline=0.2
+        )
+
+    @pytest.mark.asyncio
+    async def test_merges_engines_and_drops_late_ones(self, tool):
+        async def fast(query):
+            return [page("https://a.com"), page("https://b.com")]
+
+        async def slow(query):
+            await asyncio.sleep(5)
+            return [page("https://z.com")]
+
+        with patch.object(
+            FederatedSearchTool,
+            "_engine_searches",
+            return_value={"tavily": fast, "duckduckgo": slow},
+        ):
+            result = json.loads(await tool._arun("query"))
+
+        assert [r["url"] for r in result] == ["https://a.com", "https://b.com"]
+
+    @pytest.mark.asyncio
+    async def test_failed_engine_does_not_fail_search(self, tool):
+        async def ok(query):
+            return [page("https://a.com")]
+
+        async def broken(query):
+            raise RuntimeError("quota exceeded")
+
+        with patch.object(
+            FederatedSearchTool,
+            "_engine_searches",
+            return_value={"tavily": broken, "duckduckgo": ok},
+        ):
+            result = json.loads(await tool._arun("query"))
+
+        assert result[0]["engines"] == ["duckduckgo"]
+
+    @pytest.mark.asyncio
+    async def test_all_engines_failing_returns_error(self, tool):
+        async def broken(query):
+            raise RuntimeError("down")
+
+        with patch.object(
+            FederatedSearchTool, "_engine_searches", return_value={"tavily": broken}
+        ):
+            result = json.loads(await tool._arun("query"))
+
+        assert "error" in result
+
+    @pytest.mark.asyncio
+    async def test_engines_with_an_open_breaker_are_skipped(self, tool):
+        called = []
+
+        def build(engine, images):
+            async def search(query):
+                called.append(engine)
+                if engine == "duckduckgo":
+                    raise RuntimeError("rate limited")
+                return [page(f"https://{engine}.com")]
+
+            return search
+
+        for _ in range(3):
+            get_circuit_breaker("tavily").record_failure("down")
+        tool.engines = ["tavily", "bocha", "duckduckgo"]
+
+        with patch.object(tool, "_build_engine_search", side_effect=build):
+            result = json.loads(await tool._arun("query"))
+
+        assert sorted(called) == ["bocha", "duckduckgo"]
+        assert [r["url"] for r in result] == ["https://bocha.com"]
+        assert get_circuit_breaker("bocha").to_dict()["avg_latency"] is not None
+        assert get_circuit_breaker("duckduckgo").consecutive_failures == 1
+        assert get_circuit_breaker("tavily").rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_engine_past_the_deadline_counts_as_a_failure(self, tool):
+        async def slow(query):
+            await asyncio.sleep(5)
+            return []
+
+        with patch.object(tool, "_build_engine_search", return_value=slow):
+            await tool._arun("query")
+
+        assert get_circuit_breaker("tavily").consecutive_failures == 1
+        assert get_circuit_breaker("duckduckgo").consecutive_failures == 1
+
+    def test_unknown_engines_are_skipped(self):
+        tool = FederatedSearchTool(max_search_results=2, engines=["duckduckgo", "nope"])
+
+        assert list(tool._engine_searches([])) == ["duckduckgo"]
+
+
+def test_default_engines_follow_credentials(monkeypatch):
+    monkeypatch.delenv("FEDERATED_SEARCH_ENGINES", raising=False)
+    monkeypatch.setenv("TAVILY_API_KEY", "tvly-test")
+    monkeypatch.delenv("BOCHA_API_KEY", raising=False)
+    monkeypatch.delenv("BRAVE_SEARCH_API_KEY", raising=False)
+
+    assert get_federated_engines() == ["tavily", "duckduckgo"]
+
+    monkeypatch.setenv("FEDERATED_SEARCH_ENGINES", "Bocha, arxiv")
+    assert get_federated_engines() == ["bocha", "arxiv"]
+
+
+@patch("src.tools.search.SELECTED_SEARCH_ENGINE", SearchEngine.FEDERATED.value)
+def test_get_web_search_tool_federated():
+    from src.tools.search import get_web_search_tool
+
+    tool = get_web_search_tool(max_search_results=4)
+
+    assert isinstance(tool, FederatedSearchTool)
+    assert tool.name == "web_search"
+    assert tool.max_search_results == 4
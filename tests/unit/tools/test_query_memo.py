@@ -0,0 +1,148 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+from langchain_core.tools import BaseTool
+
+from src.tools.query_memo import (
+    QueryMemo,
+    get_query_memo,
+    get_query_memo_stats,
+    query_similarity,
+    query_terms,
+    start_research_run,
+)
+from src.tools.search_cache import create_cached_tool
+
+
+def similarity(a, b):
+    return query_similarity(query_terms(a), query_terms(b))
+
+
+class TestQuerySimilarity:
+    def test_word_order_punctuation_and_filler_words_are_ignored(self):
+        assert similarity("2024 AI market size", "AI market size, 2024?") == 1.0
+        assert similarity("AI market size in 2024", "the AI market size 2024") == 1.0
+
+    def test_chinese_queries_are_compared_by_bigrams(self):
+        assert similarity("2024年人工智能市场规模", "人工智能市场规模 2024年") >= 0.8
+        assert similarity("人工智能市场规模", "新能源汽车销量") == 0.0
+
+    def test_different_numbers_are_never_duplicates(self):
+        assert similarity("AI market size 2023", "AI market size 2024") == 0.0
+
+    def test_different_topics_are_not_duplicates(self):
+        assert similarity("AI market size 2024", "AI chip export rules 2024") < 0.8
+
+
+class TestQueryMemo:
+    def test_near_duplicate_returns_earlier_result(self):
+        memo = QueryMemo("run")
+        memo.store("tavily", "2024 AI market size", "result")
+
+        assert memo.lookup("tavily", "AI market size 2024") == (
+            "2024 AI market size",
+            "result",
+        )
+        assert memo.lookup("bocha", "AI market size 2024") is None
+        assert memo.get_stats() == {"queries": 1, "lookups": 2, "suppressed": 1}
+
+    def test_threshold_from_env(self, monkeypatch):
+        memo = QueryMemo("run")
+        memo.store("tavily", "latest AI market size 2024", "result")
+        assert memo.lookup("tavily", "AI market size 2024") is not None
+
+        monkeypatch.setenv("SEARCH_QUERY_DEDUP_THRESHOLD", "0.95")
+        assert memo.lookup("tavily", "AI market size 2024") is None
+
+    def test_memo_requires_a_run(self, monkeypatch):
+        assert get_query_memo() is None
+        assert get_query_memo("thread-1") is get_query_memo("thread-1")
+
+        monkeypatch.setenv("SEARCH_QUERY_DEDUP_ENABLED", "false")
+        assert get_query_memo("thread-1") is None
+
+
+class CountingSearchTool(BaseTool):
+    name: str = "web_search"
+    description: str = "test search"
+    calls: int = 0
+
+    def _run(self, query: str) -> str:
+        self.calls += 1
+        return f"results for {query}"
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+    return create_cached_tool(CountingSearchTool, "memo-test")()
+
+
+def test_cached_tools_suppress_near_duplicates_within_a_run(tool):
+    config = {"configurable": {"thread_id": "memo-run-1"}}
+
+    first = tool.invoke("2024 AI market size", config=config)
+    second = tool.invoke("AI market size 2024", config=config)
+
+    assert tool.calls == 1
+    assert first == "results for 2024 AI market size"
+    assert second.startswith("Note: this query is a near-duplicate")
+    assert second.endswith(first)
+    assert get_query_memo_stats()["suppressed"] >= 1
+
+
+def test_content_and_artifact_results_are_annotated(monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+
+    class ArtifactSearchTool(CountingSearchTool):
+        response_format: str = "content_and_artifact"
+
+        def _run(self, query: str) -> tuple:
+            self.calls += 1
+            return f"results for {query}", [{"link": "https://a.com"}]
+
+    def call(query):
+        return {
+            "name": "web_search",
+            "args": {"query": query},
+            "id": query,
+            "type": "tool_call",
+        }
+
+    tool = create_cached_tool(ArtifactSearchTool, "memo-test")()
+    config = {"configurable": {"thread_id": "memo-run-5"}}
+
+    first = tool.invoke(call("2024 AI market size"), config=config)
+    second = tool.invoke(call("AI market size 2024"), config=config)
+
+    assert tool.calls == 1
+    assert second.content.startswith("Note: this query is a near-duplicate")
+    assert second.content.endswith(first.content)
+    assert second.artifact == first.artifact
+
+
+def test_runs_do_not_share_memos(tool):
+    tool.invoke(
+        "AI market size 2024", config={"configurable": {"thread_id": "memo-run-2"}}
+    )
+    tool.invoke(
+        "AI market size 2024", config={"configurable": {"thread_id": "memo-run-3"}}
+    )
+    tool.invoke("AI market size 2024")
+
+    assert tool.calls == 3
+
+
+def test_new_research_run_of_a_thread_starts_a_new_memo(tool):
+    config = {"configurable": {"thread_id": "memo-thread-4"}}
+
+    assert start_research_run("memo-thread-4") == "memo-thread-4#1"
+    tool.invoke("AI market size 2024", config=config)
+    tool.invoke("AI market size 2024", config=config)
+    assert tool.calls == 1
+
+    # The next request of the conversation searches again
+    assert start_research_run("memo-thread-4") == "memo-thread-4#2"
+    tool.invoke("AI market size 2024", config=config)
+    assert tool.calls == 2
@@ -6,6 +6,14 @@ import pytest
 from unittest.mock import patch, MagicMock
 from src.tools.search import get_web_search_tool
 from src.config import SearchEngine
+from src.utils.circuit_breaker import get_circuit_breaker, reset_circuit_breakers
+
+
+@pytest.fixture(autouse=True)
+def fresh_circuit_breakers():
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
 
 
 class TestGetWebSearchTool:
@@ -52,3 +60,232 @@ class TestGetWebSearchTool:
     def test_get_web_search_tool_brave_no_api_key(self):
         tool = get_web_search_tool(max_search_results=1)
         assert tool.search_wrapper.api_key == ""
+
+
+class TestFallbackSearchTool:
+    @pytest.fixture
+    def tool(self):
+        from src.tools.search import FallbackSearchTool
+
+        with patch.dict(os.environ, {"TAVILY_API_KEY": ""}):
+            tool = FallbackSearchTool(max_search_results=3)
+        tool.tavily_tool = MagicMock()
+        tool.duckduckgo_tool = MagicMock()
+        return tool
+
+    def test_run_falls_back_on_error_payload(self, tool):
+        tool.tavily_tool._run.return_value = '{"error": "rate limited"}'
+        tool.duckduckgo_tool._run.return_value = "ddg results"
+
+        assert tool._run("query") == "ddg results"
+
+    @pytest.mark.asyncio
+    async def test_arun_uses_async_tavily(self, tool):
+        async def tavily_arun(query):
+            return '[{"title": "t"}]'
+
+        tool.tavily_tool._arun = tavily_arun
+
+        assert await tool._arun("query") == '[{"title": "t"}]'
+        tool.tavily_tool._run.assert_not_called()
+        tool.duckduckgo_tool._run.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_arun_falls_back_on_error_payload(self, tool):
+        async def tavily_arun(query):
+            return '{"error": "Error 432"}'
+
+        tool.tavily_tool._arun = tavily_arun
+        tool.duckduckgo_tool._run.return_value = "ddg results"
+
+        assert await tool._arun("query") == "ddg results"
+
+    @pytest.mark.asyncio
+    async def test_arun_does_not_block_event_loop(self, tool):
+        import asyncio
+        import time
+
+        tool.tavily_tool = None
+
+        def slow_search(query):
+            time.sleep(0.2)
+            return query
+
+        tool.duckduckgo_tool._run.side_effect = slow_search
+        max_lag = 0.0
+
+        async def heartbeat():
+            nonlocal max_lag
+            for _ in range(10):
+                started = time.monotonic()
+                await asyncio.sleep(0.02)
+                max_lag = max(max_lag, time.monotonic() - started - 0.02)
+
+        results = await asyncio.gather(
+            heartbeat(), *(tool._arun(f"q{i}") for i in range(4))
+        )
+
+        assert results[1:] == ["q0", "q1", "q2", "q3"]
+        assert max_lag < 0.1
+
+
+class TestHedgedFallbackSearch:
+    @pytest.fixture
+    def tool(self, monkeypatch):
+        from src.tools import search
+
+        monkeypatch.setenv("SEARCH_FALLBACK_MODE", "hedged")
+        monkeypatch.setenv("SEARCH_HEDGE_DELAY", "0.05")
+        monkeypatch.setattr(search, "hedge_stats", search.HedgeStats())
+        with patch.dict(os.environ, {"TAVILY_API_KEY": ""}):
+            tool = search.FallbackSearchTool(max_search_results=3)
+        tool.tavily_tool = MagicMock()
+        tool.duckduckgo_tool = MagicMock()
+        return tool
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_secondary_wins(self, tool):
+        import asyncio
+        from src.tools import search
+
+        async def slow_tavily(query):
+            await asyncio.sleep(1)
+            return "tavily results"
+
+        tool.tavily_tool._arun = slow_tavily
+        tool.duckduckgo_tool._run.return_value = "ddg results"
+
+        assert await tool._arun("query") == "ddg results"
+        stats = search.get_hedge_stats()
+        assert stats["hedged"] == 1
+        assert stats["wins"] == {"duckduckgo": 1}
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self, tool):
+        from src.tools import search
+
+        async def fast_tavily(query):
+            return "tavily results"
+
+        tool.tavily_tool._arun = fast_tavily
+
+        assert await tool._arun("query") == "tavily results"
+        tool.duckduckgo_tool._run.assert_not_called()
+        assert search.get_hedge_stats()["hedge_rate"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_primary_wins_when_secondary_fails(self, tool):
+        import asyncio
+
+        async def slow_tavily(query):
+            await asyncio.sleep(0.1)
+            return "tavily results"
+
+        tool.tavily_tool._arun = slow_tavily
+        tool.duckduckgo_tool._run.side_effect = RuntimeError("rate limited")
+
+        assert await tool._arun("query") == "tavily results"
+
+    def test_sync_hedged_search(self, tool):
+        import time
+        from src.tools import search
+
+        def slow_tavily(query):
+            time.sleep(0.5)
+            return "tavily results"
+
+        tool.tavily_tool._run.side_effect = slow_tavily
+        tool.duckduckgo_tool._run.return_value = "ddg results"
+
+        started = time.monotonic()
+        assert tool._run("query") == "ddg results"
+        assert time.monotonic() - started < 0.4
+        assert search.get_hedge_stats()["win_rate"] == {"duckduckgo": 1.0}
+
+    def test_sync_hedged_search_inside_a_full_search_executor(self, tool, monkeypatch):
+        from concurrent.futures import ThreadPoolExecutor
+        from src.tools import search
+
+        # Batch searches run _run on the search executor; with every worker
+        # busy, hedging must not queue its own calls behind them
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(search, "_search_executor", executor)
+        tool.tavily_tool._run.return_value = "tavily results"
+        try:
+            future = executor.submit(tool._run, "query")
+            assert future.result(timeout=5) == "tavily results"
+        finally:
+            executor.shutdown(wait=False)
+
+    def test_sync_error_payload_falls_back_without_waiting(self, tool):
+        tool.tavily_tool._run.return_value = '{"error": "quota"}'
+        tool.duckduckgo_tool._run.return_value = "ddg results"
+
+        assert tool._run("query") == "ddg results"
+
+    def test_both_engines_failing_returns_error(self, tool):
+        tool.tavily_tool._run.return_value = '{"error": "quota"}'
+        tool.duckduckgo_tool._run.side_effect = RuntimeError("down")
+
+        import json
+
+        result = json.loads(tool._run("query"))
+        assert result[0]["error"] == "所有搜索引擎都不可用"
+        assert result[0]["details"] == "down"
+
+    def test_hedge_delay_derived_from_p95(self, monkeypatch):
+        from src.tools.search import HedgeStats
+
+        monkeypatch.delenv("SEARCH_HEDGE_DELAY", raising=False)
+        stats = HedgeStats()
+        assert stats.hedge_delay("tavily") == 2.0
+        for i in range(20):
+            stats.record_latency("tavily", 0.1 * (i + 1))
+        assert stats.hedge_delay("tavily") == pytest.approx(1.9)
+
+
+class TestSearchCircuitBreakers:
+    @pytest.fixture
+    def tool(self, monkeypatch):
+        from src.tools.search import FallbackSearchTool
+
+        monkeypatch.setenv("SEARCH_FALLBACK_MODE", "sequential")
+        monkeypatch.setenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "2")
+        with patch.dict(os.environ, {"TAVILY_API_KEY": ""}):
+            tool = FallbackSearchTool(max_search_results=3)
+        tool.tavily_tool = MagicMock()
+        tool.duckduckgo_tool = MagicMock()
+        tool.duckduckgo_tool._run.return_value = "ddg results"
+        return tool
+
+    def test_failing_tavily_is_skipped_once_breaker_opens(self, tool):
+        tool.tavily_tool._run.return_value = '{"error": "Error 432"}'
+
+        for _ in range(3):
+            assert tool._run("query") == "ddg results"
+
+        assert tool.tavily_tool._run.call_count == 2
+        assert get_circuit_breaker("tavily").state == "open"
+
+    @pytest.mark.asyncio
+    async def test_async_search_skips_open_breaker(self, tool):
+        breaker = get_circuit_breaker("tavily")
+        breaker.record_failure("down")
+        breaker.record_failure("down")
+
+        assert await tool._arun("query") == "ddg results"
+        tool.tavily_tool._arun.assert_not_called()
+
+    @patch("src.tools.search.SELECTED_SEARCH_ENGINE", SearchEngine.BOCHA.value)
+    @patch.dict(os.environ, {"BOCHA_API_KEY": "sk-test"})
+    def test_bocha_routes_to_fallback_when_breaker_open(self, monkeypatch):
+        monkeypatch.setenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "1")
+        monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+        tool = get_web_search_tool(max_search_results=3)
+        tool.fallback_tool = MagicMock()
+        tool.fallback_tool._run.return_value = "fallback results"
+        get_circuit_breaker("bocha").record_failure("HTTP 503")
+
+        with patch.object(type(tool), "_send_request") as send_request:
+            assert tool._run("query") == "fallback results"
+            send_request.assert_not_called()
@@ -0,0 +1,119 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.tools.search_batch import WebSearchBatchTool, get_web_search_batch_tool
+
+
+def fake_search_tool(responses, delays=None):
+    delays = delays or {}
+    tool = MagicMock()
+
+    async def ainvoke(query):
+        await asyncio.sleep(delays.get(query, 0))
+        response = responses[query]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    tool.ainvoke.side_effect = ainvoke
+    return tool
+
+
+@pytest.fixture
+def search_tool():
+    with patch("src.tools.search_batch.get_web_search_tool") as mock:
+        yield mock
+
+
+class TestWebSearchBatchTool:
+    @pytest.mark.asyncio
+    async def test_results_are_grouped_by_query_and_deduplicated(self, search_tool):
+        search_tool.return_value = fake_search_tool(
+            {
+                "a": json.dumps(
+                    [{"url": "https://x.com/1"}, {"url": "https://x.com/2"}]
+                ),
+                "b": json.dumps(
+                    [{"url": "http://www.x.com/2/"}, {"url": "https://y.com"}]
+                ),
+            }
+        )
+        tool = WebSearchBatchTool(max_search_results=3)
+
+        groups = json.loads(await tool._arun(["a", "b"]))
+
+        assert [g["query"] for g in groups] == ["a", "b"]
+        assert [r["url"] for r in groups[0]["results"]] == [
+            "https://x.com/1",
+            "https://x.com/2",
+        ]
+        assert [r["url"] for r in groups[1]["results"]] == ["https://y.com"]
+        search_tool.assert_called_once_with(3)
+
+    @pytest.mark.asyncio
+    async def test_queries_run_concurrently_under_shared_deadline(self, search_tool):
+        search_tool.return_value = fake_search_tool(
+            {"fast": "[]", "slow": "[]", "also fast": "[]"},
+            delays={"fast": 0.05, "also fast": 0.05, "slow": 5},
+        )
+        tool = WebSearchBatchTool(deadline=0.3)
+
+        started = asyncio.get_running_loop().time()
+        groups = json.loads(await tool._arun(["fast", "slow", "also fast"]))
+
+        assert asyncio.get_running_loop().time() - started < 1
+        assert groups[0] == {"query": "fast", "results": []}
+        assert groups[1] == {"query": "slow", "error": "搜索超时"}
+        assert groups[2] == {"query": "also fast", "results": []}
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_query(self, search_tool):
+        search_tool.return_value = fake_search_tool(
+            {
+                "ok": "plain text result",
+                "broken": RuntimeError("boom"),
+                "quota": '{"error": "432"}',
+            }
+        )
+        tool = WebSearchBatchTool()
+
+        groups = json.loads(await tool._arun(["ok", "broken", "quota"]))
+
+        assert groups[0] == {"query": "ok", "results": "plain text result"}
+        assert groups[1] == {"query": "broken", "error": "boom"}
+        assert groups[2] == {"query": "quota", "error": {"error": "432"}}
+
+    @pytest.mark.asyncio
+    async def test_duplicate_and_excess_queries_are_dropped(self, search_tool):
+        search_tool.return_value = fake_search_tool({"a": "[]", "b": "[]"})
+        tool = WebSearchBatchTool(max_queries=2)
+
+        groups = json.loads(await tool._arun(["a", " A ", "", "b", "c"]))
+
+        assert [g["query"] for g in groups] == ["a", "b"]
+
+    def test_invoked_with_query_list(self, search_tool):
+        search_tool.return_value = fake_search_tool({"a": "[]"})
+        tool = WebSearchBatchTool()
+
+        assert json.loads(tool.invoke({"queries": ["a"]})) == [
+            {"query": "a", "results": []}
+        ]
+
+
+def test_get_web_search_batch_tool_reads_env(monkeypatch):
+    monkeypatch.setenv("SEARCH_BATCH_MAX_QUERIES", "3")
+    monkeypatch.setenv("SEARCH_BATCH_DEADLINE", "9")
+
+    tool = get_web_search_batch_tool(max_search_results=4)
+
+    assert tool.name == "web_search_batch"
+    assert tool.max_search_results == 4
+    assert tool.max_queries == 3
+    assert tool.deadline == 9.0
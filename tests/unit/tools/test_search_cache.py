@@ -0,0 +1,270 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.tools import BaseTool
+
+import src.tools.search_cache as search_cache_module
+from src.tools.search_cache import (
+    SearchCache,
+    create_cached_tool,
+    get_search_cache_stats,
+    is_error_result,
+    result_urls,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SearchCache(str(tmp_path / "search_cache.sqlite3"))
+
+
+@pytest.fixture
+def shared_cache(cache, monkeypatch):
+    monkeypatch.setattr(search_cache_module, "_search_cache", cache)
+    monkeypatch.delenv("SEARCH_CACHE_ENABLED", raising=False)
+    return cache
+
+
+class TestSearchCache:
+    def test_get_set_roundtrip_with_normalized_query(self, cache):
+        cache.set("tavily", "Deer  Flow", '[{"title": "t"}]', {"max_results": 5})
+
+        assert (
+            cache.get("tavily", "  deer flow ", {"max_results": 5})
+            == '[{"title": "t"}]'
+        )
+        assert cache.get("tavily", "deer flow", {"max_results": 3}) is None
+        assert cache.get("bocha", "deer flow", {"max_results": 5}) is None
+
+    def test_expired_entries_are_misses(self, cache):
+        cache.set("duckduckgo", "query", "result", ttl=-1)
+
+        assert cache.get("duckduckgo", "query") is None
+
+    def test_engine_ttl_from_env(self, cache, monkeypatch):
+        monkeypatch.setenv("SEARCH_CACHE_TTL_BOCHA", "0")
+        cache.set("bocha", "query", "result")
+
+        assert cache.get("bocha", "query") is None
+
+    def test_size_based_eviction_drops_least_recently_used(self, tmp_path):
+        cache = SearchCache(str(tmp_path / "cache.sqlite3"), max_bytes=100)
+        cache.set("tavily", "a", "x" * 40)
+        time.sleep(0.01)
+        cache.set("tavily", "b", "y" * 40)
+        time.sleep(0.01)
+        cache.get("tavily", "a")
+        cache.set("tavily", "c", "z" * 40)
+
+        assert cache.get("tavily", "b") is None
+        assert cache.get("tavily", "a") == "x" * 40
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        SearchCache(path).set("arxiv", "query", [{"title": "paper"}])
+
+        assert SearchCache(path).get("arxiv", "query") == [{"title": "paper"}]
+
+    def test_stats_report_hit_ratio_and_bytes_saved(self, cache):
+        cache.set("tavily", "query", "result")
+        cache.get("tavily", "query")
+        cache.get("tavily", "other")
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["bytes_saved"] == len('"result"')
+
+
+class CountingSearchTool(BaseTool):
+    name: str = "web_search"
+    description: str = "test search"
+    max_results: int = 5
+    calls: int = 0
+
+    def _run(self, query: str) -> str:
+        self.calls += 1
+        if query == "fail":
+            return '{"error": "boom"}'
+        return f"result for {query}"
+
+    async def _arun(self, query: str) -> str:
+        return self._run(query)
+
+
+class TestCachedTool:
+    def test_repeated_query_hits_cache(self, shared_cache):
+        tool = create_cached_tool(CountingSearchTool, "tavily")()
+
+        assert tool.invoke("Deer Flow") == "result for Deer Flow"
+        assert tool.invoke("deer flow") == "result for Deer Flow"
+        assert tool.calls == 1
+        assert get_search_cache_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_path_shares_cache(self, shared_cache):
+        tool = create_cached_tool(CountingSearchTool, "tavily")()
+
+        tool.invoke("query")
+        assert await tool.ainvoke("query") == "result for query"
+        assert tool.calls == 1
+
+    def test_error_results_are_not_cached(self, shared_cache):
+        tool = create_cached_tool(CountingSearchTool, "tavily")()
+
+        tool.invoke("fail")
+        tool.invoke("fail")
+        assert tool.calls == 2
+
+    def test_result_count_is_part_of_key(self, shared_cache):
+        cls = create_cached_tool(CountingSearchTool, "tavily")
+        cls(max_results=5).invoke("query")
+        cls(max_results=3).invoke("query")
+
+        assert shared_cache.get_stats()["entries"] == 2
+
+    def test_disabled_cache_bypasses_lookup(self, shared_cache, monkeypatch):
+        monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+        tool = create_cached_tool(CountingSearchTool, "tavily")()
+
+        tool.invoke("query")
+        tool.invoke("query")
+        assert tool.calls == 2
+        assert get_search_cache_stats() == {"enabled": False}
+
+
+def test_duckduckgo_cache_hit_returns_content_and_artifact(shared_cache):
+    from unittest.mock import patch
+
+    from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+
+    from src.tools.search import CachedDuckDuckGoSearch
+
+    results = [{"snippet": "s", "title": "t", "link": "https://a.com"}]
+    tool = CachedDuckDuckGoSearch(name="web_search", max_results=3)
+    with patch.object(
+        DuckDuckGoSearchAPIWrapper, "results", return_value=results
+    ) as search:
+        first = tool.invoke("deer flow")
+        second = tool.invoke("deer flow")
+
+    assert search.call_count == 1
+    assert second == first
+    assert get_search_cache_stats()["hits"] == 1
+
+
+def test_is_error_result():
+    assert is_error_result('{"error": "x"}')
+    assert is_error_result({"error": "x"})
+    assert not is_error_result('[{"title": "t"}]')
+    assert not is_error_result("plain text")
+    assert is_error_result("Error: https://html.duckduckgo.com/html 202 Ratelimit")
+    assert is_error_result("No good DuckDuckGo Search Result was found")
+    assert not is_error_result("snippet: APIs rate limit clients, title: t " * 20)
+
+
+class SlowSearchTool(CountingSearchTool):
+    async def _arun(self, query: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return f"result for {query}"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_are_coalesced(shared_cache, monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+    tool = create_cached_tool(SlowSearchTool, "tavily")()
+
+    results = await asyncio.gather(*(tool.ainvoke("same query") for _ in range(3)))
+
+    assert results == ["result for same query"] * 3
+    assert tool.calls == 1
+
+
+class DuckDuckGoErrorTool(CountingSearchTool):
+    async def _arun(self, query: str) -> str:
+        self.calls += 1
+        return "https://lite.duckduckgo.com/lite/ 202 Ratelimit"
+
+
+@pytest.mark.asyncio
+async def test_plain_text_duckduckgo_errors_are_not_cached(shared_cache):
+    tool = create_cached_tool(DuckDuckGoErrorTool, "duckduckgo")()
+
+    await tool.ainvoke("query")
+    await tool.ainvoke("query")
+
+    assert tool.calls == 2
+    assert shared_cache.get_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_cache_access_runs_off_the_event_loop(shared_cache, monkeypatch):
+    import threading
+
+    loop_thread = threading.get_ident()
+    threads = []
+    get, set_ = shared_cache.get, shared_cache.set
+
+    def tracking(fn):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(shared_cache, "get", tracking(get))
+    monkeypatch.setattr(shared_cache, "set", tracking(set_))
+    tool = create_cached_tool(SlowSearchTool, "tavily")()
+
+    assert await tool.ainvoke("query") == "result for query"
+    assert await tool.ainvoke("query") == "result for query"
+
+    assert tool.calls == 1
+    assert len(threads) == 3
+    assert loop_thread not in threads
+
+
+def test_result_urls_keep_rank_order_and_skip_images():
+    tavily = (
+        '[{"type": "page", "url": "https://a.com"}, '
+        '{"type": "image", "image_url": "https://img.com/x.png"}, '
+        '{"type": "page", "url": "https://b.com"}, {"type": "page", "url": "https://a.com"}]'
+    )
+    duckduckgo = "[snippet: one, title: A, link: https://a.com/x], [snippet: two, link: https://b.com/y]"
+
+    assert result_urls(tavily) == ["https://a.com", "https://b.com"]
+    assert result_urls([{"title": "t", "link": "https://c.com"}]) == ["https://c.com"]
+    assert result_urls(duckduckgo) == ["https://a.com/x", "https://b.com/y"]
+    assert result_urls('{"error": "x"}') == []
+    assert result_urls(("summary", [{"url": "https://d.com"}])) == ["https://d.com"]
+
+
+def test_search_results_are_prefetched_within_a_run(monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+    monkeypatch.setenv("CRAWL_PREFETCH_ENABLED", "true")
+    scheduled = []
+    monkeypatch.setattr(
+        search_cache_module,
+        "schedule_prefetch",
+        lambda urls, run_id: scheduled.append((urls, run_id)),
+    )
+
+    class LinkSearchTool(CountingSearchTool):
+        def _run(self, query: str) -> str:
+            return '[{"url": "https://a.com/1"}, {"url": "https://b.com/2"}]'
+
+    tool = create_cached_tool(LinkSearchTool, "prefetch-test")()
+    tool.invoke("query", config={"configurable": {"thread_id": "prefetch-run"}})
+
+    assert scheduled == [(["https://a.com/1", "https://b.com/2"], "prefetch-run")]
+
+    monkeypatch.setenv("CRAWL_PREFETCH_ENABLED", "false")
+    tool.invoke("other query", config={"configurable": {"thread_id": "prefetch-run"}})
+    assert len(scheduled) == 1
@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.tools.search_compaction import (
+    bm25_scores,
+    compact_search_results,
+    compact_text,
+    split_passages,
+)
+from src.tools.tavily_search.tavily_search_api_wrapper import (
+    EnhancedTavilySearchAPIWrapper,
+)
+from src.utils.token_utils import estimate_tokens
+
+FILLER = "The weather was pleasant and the conference venue offered plenty of coffee. "
+RELEVANT = "The global AI market size reached 184 billion dollars in 2024. "
+LONG_TEXT = FILLER * 10 + RELEVANT + FILLER * 10
+
+
+def test_split_passages_merges_short_fragments():
+    passages = split_passages("Hi. This is a much longer sentence about markets. Ok.")
+
+    assert passages == ["Hi. This is a much longer sentence about markets. Ok."]
+    assert (
+        len(
+            split_passages(
+                "第一句话讲的是人工智能市场规模的增长情况。第二句话讲的是天气和会议场地的咖啡供应情况。"
+            )
+        )
+        == 2
+    )
+
+
+def test_bm25_prefers_passages_with_query_terms():
+    scores = bm25_scores([FILLER.strip(), RELEVANT.strip()], "AI market size 2024")
+
+    assert scores[1] > scores[0] == 0
+
+
+def test_compact_text_keeps_relevant_passage_within_budget():
+    compacted = compact_text(LONG_TEXT, "AI market size 2024", max_tokens=40)
+
+    assert "184 billion" in compacted
+    assert estimate_tokens(compacted) <= 40
+    assert compact_text("short text", "anything", max_tokens=40) == "short text"
+
+
+def test_compact_text_handles_chinese():
+    text = (
+        "今天天气晴朗，会议场地提供了充足的咖啡和点心。" * 8
+        + "2024年全球人工智能市场规模达到1840亿美元。"
+        + "会后大家一起去公园散步聊天。" * 8
+    )
+
+    compacted = compact_text(text, "人工智能市场规模", max_tokens=40)
+
+    assert "人工智能市场规模" in compacted
+
+
+def test_compact_search_results_drops_redundant_fields_and_respects_budgets():
+    results = [
+        {
+            "title": "AI report",
+            "url": "https://a.com",
+            "content": "short snippet",
+            "summary": LONG_TEXT,
+            "siteName": "A",
+            "siteIcon": "https://a.com/icon.png",
+            "datePublished": "2024-05-01",
+        },
+        {"title": "Second", "url": "https://b.com", "content": LONG_TEXT},
+        {"title": "Third", "url": "https://c.com", "content": LONG_TEXT},
+        {"error": "quota", "title": "搜索失败"},
+    ]
+
+    compacted = compact_search_results(
+        results, "AI market size 2024", result_max_tokens=50, call_max_tokens=80
+    )
+
+    assert set(compacted[0]) == {"title", "url", "content", "datePublished"}
+    assert "184 billion" in compacted[0]["content"]
+    assert estimate_tokens(compacted[1]["content"]) <= 80 - estimate_tokens(
+        compacted[0]["content"]
+    )
+    assert compacted[2]["content"] == ""
+    assert compacted[3] == results[3]
+
+
+def test_compaction_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("SEARCH_COMPACTION_ENABLED", "false")
+    results = [{"title": "t", "url": "u", "content": LONG_TEXT, "siteIcon": "x"}]
+
+    assert compact_search_results(results, "AI market") is results
+
+
+def test_tavily_results_are_compacted_with_echoed_query():
+    wrapper = EnhancedTavilySearchAPIWrapper(tavily_api_key="dummy-key")
+    raw_results = {
+        "query": "AI market size 2024",
+        "results": [
+            {
+                "title": "t",
+                "url": "https://a.com",
+                "content": "snippet",
+                "raw_content": LONG_TEXT * 5,
+                "score": 0.9,
+            }
+        ],
+        "images": [],
+    }
+
+    cleaned = wrapper.clean_results_with_images(raw_results)
+
+    assert "raw_content" not in cleaned[0]
+    assert cleaned[0]["score"] == 0.9
+    assert "184 billion" in cleaned[0]["content"]
+    assert estimate_tokens(cleaned[0]["content"]) <= 300
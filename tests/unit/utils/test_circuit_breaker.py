@@ -0,0 +1,96 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import time
+
+from src.utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    get_circuit_breaker,
+    get_circuit_breaker_states,
+    reset_circuit_breakers,
+)
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("engine", failure_threshold=2, reset_timeout=60)
+
+    breaker.record_failure("boom")
+    assert breaker.allow_request()
+    breaker.record_failure("boom")
+
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.to_dict()["rejected"] == 1
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("engine", failure_threshold=2)
+
+    breaker.record_failure()
+    breaker.record_success(0.1)
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker("engine", failure_threshold=1, latency_threshold=1.0)
+
+    breaker.record_success(2.0)
+
+    assert breaker.state == OPEN
+    assert "过慢" in breaker.to_dict()["last_error"]
+
+
+def test_half_open_allows_single_probe():
+    breaker = CircuitBreaker("engine", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker("engine", failure_threshold=3, reset_timeout=0.05)
+    for _ in range(3):
+        breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+
+
+def test_health_score_tracks_recent_outcomes():
+    breaker = CircuitBreaker("engine", failure_threshold=10)
+    assert breaker.health_score() == 1.0
+
+    breaker.record_success(0.1)
+    breaker.record_failure()
+
+    assert breaker.health_score() == 0.5
+
+
+def test_registry_reads_thresholds_from_env(monkeypatch):
+    reset_circuit_breakers()
+    monkeypatch.setenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")
+    monkeypatch.setenv("CIRCUIT_BREAKER_RESET_TIMEOUT", "12")
+
+    breaker = get_circuit_breaker("tavily")
+
+    assert get_circuit_breaker("tavily") is breaker
+    assert breaker.failure_threshold == 5
+    assert breaker.reset_timeout == 12.0
+    assert get_circuit_breaker_states()["tavily"]["state"] == CLOSED
+    reset_circuit_breakers()
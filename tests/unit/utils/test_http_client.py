@@ -0,0 +1,68 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.utils.http_client import (
+    close_http_clients,
+    get_async_http_client,
+    get_http_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def closed_clients():
+    yield
+    asyncio.run(close_http_clients())
+
+
+def test_sync_client_is_shared_and_configurable(monkeypatch):
+    asyncio.run(close_http_clients())
+    monkeypatch.setenv("HTTP_POOL_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("HTTP_CLIENT_TIMEOUT", "12")
+
+    client = get_http_client()
+
+    assert get_http_client() is client
+    assert client.timeout.read == 12.0
+    assert client._transport._pool._max_connections == 7
+
+
+@pytest.mark.asyncio
+async def test_async_client_is_shared_within_a_loop():
+    client = get_async_http_client()
+
+    assert get_async_http_client() is client
+
+    await close_http_clients()
+    assert client.is_closed
+    assert get_async_http_client() is not client
+
+
+def test_each_event_loop_gets_its_own_async_client():
+    async def current_client():
+        return get_async_http_client()
+
+    first = asyncio.run(current_client())
+    second = asyncio.run(current_client())
+
+    assert first is not second
+
+
+def test_async_client_is_closed_with_its_event_loop():
+    async def current_client():
+        return get_async_http_client()
+
+    client = asyncio.run(current_client())
+
+    assert client.is_closed
+
+
+def test_closed_sync_client_is_recreated():
+    client = get_http_client()
+    asyncio.run(close_http_clients())
+
+    assert client.is_closed
+    assert get_http_client() is not client
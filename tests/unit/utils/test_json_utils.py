@@ -4,7 +4,7 @@
 import pytest
 import json
 from unittest.mock import patch
-from src.utils.json_utils import repair_json_output
+from src.utils.json_utils import IncrementalJSONArrayParser, repair_json_output
 
 
 class TestRepairJsonOutput:
@@ -108,3 +108,53 @@ class TestRepairJsonOutput:
         # Should attempt to process as JSON since it contains ```json
         assert isinstance(result, str)
         assert result == '{"key": "value"}'
+
+
+class TestIncrementalJSONArrayParser:
+
+    def _plan(self):
+        return {
+            "locale": "en-US",
+            "has_enough_context": False,
+            "thought": 'Braces { and brackets [ inside "strings" are ignored',
+            "title": "Plan",
+            "steps": [
+                {"title": "Step 1 }", "description": "d1", "meta": {"a": [1, 2]}},
+                {"title": "Step 2", "description": "d2"},
+            ],
+        }
+
+    def test_emits_steps_as_they_complete(self):
+        """Steps are emitted once their object closes, not at the end"""
+        content = json.dumps(self._plan())
+        parser = IncrementalJSONArrayParser("steps")
+        first_close = content.index("}}") + 2
+        assert parser.feed(content[: first_close - 1]) == []
+        steps = parser.feed(content[first_close - 1 : first_close])
+        assert [s["title"] for s in steps] == ["Step 1 }"]
+        steps = parser.feed(content[first_close:])
+        assert [s["title"] for s in steps] == ["Step 2"]
+        assert parser.emitted == 2
+
+    def test_small_chunks_with_code_fence(self):
+        """Character-sized chunks and a ```json fence still yield every step"""
+        content = "```json\n" + json.dumps(self._plan(), ensure_ascii=False) + "\n```"
+        parser = IncrementalJSONArrayParser("steps")
+        steps = []
+        for ch in content:
+            steps.extend(parser.feed(ch))
+        assert steps == self._plan()["steps"]
+
+    def test_ignores_other_arrays(self):
+        """Arrays under other keys or nested deeper are not emitted"""
+        content = json.dumps({"other": [{"x": 1}], "wrapper": {"steps": [{"y": 2}]}})
+        parser = IncrementalJSONArrayParser("steps")
+        assert parser.feed(content) == []
+        assert parser.emitted == 0
+
+    def test_incomplete_stream(self):
+        """A truncated stream only emits the complete elements"""
+        content = json.dumps(self._plan())
+        parser = IncrementalJSONArrayParser("steps")
+        steps = parser.feed(content[: content.index("Step 2")])
+        assert len(steps) == 1
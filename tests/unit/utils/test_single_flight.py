@@ -0,0 +1,125 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils.single_flight import (
+    SingleFlight,
+    get_single_flight,
+    get_single_flight_stats,
+)
+
+
+def test_concurrent_sync_callers_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "key", fetch) for _ in range(4)]
+        while flight.get_stats()["calls"] < 4:
+            time.sleep(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results == ["result"] * 4
+    assert len(calls) == 1
+    assert flight.get_stats() == {"calls": 4, "coalesced": 3, "in_flight": 0}
+
+
+def test_errors_propagate_to_every_waiter():
+    flight = SingleFlight("test")
+    release = threading.Event()
+
+    def fetch():
+        release.wait(1)
+        raise ValueError("upstream failed")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "key", fetch) for _ in range(3)]
+        while flight.get_stats()["calls"] < 3:
+            time.sleep(0.01)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="upstream failed"):
+                future.result()
+
+    # A failed call is not remembered
+    assert flight.do("key", lambda: "retry") == "retry"
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight("test")
+
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.get_stats()["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_callers_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    results = await asyncio.gather(*(flight.ado("key", fetch) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert flight.get_stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_affect_other_callers():
+    flight = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    leader = asyncio.ensure_future(flight.ado("key", fetch))
+    await asyncio.sleep(0)
+    waiters = [asyncio.ensure_future(flight.ado("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    waiters[0].cancel()
+
+    assert await leader == "result"
+    assert await asyncio.gather(*waiters[1:]) == ["result", "result"]
+    assert waiters[0].cancelled()
+
+
+@pytest.mark.asyncio
+async def test_async_errors_propagate_to_every_waiter():
+    flight = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        *(flight.ado("key", fetch) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_registry_exports_counters():
+    group = get_single_flight("registry-test")
+
+    assert get_single_flight("registry-test") is group
+    group.do("key", lambda: None)
+    assert get_single_flight_stats()["registry-test"]["calls"] == 1
@@ -0,0 +1,24 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.utils.text_utils import tokenize
+
+
+def test_latin_words_are_lowercased():
+    assert tokenize("AI market-size 2024, U.S.") == [
+        "ai",
+        "market",
+        "size",
+        "2024",
+        "u.s",
+    ]
+
+
+def test_cjk_runs_become_bigrams():
+    assert tokenize("人工智能") == ["人工", "工智", "智能"]
+    assert tokenize("AI 市场 规模") == ["ai", "市场", "规模"]
+    assert tokenize("猫") == ["猫"]
+
+
+def test_stopwords_can_be_dropped():
+    assert tokenize("the size of the market", drop_stopwords=True) == ["size", "market"]
@@ -0,0 +1,33 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from src.utils.url_utils import canonicalize_url
+
+
+@pytest.mark.parametrize(
+    "a,b",
+    [
+        ("https://www.Example.com/a/", "http://example.com/a"),
+        ("https://example.com/a?utm_source=x&b=2&a=1", "https://example.com/a?a=1&b=2"),
+        ("https://example.com:443/a#section", "https://example.com/a"),
+        ("https://example.com/?fbclid=abc", "https://example.com"),
+    ],
+)
+def test_equivalent_urls_share_canonical_form(a, b):
+    assert canonicalize_url(a) == canonicalize_url(b)
+
+
+def test_meaningful_differences_are_kept():
+    assert canonicalize_url("https://example.com/a?id=1") != canonicalize_url(
+        "https://example.com/a?id=2"
+    )
+    assert (
+        canonicalize_url("https://example.com:8080/a") == "https://example.com:8080/a"
+    )
+
+
+def test_non_http_urls_are_returned_unchanged():
+    assert canonicalize_url(" mailto:a@b.c ") == "mailto:a@b.c"
+    assert canonicalize_url("") == ""
@@ -489,7 +489,11 @@ function PlanCard({
     const shouldAttemptParse = !message.isStreaming || isCompleteJSON(message.content);
     
     if (!shouldAttemptParse) {
-      // 如果还在流式传输中且JSON不完整，返回空对象避免显示截断内容
+      // 如果还在流式传输中且JSON不完整，只显示后端已推送的完整步骤，避免显示截断内容
+      const streamedSteps = message.planSteps?.filter(Boolean) ?? [];
+      if (streamedSteps.length > 0) {
+        return adaptBackendDataToFrontend({ steps: streamedSteps });
+      }
       return {};
     }
     
@@ -513,7 +517,7 @@ function PlanCard({
       console.debug('Failed to parse plan content:', error);
       return {};
     }
-  }, [message.content, message.agent, message.id, message.isStreaming]);
+  }, [message.content, message.agent, message.id, message.isStreaming, message.planSteps]);
 
   // 编辑状态管理
   const [isEditing, setIsEditing] = useState(false);
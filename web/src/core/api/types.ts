@@ -84,10 +84,20 @@ export interface ActivityEvent
     }
   > {}
 
+export interface PlanStepEvent
+  extends GenericEvent<
+    "plan_step",
+    {
+      index: number;
+      step: Record<string, unknown>;
+    }
+  > {}
+
 export type ChatEvent =
   | MessageChunkEvent
   | ToolCallsEvent
   | ToolCallChunksEvent
   | ToolCallResultEvent
   | InterruptEvent
-  | ActivityEvent;
+  | ActivityEvent
+  | PlanStepEvent;
@@ -24,6 +24,7 @@ export interface Message {
   finishReason?: "stop" | "interrupt" | "tool_calls";
   interruptFeedback?: string;
   resources?: Array<Resource>;
+  planSteps?: Record<string, unknown>[];
 }
 
 export interface Option {
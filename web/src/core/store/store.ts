@@ -165,6 +165,15 @@ export async function sendMessage(
           // 如果没有研究会话，暂时忽略这些 activity 事件，等用户确认后再开始显示
         }
         continue;
+      } else if (type === "plan_step") {
+        // 计划步骤的增量事件：写入正在生成的计划消息，计划卡在完整计划到达前先显示已完成的步骤
+        const planMessage = findStreamingPlannerMessage();
+        if (planMessage) {
+          const planSteps = [...(planMessage.planSteps ?? [])];
+          planSteps[data.index] = data.step;
+          updateMessage({ ...planMessage, planSteps });
+        }
+        continue;
       } else if (type === "tool_call_result") {
         message = findMessageByToolCallId(String(data.tool_call_id ?? ''));
       } else if (!existsMessage(safeMessageId)) {
@@ -228,6 +237,12 @@ function findMessageByToolCallId(toolCallId: string) {
     });
 }
 
+function findStreamingPlannerMessage() {
+  return Array.from(useStore.getState().messages.values())
+    .reverse()
+    .find((message) => message.agent === "planner" && message.isStreaming);
+}
+
 function appendMessage(message: Message) {
   if (
     message.agent === "coder" ||